@@ -0,0 +1,78 @@
+"""Audit the import time of the server modules with `python -X importtime`.
+
+Imports a module in a fresh interpreter and lists the imports that take the
+longest, cumulatively (including everything they import in turn). With
+`--budget-ms`, exits with status 1 when the total import time of the module
+exceeds the budget, so cold-start regressions fail a CI step.
+
+Usage:
+    python benchmarks/imports.py
+    python benchmarks/imports.py --module zettelkasten_mcp.main --budget-ms 300
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def import_times(module: str) -> list[tuple[str, int, int, int]]:
+    """Import a module in a new interpreter and return its import timings.
+
+    Returns:
+        (module, self µs, cumulative µs, nesting depth) per imported module
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = []
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            timings.append((name, int(own), int(cumulative), len(indent) // 2))
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--module",
+        default="zettelkasten_mcp.server.mcp_server",
+        help="Module to import (default: the MCP server)",
+    )
+    parser.add_argument("--top", type=int, default=20, help="Imports to list")
+    parser.add_argument("--runs", type=int, default=3, help="Imports to time")
+    parser.add_argument(
+        "--budget-ms", type=float, default=None, help="Fail above this total"
+    )
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(args.runs)]
+    totals = [
+        next(cumulative for name, _, cumulative, _ in timings if name == args.module)
+        for timings in runs
+    ]
+    total_ms = statistics.median(totals) / 1000
+
+    # Report the run closest to the median
+    timings = runs[totals.index(sorted(totals)[len(totals) // 2])]
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    slowest = sorted(timings, key=lambda timing: timing[2], reverse=True)
+    for name, own, cumulative, depth in slowest[: args.top]:
+        print(f"{cumulative / 1000:10.1f}ms {own / 1000:8.1f}ms  {'  ' * depth}{name}")
+    print(f"\nimport {args.module}: {total_ms:.1f}ms (median of {args.runs})")
+
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"Import time exceeds the budget of {args.budget_ms:.1f}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
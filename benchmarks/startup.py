@@ -0,0 +1,111 @@
+"""Measure the time from launching the server to its first response.
+
+Starts the server over stdio against a generated notes directory, sends an
+MCP `initialize` request and times how long the response takes. Each run is
+measured twice: once with a known-good index, where startup only checks the
+notes directory fingerprint, and once with the fingerprint removed, where
+startup verifies every note file before answering.
+
+Usage:
+    python benchmarks/startup.py --notes 20000 --runs 3
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-06-18",
+        "capabilities": {},
+        "clientInfo": {"name": "startup-benchmark", "version": "0"},
+    },
+}
+
+
+def write_notes(notes_dir: Path, count: int) -> None:
+    """Write `count` minimal note files into `notes_dir`."""
+    notes_dir.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        note_id = f"20250101T{i:012d}"
+        (notes_dir / f"{note_id}.md").write_text(
+            f"---\nid: {note_id}\ntitle: Note {i}\ntype: permanent\n"
+            f"created: '2025-01-01T00:00:00'\nupdated: '2025-01-01T00:00:00'\n"
+            f"---\n\n# Note {i}\n\nBenchmark note {i}.\n",
+            encoding="utf-8",
+        )
+
+
+def time_to_first_response(env: dict[str, str]) -> float:
+    """Launch the server and return seconds until it answers `initialize`."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "zettelkasten_mcp.main"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=env,
+    )
+    try:
+        proc.stdin.write((json.dumps(INITIALIZE) + "\n").encode("utf-8"))
+        proc.stdin.flush()
+        line = proc.stdout.readline()
+        elapsed = time.perf_counter() - start
+        if not line:
+            raise RuntimeError("Server exited without responding")
+        return elapsed
+    finally:
+        proc.stdin.close()
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def forget_fingerprint(database_path: Path) -> None:
+    """Drop the stored fingerprint so the next start verifies the index."""
+    with sqlite3.connect(database_path) as conn:
+        conn.execute("DELETE FROM index_state")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, default=10000, help="Notes to generate")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per scenario")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        notes_dir = Path(tmp) / "notes"
+        database_path = Path(tmp) / "db" / "zettelkasten.db"
+        write_notes(notes_dir, args.notes)
+        env = {
+            **os.environ,
+            "ZETTELKASTEN_NOTES_DIR": str(notes_dir),
+            "ZETTELKASTEN_DATABASE_PATH": str(database_path),
+            "ZETTELKASTEN_LOG_LEVEL": "WARNING",
+        }
+
+        # The first start builds the index from scratch
+        initial = time_to_first_response(env)
+        print(f"{args.notes} notes, initial index build: {initial:.3f}s")
+
+        known_good = [time_to_first_response(env) for _ in range(args.runs)]
+        unverified = []
+        for _ in range(args.runs):
+            forget_fingerprint(database_path)
+            unverified.append(time_to_first_response(env))
+
+        print(f"known-good index:  {statistics.median(known_good):.3f}s (median)")
+        print(f"full verification: {statistics.median(unverified):.3f}s (median)")
+
+
+if __name__ == "__main__":
+    main()
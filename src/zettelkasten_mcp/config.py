@@ -21,6 +21,10 @@ class ZettelkastenConfig(BaseModel):
     notes_dir: Path = Field(
         default_factory=lambda: Path(os.getenv("ZETTELKASTEN_NOTES_DIR", "data/notes"))
     )
+    # Layout of note files: "flat" ({id}.md) or "sharded" ({YYYY}/{MM}/{id}.md)
+    notes_layout: str = Field(
+        default=os.getenv("ZETTELKASTEN_NOTES_LAYOUT", "flat").lower()
+    )
     # Database configuration
     database_path: Path = Field(
         default_factory=lambda: Path(
@@ -43,6 +47,10 @@ class ZettelkastenConfig(BaseModel):
             ","
         )
     )
+    # Serve server metrics at /metrics (unauthenticated, so off by default)
+    http_metrics_enabled: bool = Field(
+        default=os.getenv("ZETTELKASTEN_HTTP_METRICS", "false").lower() == "true"
+    )
     # FastMCP HTTP settings
     json_response: bool = Field(
         default=os.getenv("ZETTELKASTEN_JSON_RESPONSE", "true").lower() == "true"
@@ -53,6 +61,30 @@ class ZettelkastenConfig(BaseModel):
     streamable_http_path: str = Field(
         default=os.getenv("ZETTELKASTEN_STREAMABLE_HTTP_PATH", "/mcp")
     )
+    # Number of uvicorn worker processes for the HTTP transport
+    http_workers: int = Field(default=int(os.getenv("ZETTELKASTEN_HTTP_WORKERS", "1")))
+    # Coordinate note writes and cache invalidation between processes sharing
+    # the notes directory and database (enabled automatically for workers > 1)
+    process_safe: bool = Field(
+        default=os.getenv("ZETTELKASTEN_PROCESS_SAFE", "false").lower() == "true"
+    )
+    # Result cache for search and graph queries (0 disables the cache)
+    result_cache_size: int = Field(
+        default=int(os.getenv("ZETTELKASTEN_RESULT_CACHE_SIZE", "256"))
+    )
+    cache_search_enabled: bool = Field(
+        default=os.getenv("ZETTELKASTEN_CACHE_SEARCH", "true").lower() == "true"
+    )
+    cache_central_notes_enabled: bool = Field(
+        default=os.getenv("ZETTELKASTEN_CACHE_CENTRAL_NOTES", "true").lower() == "true"
+    )
+    cache_orphaned_notes_enabled: bool = Field(
+        default=os.getenv("ZETTELKASTEN_CACHE_ORPHANED_NOTES", "true").lower() == "true"
+    )
+    # Notes whose parsed links are kept in memory (0 disables the cache)
+    links_cache_size: int = Field(
+        default=int(os.getenv("ZETTELKASTEN_LINKS_CACHE_SIZE", "4096"))
+    )
     # Date format for ID generation (using ISO format for timestamps)
     id_date_format: str = Field(default="%Y%m%dT%H%M%S")
     # Default note template
@@ -8,10 +8,15 @@
 from pathlib import Path
 
 from zettelkasten_mcp.config import config
-from zettelkasten_mcp.models.db_models import init_db
-from zettelkasten_mcp.server.mcp_server import ZettelkastenMcpServer
+from zettelkasten_mcp.storage.layout import NOTE_LAYOUTS
 from zettelkasten_mcp.utils import setup_logging
 
+# The database, storage and MCP server modules (and through them SQLAlchemy
+# and the MCP SDK's HTTP stack) are imported in main() once the arguments
+# are parsed, so --help and argument errors return without loading them and
+# --migrate-layout never loads the server. Check with:
+#   python -X importtime -m zettelkasten_mcp.main --help
+
 
 def parse_args():
     """Parse command line arguments."""
@@ -32,6 +37,12 @@ def parse_args():
   # Run with HTTP and CORS enabled
   python -m zettelkasten_mcp --transport http --cors
 
+  # Run with HTTP using 4 worker processes
+  python -m zettelkasten_mcp --transport http --workers 4
+
+  # Move existing notes into the year/month sharded layout, then exit
+  python -m zettelkasten_mcp --migrate-layout sharded
+
   # Run with HTTP using environment variables
   ZETTELKASTEN_HTTP_PORT=9000 python -m zettelkasten_mcp --transport http
         """,
@@ -51,6 +62,13 @@ def parse_args():
         default=os.environ.get("ZETTELKASTEN_DATABASE_PATH"),
     )
 
+    parser.add_argument(
+        "--migrate-layout",
+        choices=NOTE_LAYOUTS,
+        default=None,
+        help="Move all note files into the given layout and exit",
+    )
+
     # Logging configuration
     parser.add_argument(
         "--log-level",
@@ -84,6 +102,12 @@ def parse_args():
         default=None,
         help="Enable CORS for HTTP transport (default: from config)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help=f"Number of HTTP worker processes (default: {config.http_workers})",
+    )
 
     return parser.parse_args()
 
@@ -94,6 +118,8 @@ def update_config(args):
         config.notes_dir = Path(args.notes_dir)
     if args.database_path:
         config.database_path = Path(args.database_path)
+    if args.workers:
+        config.http_workers = args.workers
 
 
 def main():
@@ -112,6 +138,8 @@ def main():
     db_dir = config.get_absolute_path(config.database_path).parent
     db_dir.mkdir(parents=True, exist_ok=True)
 
+    from zettelkasten_mcp.models.db_models import init_db
+
     # Initialize database schema
     try:
         logger.info(f"Using SQLite database: {config.get_db_url()}")
@@ -120,6 +148,38 @@ def main():
         logger.error(f"Failed to initialize database: {e}")
         sys.exit(1)
 
+    if args.migrate_layout:
+        from zettelkasten_mcp.storage.note_repository import NoteRepository
+
+        try:
+            moved = NoteRepository().migrate_layout(args.migrate_layout)
+        except Exception as e:
+            logger.error(f"Failed to migrate notes layout: {e}")
+            sys.exit(1)
+        logger.info(
+            f"Moved {moved} notes. Set ZETTELKASTEN_NOTES_LAYOUT="
+            f"{args.migrate_layout} so new notes are written in this layout"
+        )
+        return
+
+    if args.transport == "http" and config.http_workers > 1:
+        from zettelkasten_mcp.server.mcp_server import run_http_workers
+
+        # Each worker process builds its own server
+        try:
+            run_http_workers(
+                host=args.host,
+                port=args.port,
+                workers=config.http_workers,
+                enable_cors=args.cors,
+            )
+        except Exception as e:
+            logger.error(f"Error running server: {e}")
+            sys.exit(1)
+        return
+
+    from zettelkasten_mcp.server.mcp_server import ZettelkastenMcpServer
+
     # Create and run the MCP server
     try:
         logger.info("Starting Zettelkasten MCP server")
@@ -129,6 +189,7 @@ def main():
             host=args.host,
             port=args.port,
             enable_cors=args.cors,
+            workers=config.http_workers,
         )
     except Exception as e:
         logger.error(f"Error running server: {e}")
@@ -12,6 +12,8 @@
     Text,
     UniqueConstraint,
     create_engine,
+    event,
+    inspect,
 )
 from sqlalchemy.orm import declarative_base, relationship, sessionmaker
 
@@ -26,7 +28,8 @@
     "note_tags",
     Base.metadata,
     Column("note_id", String(255), ForeignKey("notes.id"), primary_key=True),
-    Column("tag_id", Integer, ForeignKey("tags.id"), primary_key=True),
+    # The primary key serves lookups by note; this index serves those by tag
+    Column("tag_id", Integer, ForeignKey("tags.id"), primary_key=True, index=True),
 )
 
 
@@ -63,6 +66,51 @@ def __repr__(self) -> str:
         return f"<Note(id='{self.id}', title='{self.title}')>"
 
 
+# Trigram full-text index over note titles and content, used to narrow
+# substring and regex searches down to candidate notes. It reads the text from
+# the notes table (FTS5 external content) and is kept in line by triggers.
+# Text shorter than TRIGRAM_LENGTH cannot be looked up in it.
+TRIGRAM_LENGTH = 3
+TRIGRAM_INDEX_DDL = (
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS notes_trigram USING fts5("
+        "title, content, content='notes', content_rowid='rowid', tokenize='trigram')"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS notes_trigram_insert AFTER INSERT ON notes BEGIN "
+        "INSERT INTO notes_trigram (rowid, title, content) "
+        "VALUES (new.rowid, new.title, new.content); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS notes_trigram_delete AFTER DELETE ON notes BEGIN "
+        "INSERT INTO notes_trigram (notes_trigram, rowid, title, content) "
+        "VALUES ('delete', old.rowid, old.title, old.content); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS notes_trigram_update "
+        "AFTER UPDATE OF title, content ON notes BEGIN "
+        "INSERT INTO notes_trigram (notes_trigram, rowid, title, content) "
+        "VALUES ('delete', old.rowid, old.title, old.content); "
+        "INSERT INTO notes_trigram (rowid, title, content) "
+        "VALUES (new.rowid, new.title, new.content); END"
+    ),
+)
+
+
+@event.listens_for(DBNote.__table__, "after_create")
+def _create_trigram_index(target, connection, **kw) -> None:
+    """Create the trigram index along with the notes table.
+
+    Shadow indexes built by a rebuild set `skip_trigram_index` in the
+    connection info: their notes are copied into the live table, whose
+    triggers index them there.
+    """
+    if connection.info.get("skip_trigram_index"):
+        return
+    for statement in TRIGRAM_INDEX_DDL:
+        connection.exec_driver_sql(statement)
+
+
 class DBTag(Base):
     """Database model for a tag."""
 
@@ -84,7 +132,9 @@ class DBLink(Base):
     __tablename__ = "links"
     id = Column(Integer, primary_key=True, autoincrement=True)
     source_id = Column(String(255), ForeignKey("notes.id"), nullable=False)
-    target_id = Column(String(255), ForeignKey("notes.id"), nullable=False)
+    # Incoming links are looked up by target; outgoing ones use the unique
+    # constraint, whose index starts with source_id
+    target_id = Column(String(255), ForeignKey("notes.id"), nullable=False, index=True)
     link_type = Column(String(50), default=LinkType.REFERENCE.value, nullable=False)
     description = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.datetime.now, nullable=False)
@@ -112,11 +162,40 @@ def __repr__(self) -> str:
         )
 
 
+class DBIndexState(Base):
+    """Database model for bookkeeping about the index itself (key/value)."""
+
+    __tablename__ = "index_state"
+    key = Column(String(64), primary_key=True)
+    value = Column(Text, nullable=False)
+    updated_at = Column(
+        DateTime,
+        default=datetime.datetime.now,
+        onupdate=datetime.datetime.now,
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        """Return string representation of the state entry."""
+        return f"<IndexState(key='{self.key}')>"
+
+
 def init_db() -> None:
     """Initialize the database."""
     # Create engine based on configuration
     engine = create_engine(config.get_db_url())
+    fresh = not inspect(engine).has_table(DBNote.__tablename__)
     Base.metadata.create_all(engine)
+    # create_all leaves existing tables alone; later schema changes to them
+    # are applied as migrations
+    from zettelkasten_mcp.models import migrations
+
+    migrations.upgrade(engine, fresh=fresh)
+    with engine.connect() as conn:
+        # Write-ahead logging lets readers keep using the last committed index
+        # while a long write, such as a full rebuild, is in progress. The mode
+        # is stored in the database file, so it applies to every connection.
+        conn.exec_driver_sql("PRAGMA journal_mode=WAL")
     return engine
 
 
@@ -0,0 +1,161 @@
+"""Versioned schema migrations for the SQLite index.
+
+`Base.metadata.create_all` only creates tables that do not exist yet, so a
+change to an existing table (a new index, column or derived table) would
+otherwise need the database to be deleted and rebuilt from the note files.
+Such changes are instead added here as numbered steps. The database records
+the steps it has applied in the `schema_version` table, and `upgrade` runs
+the missing ones in order when the database is opened.
+
+A new database is created from the models in their current shape, so it is
+stamped with the latest version without running any step. Steps must
+therefore leave an existing database in the shape the models describe.
+"""
+
+import datetime
+import logging
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+
+from sqlalchemy import Connection, Engine
+
+from zettelkasten_mcp.models.db_models import TRIGRAM_INDEX_DDL
+from zettelkasten_mcp.storage.locking import file_lock
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One step of the schema history."""
+
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+
+def _add_lookup_indexes(conn: Connection) -> None:
+    """Index incoming-link and by-tag lookups."""
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_links_target_id ON links (target_id)"
+    )
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_note_tags_tag_id ON note_tags (tag_id)"
+    )
+
+
+def _add_trigram_index(conn: Connection) -> None:
+    """Create the trigram index and fill it from the existing notes."""
+    for statement in TRIGRAM_INDEX_DDL:
+        conn.exec_driver_sql(statement)
+    conn.exec_driver_sql("INSERT INTO notes_trigram (notes_trigram) VALUES ('rebuild')")
+
+
+# Every step ever shipped, in order; append new ones with the next version
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(1, "Index links.target_id and note_tags.tag_id", _add_lookup_indexes),
+    Migration(2, "Add the notes_trigram full-text index", _add_trigram_index),
+)
+
+
+def current_version(conn: Connection) -> int:
+    """Return the schema version of a database (0 if it has none recorded)."""
+    conn.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS schema_version ("
+        "version INTEGER PRIMARY KEY, description TEXT NOT NULL, "
+        "applied_at TEXT NOT NULL)"
+    )
+    return conn.exec_driver_sql(
+        "SELECT COALESCE(MAX(version), 0) FROM schema_version"
+    ).scalar_one()
+
+
+def _record(conn: Connection, migration: Migration) -> None:
+    """Record a step as applied."""
+    conn.exec_driver_sql(
+        "INSERT INTO schema_version (version, description, applied_at) "
+        "VALUES (?, ?, ?)",
+        (
+            migration.version,
+            migration.description,
+            datetime.datetime.now().isoformat(timespec="seconds"),
+        ),
+    )
+
+
+@contextmanager
+def _transaction(engine: Engine) -> Iterator[Connection]:
+    """Run a block in one transaction that includes its DDL statements.
+
+    The sqlite3 module only opens transactions implicitly before DML, so a
+    step starting with CREATE or ALTER would otherwise commit statement by
+    statement.
+    """
+    with engine.begin() as conn:
+        conn.exec_driver_sql("BEGIN")
+        yield conn
+
+
+def upgrade(
+    engine: Engine,
+    fresh: bool = False,
+    migrations: tuple[Migration, ...] = MIGRATIONS,
+) -> list[int]:
+    """Bring a database up to the latest schema version.
+
+    Each step runs in its own transaction together with its version record,
+    so an interrupted upgrade resumes at the step that failed. Processes
+    opening the same database at once are serialized by a lock file next
+    to it.
+
+    Args:
+        engine: Engine of the database, after `create_all`
+        fresh: Whether `create_all` has just created the database, in which
+            case it is stamped with the latest version instead
+        migrations: Steps to apply, in order
+
+    Returns:
+        Versions of the steps that were applied
+    """
+    if not migrations:
+        return []
+    latest = migrations[-1].version
+    with engine.connect() as conn:
+        version = current_version(conn)
+        conn.commit()
+    if version >= latest:
+        if version > latest:
+            logger.warning(
+                f"Database schema version {version} is newer than this "
+                f"server's ({latest}); continuing without migrating"
+            )
+        return []
+
+    database = engine.url.database
+    lock = (
+        file_lock(Path(database).with_name(f"{Path(database).name}.migrate.lock"))
+        if database and database != ":memory:"
+        else nullcontext()
+    )
+    applied = []
+    with lock:
+        with _transaction(engine) as conn:
+            # Another process may have migrated while this one waited
+            version = current_version(conn)
+            if fresh and version == 0:
+                for migration in migrations:
+                    _record(conn, migration)
+                return []
+        for migration in migrations:
+            if migration.version <= version:
+                continue
+            with _transaction(engine) as conn:
+                migration.apply(conn)
+                _record(conn, migration)
+            logger.info(
+                f"Applied schema migration {migration.version}: {migration.description}"
+            )
+            applied.append(migration.version)
+    return applied
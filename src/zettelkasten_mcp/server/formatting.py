@@ -0,0 +1,202 @@
+"""Shared rendering of MCP tool responses as text or compact JSON."""
+
+import json
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from zettelkasten_mcp.models.schema import Note
+
+OUTPUT_FORMATS = ("text", "json")
+
+
+class Field(NamedTuple):
+    """A detail line under a list item; plain 3-tuples are accepted too."""
+
+    key: str
+    label: str
+    render: Callable[[Any], str]
+    # Also leave the line out for an empty value, not only a missing one
+    skip_empty: bool = False
+
+
+TAGS_FIELD = Field("tags", "Tags", ", ".join, skip_empty=True)
+PREVIEW_FIELD = Field("preview", "Preview", str)
+LINES_FIELD = Field(
+    "lines",
+    "Lines",
+    lambda lines: "".join(
+        f"\n      {line['line'] or 'title'}: {line['text']}" for line in lines
+    ),
+)
+
+
+def date_field(key: str, label: str, fmt: str) -> Field:
+    """Build a detail field that renders a datetime with the given format."""
+    return Field(key, label, lambda value: value.strftime(fmt))
+
+
+def check_output_format(output_format: str) -> str | None:
+    """Return an error message if the output format is not supported."""
+    if output_format not in OUTPUT_FORMATS:
+        return (
+            f"Invalid output format: {output_format}. "
+            f"Valid formats are: {', '.join(OUTPUT_FORMATS)}"
+        )
+    return None
+
+
+def content_preview(content: str, length: int) -> str:
+    """Return the first `length` characters of content on a single line."""
+    preview = content[:length].replace("\n", " ")
+    if len(content) > length:
+        preview += "..."
+    return preview
+
+
+def note_item(
+    note: Note, preview_length: int | None = None, **extra: Any
+) -> dict[str, Any]:
+    """Build the structured payload entry for a note in a result list.
+
+    Args:
+        note: The note to summarize
+        preview_length: Include a content preview of this many characters
+        **extra: Additional tool-specific fields (scores, link types, dates)
+
+    Returns:
+        Dictionary with the note ID, title, tags and any extra fields
+    """
+    item: dict[str, Any] = {
+        "id": note.id,
+        "title": note.title,
+        "tags": [tag.name for tag in note.tags],
+    }
+    item.update(extra)
+    if preview_length:
+        item["preview"] = content_preview(note.content, preview_length)
+    return item
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize values the json module does not handle natively."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return str(value)
+
+
+def render_json(payload: Any) -> str:
+    """Render a payload as compact JSON."""
+    return json.dumps(
+        payload, separators=(",", ":"), ensure_ascii=False, default=_json_default
+    )
+
+
+def render_items(
+    header: str,
+    items: Sequence[dict[str, Any]],
+    fields: Sequence[Field | tuple[str, str, Callable[[Any], str]]],
+) -> str:
+    """Render a numbered list of note items as text.
+
+    Args:
+        header: Text placed before the list
+        items: Note items built with `note_item`
+        fields: Detail lines to render under each item, in order; missing
+            (None) values are skipped, and empty ones if the field says so
+
+    Returns:
+        The rendered text
+    """
+    parts = [header]
+    for i, item in enumerate(items, 1):
+        parts.append(f"{i}. {item['title']} (ID: {item['id']})\n")
+        for key, label, render, skip_empty in (Field(*field) for field in fields):
+            value = item.get(key)
+            if value is None or (skip_empty and not value):
+                continue
+            parts.append(f"   {label}: {render(value)}\n")
+        parts.append("\n")
+    return "".join(parts)
+
+
+def render(
+    payload: Any, output_format: str, text_renderer: Callable[[Any], str]
+) -> str:
+    """Render a tool payload in the requested output format.
+
+    Args:
+        payload: Structured tool result
+        output_format: "text" for human-readable prose, "json" for compact JSON
+        text_renderer: Callable producing the text rendering of the payload
+
+    Returns:
+        The rendered response
+    """
+    if output_format == "json":
+        return render_json(payload)
+    return text_renderer(payload)
+
+
+def rebuild_status_text(status: dict[str, Any]) -> str:
+    """Render the status of a background index rebuild as text."""
+    if status["job_id"] is None:
+        return "No index rebuild has been started."
+    lines = [
+        f"Index rebuild {status['state']} (job {status['job_id']}).",
+        f"Files scanned: {status['scanned']}/{status['total']}",
+        f"Notes indexed: {status['indexed']}",
+        f"Errors: {status['errors']}",
+        f"Elapsed: {status['elapsed_seconds']}s",
+    ]
+    if status["eta_seconds"] is not None:
+        lines.append(f"Estimated time remaining: {status['eta_seconds']}s")
+    if status["state"] == "completed" and status["previous_count"] is not None:
+        change = status["indexed"] - status["previous_count"]
+        lines.append(f"Change in note count: {change}")
+    if status["error"]:
+        lines.append(f"Error: {status['error']}")
+    return "\n".join(lines)
+
+
+def delete_result_text(result: dict[str, Any]) -> str:
+    """Render the outcome of deleting a set of notes as text."""
+    lines = [f"Deleted {len(result['deleted'])} notes."]
+    if result["missing"]:
+        lines.append(f"Not found: {', '.join(result['missing'])}")
+    if result["dangling_links"]:
+        lines.append(
+            f"{len(result['dangling_links'])} links from remaining notes now "
+            "point at deleted notes:"
+        )
+        lines.extend(
+            f"  {link['source_id']} -> {link['target_id']}"
+            for link in result["dangling_links"]
+        )
+    return "\n".join(lines)
+
+
+def suggestions_text(result: dict[str, Any]) -> str:
+    """Render a missed note lookup with the closest titles as text."""
+    lines = [result["error"], "Did you mean:"]
+    lines.extend(
+        f"  {match['title']} (ID: {match['id']})" for match in result["suggestions"]
+    )
+    return "\n".join(lines)
+
+
+def facets_text(facets: dict[str, dict[str, int]] | None) -> str:
+    """Render the facet counts of a search result as text, if any."""
+    if not facets:
+        return ""
+    labels = {"tags": "Tags", "note_types": "Types", "months": "Created"}
+    lines = ["Refine by:\n"]
+    for key, label in labels.items():
+        if facets[key]:
+            counts = ", ".join(
+                f"{value} ({count})" for value, count in facets[key].items()
+            )
+            lines.append(f"   {label}: {counts}\n")
+    return "".join(lines)
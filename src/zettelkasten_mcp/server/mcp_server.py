@@ -1,19 +1,40 @@
 """MCP server implementation for the Zettelkasten."""
 
+import functools
 import logging
+import os
 import uuid
+from collections.abc import Callable
+from dataclasses import asdict
 from datetime import datetime
+from typing import Any, TypeVar
 
-from mcp.server.fastmcp import FastMCP
+import anyio
+from mcp.server.fastmcp import Context, FastMCP
 from sqlalchemy import exc as sqlalchemy_exc
 
 from zettelkasten_mcp.config import config
-from zettelkasten_mcp.models.schema import LinkType, NoteType
+from zettelkasten_mcp.models.schema import LinkType, Note, NoteType
+from zettelkasten_mcp.server import formatting
+from zettelkasten_mcp.server.single_flight import SingleFlight
+from zettelkasten_mcp.services.graph_service import CENTRALITY_METHODS, GraphStep
 from zettelkasten_mcp.services.search_service import SearchService
 from zettelkasten_mcp.services.zettel_service import ZettelService
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Seconds between progress notifications while waiting for an index rebuild
+REBUILD_PROGRESS_INTERVAL = 1.0
+# Most frequent tags listed in the facets of a search response
+FACET_TAG_LIMIT = 20
+
+# The shared renderers, typed as the str responses the tools return
+check_output_format: Callable[[str], str | None] = formatting.check_output_format
+render: Callable[[Any, str, Callable[[Any], str]], str] = formatting.render
+render_json: Callable[[Any], str] = formatting.render_json
+
 
 async def health_check(request):
     """Health check endpoint for Docker/Kubernetes monitoring."""
@@ -64,6 +85,8 @@ def __init__(self):
         # Services
         self.zettel_service = ZettelService()
         self.search_service = SearchService(self.zettel_service)
+        # Request coalescing for concurrent identical reads
+        self.single_flight = SingleFlight()
         # Initialize services
         self.initialize()
         # Register tools
@@ -77,11 +100,71 @@ def initialize(self) -> None:
         self.search_service.initialize()
         logger.info("Zettelkasten MCP server initialized")
 
-    def format_error_response(self, error: Exception) -> str:
+    def get_metrics(self) -> dict[str, Any]:
+        """Return server metrics for monitoring."""
+        return {
+            "single_flight": self.single_flight.get_metrics(),
+            "result_cache": self.search_service.result_cache.get_metrics(),
+        }
+
+    async def _coalesced(
+        self, tool: str, args: dict[str, Any], compute: Callable[[], T]
+    ) -> T:
+        """Run a read in a worker thread, shared by identical concurrent calls.
+
+        FastMCP calls synchronous tools directly on the event loop, so
+        concurrent requests for them never overlap. The coalesced tools are
+        async instead and compute through `self.single_flight` in worker
+        threads, which keeps the event loop responsive and lets identical
+        concurrent calls share one computation. Calls made after a write do
+        not share a computation that started before it.
+        """
+
+        def run() -> T:
+            generation = self.zettel_service.repository.generation
+            result: T = self.single_flight.do(tool, args, compute, generation)
+            return result
+
+        return await anyio.to_thread.run_sync(run)
+
+    @staticmethod
+    def _parse_link_types(link_types: str | None) -> set[str] | None:
+        """Parse a comma-separated list of link types into a set of values."""
+        if not link_types:
+            return None
+        parsed = set()
+        for name in link_types.split(","):
+            if name.strip():
+                try:
+                    parsed.add(LinkType(name.strip().lower()).value)
+                except ValueError:
+                    raise ValueError(
+                        f"Invalid link type: {name.strip()}. Valid types are: {', '.join(t.value for t in LinkType)}"
+                    ) from None
+        return parsed or None
+
+    @staticmethod
+    def _graph_step_item(step: GraphStep, notes: dict[str, Note]) -> dict[str, Any]:
+        """Build the payload entry for a note reached by a graph traversal."""
+        note = notes.get(step.note_id)
+        return {
+            "id": step.note_id,
+            "title": note.title if note else step.note_id,
+            "tags": [tag.name for tag in note.tags] if note else [],
+            "depth": step.depth,
+            "parent_id": step.parent_id,
+            "link_type": step.link_type,
+            "direction": step.direction,
+        }
+
+    def format_error_response(
+        self, error: Exception, output_format: str = "text"
+    ) -> str:
         """Format an error response in a consistent way.
 
         Args:
             error: The exception that occurred
+            output_format: Response format, "text" or "json"
 
         Returns:
             Formatted error message with appropriate level of detail
@@ -92,17 +175,32 @@ def format_error_response(self, error: Exception) -> str:
         if isinstance(error, ValueError):
             # Domain validation errors - typically safe to show to users
             logger.error(f"Validation error [{error_id}]: {str(error)}")
-            return f"Error: {str(error)}"
         elif isinstance(error, (IOError, OSError)):
             # File system errors - don't expose paths or detailed error messages
             logger.error(f"File system error [{error_id}]: {str(error)}", exc_info=True)
             # return f"Unable to access the requested resource. Error ID: {error_id}"
-            return f"Error: {str(error)}"
         else:
             # Unexpected errors - log with full stack trace but return generic message
             logger.error(f"Unexpected error [{error_id}]: {str(error)}", exc_info=True)
             # return f"An unexpected error occurred. Error ID: {error_id}"
-            return f"Error: {str(error)}"
+        return self.format_message(f"Error: {str(error)}", output_format, error=True)
+
+    def format_message(
+        self, message: str, output_format: str = "text", error: bool = False
+    ) -> str:
+        """Format a plain status or error message in the requested format.
+
+        Args:
+            message: The human-readable message
+            output_format: Response format, "text" or "json"
+            error: Whether the message reports a failure
+
+        Returns:
+            The message as text, or a JSON object with a message/error field
+        """
+        if output_format != "json":
+            return message
+        return render_json({"error" if error else "message": message})
 
     def _register_tools(self) -> None:
         """Register MCP tools."""
@@ -114,6 +212,7 @@ def zk_create_note(
             content: str,
             note_type: str = "permanent",
             tags: str | None = None,
+            output_format: str = "text",
         ) -> str:
             """Create a new Zettelkasten note.
             Args:
@@ -121,13 +220,20 @@ def zk_create_note(
                 content: The main content of the note
                 note_type: Type of note (fleeting, literature, permanent, structure, hub)
                 tags: Comma-separated list of tags (optional)
+                output_format: Response format, "text" (default) or compact "json"
             """
+            if error := check_output_format(output_format):
+                return error
             try:
                 # Convert note_type string to enum
                 try:
                     note_type_enum = NoteType(note_type.lower())
                 except ValueError:
-                    return f"Invalid note type: {note_type}. Valid types are: {', '.join(t.value for t in NoteType)}"
+                    return self.format_message(
+                        f"Invalid note type: {note_type}. Valid types are: {', '.join(t.value for t in NoteType)}",
+                        output_format,
+                        error=True,
+                    )
 
                 # Convert tags string to list
                 tag_list = []
@@ -141,17 +247,24 @@ def zk_create_note(
                     note_type=note_type_enum,
                     tags=tag_list,
                 )
-                return f"Note created successfully with ID: {note.id}"
+                return render(
+                    {"status": "created", "id": note.id},
+                    output_format,
+                    lambda p: f"Note created successfully with ID: {p['id']}",
+                )
             except Exception as e:
-                return self.format_error_response(e)
+                return self.format_error_response(e, output_format)
 
         # Get a note by ID or title
         @self.mcp.tool(name="zk_get_note")
-        def zk_get_note(identifier: str) -> str:
+        def zk_get_note(identifier: str, output_format: str = "text") -> str:
             """Retrieve a note by ID or title.
             Args:
                 identifier: The ID or title of the note
+                output_format: Response format, "text" (default) or compact "json"
             """
+            if error := check_output_format(output_format):
+                return error
             try:
                 identifier = str(identifier)
                 # Try to get by ID first
@@ -160,21 +273,60 @@ def zk_get_note(identifier: str) -> str:
                 if not note:
                     note = self.zettel_service.get_note_by_title(identifier)
                 if not note:
-                    return f"Note not found: {identifier}"
-
-                # Format the note
-                result = f"# {note.title}\n"
-                result += f"ID: {note.id}\n"
-                result += f"Type: {note.note_type.value}\n"
-                result += f"Created: {note.created_at.isoformat()}\n"
-                result += f"Updated: {note.updated_at.isoformat()}\n"
-                if note.tags:
-                    result += f"Tags: {', '.join(tag.name for tag in note.tags)}\n"
-                # Add note content, including the Links section added by _note_to_markdown()
-                result += f"\n{note.content}\n"
-                return result
+                    # Offer the closest titles rather than a bare miss, so a
+                    # slightly wrong title needs no search to resolve
+                    suggestions = self.zettel_service.suggest_titles(identifier)
+                    if not suggestions:
+                        return self.format_message(
+                            f"Note not found: {identifier}", output_format, error=True
+                        )
+                    return render(
+                        {
+                            "error": f"Note not found: {identifier}",
+                            "suggestions": [
+                                {"id": match.note_id, "title": match.title}
+                                for match in suggestions
+                            ],
+                        },
+                        output_format,
+                        formatting.suggestions_text,
+                    )
+
+                payload = {
+                    "id": note.id,
+                    "title": note.title,
+                    "type": note.note_type.value,
+                    "created": note.created_at,
+                    "updated": note.updated_at,
+                    "tags": [tag.name for tag in note.tags],
+                    "links": [
+                        {
+                            "target_id": link.target_id,
+                            "link_type": link.link_type.value,
+                            "description": link.description,
+                        }
+                        for link in note.links
+                    ],
+                    "content": note.content,
+                }
+
+                def render_text(p: dict) -> str:
+                    parts = [
+                        f"# {p['title']}\n",
+                        f"ID: {p['id']}\n",
+                        f"Type: {p['type']}\n",
+                        f"Created: {p['created'].isoformat()}\n",
+                        f"Updated: {p['updated'].isoformat()}\n",
+                    ]
+                    if p["tags"]:
+                        parts.append(f"Tags: {', '.join(p['tags'])}\n")
+                    # Add note content, including the Links section added by _note_to_markdown()
+                    parts.append(f"\n{p['content']}\n")
+                    return "".join(parts)
+
+                return render(payload, output_format, render_text)
             except Exception as e:
-                return self.format_error_response(e)
+                return self.format_error_response(e, output_format)
 
         # Update a note
         @self.mcp.tool(name="zk_update_note")
@@ -184,6 +336,7 @@ def zk_update_note(
             content: str | None = None,
             note_type: str | None = None,
             tags: str | None = None,
+            output_format: str = "text",
         ) -> str:
             """Update an existing note.
             Args:
@@ -192,12 +345,17 @@ def zk_update_note(
                 content: New content (optional)
                 note_type: New note type (optional)
                 tags: New comma-separated list of tags (optional)
+                output_format: Response format, "text" (default) or compact "json"
             """
+            if error := check_output_format(output_format):
+                return error
             try:
                 # Get the note
                 note = self.zettel_service.get_note(str(note_id))
                 if not note:
-                    return f"Note not found: {note_id}"
+                    return self.format_message(
+                        f"Note not found: {note_id}", output_format, error=True
+                    )
 
                 # Convert note_type string to enum if provided
                 note_type_enum = None
@@ -205,7 +363,11 @@ def zk_update_note(
                     try:
                         note_type_enum = NoteType(note_type.lower())
                     except ValueError:
-                        return f"Invalid note type: {note_type}. Valid types are: {', '.join(t.value for t in NoteType)}"
+                        return self.format_message(
+                            f"Invalid note type: {note_type}. Valid types are: {', '.join(t.value for t in NoteType)}",
+                            output_format,
+                            error=True,
+                        )
 
                 # Convert tags string to list if provided
                 tag_list = None
@@ -220,28 +382,75 @@ def zk_update_note(
                     note_type=note_type_enum,
                     tags=tag_list,
                 )
-                return f"Note updated successfully: {updated_note.id}"
+                return render(
+                    {"status": "updated", "id": updated_note.id},
+                    output_format,
+                    lambda p: f"Note updated successfully: {p['id']}",
+                )
             except Exception as e:
-                return self.format_error_response(e)
+                return self.format_error_response(e, output_format)
 
         # Delete a note
         @self.mcp.tool(name="zk_delete_note")
-        def zk_delete_note(note_id: str) -> str:
+        def zk_delete_note(note_id: str, output_format: str = "text") -> str:
             """Delete a note.
             Args:
                 note_id: The ID of the note to delete
+                output_format: Response format, "text" (default) or compact "json"
             """
+            if error := check_output_format(output_format):
+                return error
             try:
                 # Check if note exists
                 note = self.zettel_service.get_note(note_id)
                 if not note:
-                    return f"Note not found: {note_id}"
+                    return self.format_message(
+                        f"Note not found: {note_id}", output_format, error=True
+                    )
 
                 # Delete the note
                 self.zettel_service.delete_note(str(note_id))
-                return f"Note deleted successfully: {note_id}"
+                return render(
+                    {"status": "deleted", "id": note_id},
+                    output_format,
+                    lambda p: f"Note deleted successfully: {p['id']}",
+                )
+            except Exception as e:
+                return self.format_error_response(e, output_format)
+
+        # Delete a set of notes
+        @self.mcp.tool(name="zk_delete_notes")
+        def zk_delete_notes(note_ids: str, output_format: str = "text") -> str:
+            """Delete several notes in one operation.
+            Reports IDs that were not found and links from other notes that
+            point at the deleted notes, which are left behind in their markdown.
+            Args:
+                note_ids: Comma-separated IDs of the notes to delete
+                output_format: Response format, "text" (default) or compact "json"
+            """
+            if error := check_output_format(output_format):
+                return error
+            try:
+                id_list = [i.strip() for i in note_ids.split(",") if i.strip()]
+                if not id_list:
+                    return self.format_message(
+                        "No note IDs given", output_format, error=True
+                    )
+                result = self.zettel_service.delete_notes(id_list)
+                return render(
+                    {
+                        "deleted": result.deleted,
+                        "missing": result.missing,
+                        "dangling_links": [
+                            {"source_id": source_id, "target_id": target_id}
+                            for source_id, target_id in result.dangling_links
+                        ],
+                    },
+                    output_format,
+                    formatting.delete_result_text,
+                )
             except Exception as e:
-                return self.format_error_response(e)
+                return self.format_error_response(e, output_format)
 
         # Add a link between notes
         @self.mcp.tool(name="zk_create_link")
@@ -251,6 +460,7 @@ def zk_create_link(
             link_type: str = "reference",
             description: str | None = None,
             bidirectional: bool = False,
+            output_format: str = "text",
         ) -> str:
             """Create a link between two notes.
             Args:
@@ -259,7 +469,10 @@ def zk_create_link(
                 link_type: Type of link (reference, extends, refines, contradicts, questions, supports, related)
                 description: Optional description of the link
                 bidirectional: Whether to create a link in both directions
+                output_format: Response format, "text" (default) or compact "json"
             """
+            if error := check_output_format(output_format):
+                return error
             try:
                 # Convert link_type string to enum
                 try:
@@ -267,67 +480,132 @@ def zk_create_link(
                     str(target_id)
                     link_type_enum = LinkType(link_type.lower())
                 except ValueError:
-                    return f"Invalid link type: {link_type}. Valid types are: {', '.join(t.value for t in LinkType)}"
+                    return self.format_message(
+                        f"Invalid link type: {link_type}. Valid types are: {', '.join(t.value for t in LinkType)}",
+                        output_format,
+                        error=True,
+                    )
 
                 # Create the link
-                source_note, target_note = self.zettel_service.create_link(
+                self.zettel_service.create_link(
                     source_id=source_id,
                     target_id=target_id,
                     link_type=link_type_enum,
                     description=description,
                     bidirectional=bidirectional,
                 )
-                if bidirectional:
-                    return f"Bidirectional link created between {source_id} and {target_id}"
-                else:
-                    return f"Link created from {source_id} to {target_id}"
+                payload = {
+                    "status": "created",
+                    "source_id": source_id,
+                    "target_id": target_id,
+                    "link_type": link_type_enum.value,
+                    "bidirectional": bidirectional,
+                }
+                return render(
+                    payload,
+                    output_format,
+                    lambda p: (
+                        f"Bidirectional link created between {p['source_id']} and {p['target_id']}"
+                        if p["bidirectional"]
+                        else f"Link created from {p['source_id']} to {p['target_id']}"
+                    ),
+                )
             except (Exception, sqlalchemy_exc.IntegrityError) as e:
                 if "UNIQUE constraint failed" in str(e):
-                    return "A link of this type already exists between these notes. Try a different link type."
-                return self.format_error_response(e)
+                    return self.format_message(
+                        "A link of this type already exists between these notes. Try a different link type.",
+                        output_format,
+                        error=True,
+                    )
+                return self.format_error_response(e, output_format)
 
         self.zk_create_link = zk_create_link
 
         # Remove a link between notes
         @self.mcp.tool(name="zk_remove_link")
         def zk_remove_link(
-            source_id: str, target_id: str, bidirectional: bool = False
+            source_id: str,
+            target_id: str,
+            bidirectional: bool = False,
+            output_format: str = "text",
         ) -> str:
             """Remove a link between two notes.
             Args:
                 source_id: ID of the source note
                 target_id: ID of the target note
                 bidirectional: Whether to remove the link in both directions
+                output_format: Response format, "text" (default) or compact "json"
             """
+            if error := check_output_format(output_format):
+                return error
             try:
                 # Remove the link
-                source_note, target_note = self.zettel_service.remove_link(
+                self.zettel_service.remove_link(
                     source_id=str(source_id),
                     target_id=str(target_id),
                     bidirectional=bidirectional,
                 )
-                if bidirectional:
-                    return f"Bidirectional link removed between {source_id} and {target_id}"
-                else:
-                    return f"Link removed from {source_id} to {target_id}"
+                payload = {
+                    "status": "removed",
+                    "source_id": source_id,
+                    "target_id": target_id,
+                    "bidirectional": bidirectional,
+                }
+                return render(
+                    payload,
+                    output_format,
+                    lambda p: (
+                        f"Bidirectional link removed between {p['source_id']} and {p['target_id']}"
+                        if p["bidirectional"]
+                        else f"Link removed from {p['source_id']} to {p['target_id']}"
+                    ),
+                )
             except Exception as e:
-                return self.format_error_response(e)
+                return self.format_error_response(e, output_format)
 
         # Search for notes
         @self.mcp.tool(name="zk_search_notes")
-        def zk_search_notes(
+        async def zk_search_notes(
             query: str | None = None,
             tags: str | None = None,
             note_type: str | None = None,
             limit: int = 10,
+            syntax: str = "simple",
+            facets: bool = False,
+            output_format: str = "text",
         ) -> str:
             """Search for notes by text, tags, or type.
+            With syntax="query", the query is a boolean expression: words,
+            "quoted phrases", AND/OR/NOT (or -term), parentheses and the
+            qualifiers tag:, type:, title:, created:, updated:, link:, linkto:
+            and linkfrom:. Dates are YYYY-MM-DD, with >=, >, <, <= or a
+            range a..b. Example: tag:ml AND "gradient descent" -draft
+            created:>=2025-01-01
             Args:
                 query: Text to search for in titles and content
                 tags: Comma-separated list of tags to filter by
                 note_type: Type of note to filter by
                 limit: Maximum number of results to return
+                syntax: "simple" (default) scores the words of the query;
+                    "query" evaluates it as a boolean expression
+                facets: Also count all matching notes (not only the returned
+                    ones) per tag, note type and creation month
+                output_format: Response format, "text" (default) or compact "json"
             """
+            if error := check_output_format(output_format):
+                return error
+            if syntax not in ("simple", "query"):
+                return self.format_message(
+                    f"Invalid syntax: {syntax}. Valid values are: simple, query",
+                    output_format,
+                    error=True,
+                )
+            if syntax == "query" and not query:
+                return self.format_message(
+                    'A query is required with syntax="query"',
+                    output_format,
+                    error=True,
+                )
             try:
                 # Convert tags string to list if provided
                 tag_list = None
@@ -340,126 +618,384 @@ def zk_search_notes(
                     try:
                         note_type_enum = NoteType(note_type.lower())
                     except ValueError:
-                        return f"Invalid note type: {note_type}. Valid types are: {', '.join(t.value for t in NoteType)}"
+                        return self.format_message(
+                            f"Invalid note type: {note_type}. Valid types are: {', '.join(t.value for t in NoteType)}",
+                            output_format,
+                            error=True,
+                        )
 
-                # Perform search
-                results = self.search_service.search_combined(
-                    text=query, tags=tag_list, note_type=note_type_enum
+                # Perform search, sharing the work with identical concurrent calls
+                search = (
+                    functools.partial(self.search_service.search_query, query)
+                    if syntax == "query"
+                    else functools.partial(
+                        self.search_service.search_combined, text=query
+                    )
+                )
+                results = await self._coalesced(
+                    "zk_search_notes",
+                    {
+                        "query": query,
+                        "tags": sorted(tag_list) if tag_list else None,
+                        "note_type": note_type_enum,
+                        "syntax": syntax,
+                    },
+                    lambda: search(tags=tag_list, note_type=note_type_enum),
                 )
 
+                # Facets cover every match, before the limit is applied
+                facet_counts = None
+                if facets:
+                    facet_counts = await anyio.to_thread.run_sync(
+                        functools.partial(
+                            self.search_service.facet_counts,
+                            [result.note.id for result in results],
+                            max_tags=FACET_TAG_LIMIT,
+                        )
+                    )
+
                 # Limit results
                 results = results[:limit]
-                if not results:
-                    return "No matching notes found."
-
-                # Format results
-                output = f"Found {len(results)} matching notes:\n\n"
-                for i, result in enumerate(results, 1):
-                    note = result.note
-                    output += f"{i}. {note.title} (ID: {note.id})\n"
-                    if note.tags:
-                        output += (
-                            f"   Tags: {', '.join(tag.name for tag in note.tags)}\n"
+                payload = {
+                    "count": len(results),
+                    "results": [
+                        formatting.note_item(
+                            result.note,
+                            preview_length=150,
+                            score=result.score,
+                            created=result.note.created_at,
+                        )
+                        for result in results
+                    ],
+                }
+                if facet_counts is not None:
+                    payload["facets"] = asdict(facet_counts)
+                return render(
+                    payload,
+                    output_format,
+                    lambda p: (
+                        formatting.render_items(
+                            f"Found {p['count']} matching notes:\n\n",
+                            p["results"],
+                            [
+                                formatting.TAGS_FIELD,
+                                formatting.date_field("created", "Created", "%Y-%m-%d"),
+                                formatting.PREVIEW_FIELD,
+                            ],
+                        )
+                        + formatting.facets_text(p.get("facets"))
+                        if p["results"]
+                        else "No matching notes found."
+                    ),
+                )
+            except Exception as e:
+                return self.format_error_response(e, output_format)
+
+        # Find notes containing a substring or regular expression
+        @self.mcp.tool(name="zk_grep_notes")
+        def zk_grep_notes(
+            pattern: str,
+            regex: bool = False,
+            case_sensitive: bool = False,
+            limit: int = 20,
+            output_format: str = "text",
+        ) -> str:
+            """Find notes whose title or content lines contain a substring or regex.
+            Matching lines are returned with their line numbers (0 is the title).
+            Args:
+                pattern: Exact text to find, or a regular expression if regex is set
+                regex: Treat the pattern as a Python regular expression
+                case_sensitive: Whether letter case must match
+                limit: Maximum number of notes to return
+                output_format: Response format, "text" (default) or compact "json"
+            """
+            if error := check_output_format(output_format):
+                return error
+            try:
+                results = self.search_service.grep_notes(
+                    pattern, regex=regex, case_sensitive=case_sensitive, limit=limit
+                )
+                payload = {
+                    "count": len(results),
+                    "results": [
+                        formatting.note_item(
+                            result.note,
+                            lines=[
+                                {
+                                    "line": number,
+                                    "text": formatting.content_preview(line, 200),
+                                }
+                                for number, line in result.lines
+                            ],
+                        )
+                        for result in results
+                    ],
+                }
+                return render(
+                    payload,
+                    output_format,
+                    lambda p: (
+                        formatting.render_items(
+                            f"Found {p['count']} matching notes:\n\n",
+                            p["results"],
+                            [formatting.TAGS_FIELD, formatting.LINES_FIELD],
                         )
-                    output += f"   Created: {note.created_at.strftime('%Y-%m-%d')}\n"
-                    # Add a snippet of content (first 150 chars)
-                    content_preview = note.content[:150].replace("\n", " ")
-                    if len(note.content) > 150:
-                        content_preview += "..."
-                    output += f"   Preview: {content_preview}\n\n"
-                return output
+                        if p["results"]
+                        else "No matching notes found."
+                    ),
+                )
             except Exception as e:
-                return self.format_error_response(e)
+                return self.format_error_response(e, output_format)
 
         # Get linked notes
         @self.mcp.tool(name="zk_get_linked_notes")
-        def zk_get_linked_notes(note_id: str, direction: str = "both") -> str:
+        def zk_get_linked_notes(
+            note_id: str, direction: str = "both", output_format: str = "text"
+        ) -> str:
             """Get notes linked to/from a note.
             Args:
                 note_id: ID of the note
                 direction: Direction of links (outgoing, incoming, both)
+                output_format: Response format, "text" (default) or compact "json"
             """
+            if error := check_output_format(output_format):
+                return error
             try:
                 if direction not in ["outgoing", "incoming", "both"]:
-                    return f"Invalid direction: {direction}. Use 'outgoing', 'incoming', or 'both'."
-                # Get linked notes
-                linked_notes = self.zettel_service.get_linked_notes(
+                    return self.format_message(
+                        f"Invalid direction: {direction}. Use 'outgoing', 'incoming', or 'both'.",
+                        output_format,
+                        error=True,
+                    )
+                # Links and the notes at their other end come from one query
+                neighbors = self.zettel_service.get_link_neighbors(
                     str(note_id), direction
                 )
-                if not linked_notes:
-                    return f"No {direction} links found for note {note_id}."
-                # Format results
-                output = f"Found {len(linked_notes)} {direction} linked notes for {note_id}:\n\n"
-                for i, note in enumerate(linked_notes, 1):
-                    output += f"{i}. {note.title} (ID: {note.id})\n"
-                    if note.tags:
-                        output += (
-                            f"   Tags: {', '.join(tag.name for tag in note.tags)}\n"
+                items_by_id: dict[str, dict[str, Any]] = {}
+                for link, note in neighbors:
+                    item = items_by_id.get(note.id)
+                    if item is None:
+                        item = items_by_id[note.id] = formatting.note_item(note)
+                    # Keep the first link of each kind, as stored in the note
+                    prefix = "" if link.source_id == str(note_id) else "incoming_"
+                    if f"{prefix}link_type" not in item:
+                        item[f"{prefix}link_type"] = link.link_type.value
+                        item[f"{prefix}description"] = link.description
+                items = list(items_by_id.values())
+                payload = {
+                    "note_id": note_id,
+                    "direction": direction,
+                    "count": len(items),
+                    "notes": items,
+                }
+                return render(
+                    payload,
+                    output_format,
+                    lambda p: (
+                        formatting.render_items(
+                            f"Found {p['count']} {p['direction']} linked notes for {p['note_id']}:\n\n",
+                            p["notes"],
+                            [
+                                formatting.TAGS_FIELD,
+                                ("link_type", "Link type", str),
+                                formatting.Field(
+                                    "description", "Description", str, skip_empty=True
+                                ),
+                                ("incoming_link_type", "Incoming link type", str),
+                                formatting.Field(
+                                    "incoming_description",
+                                    "Description",
+                                    str,
+                                    skip_empty=True,
+                                ),
+                            ],
                         )
-                    # Try to determine link type
-                    if direction in ["outgoing", "both"]:
-                        # Check source note's outgoing links
-                        source_note = self.zettel_service.get_note(str(note_id))
-                        if source_note:
-                            for link in source_note.links:
-                                if str(link.target_id) == str(
-                                    note.id
-                                ):  # Explicit string conversion for comparison
-                                    output += f"   Link type: {link.link_type.value}\n"
-                                    if link.description:
-                                        output += (
-                                            f"   Description: {link.description}\n"
-                                        )
-                                    break
-                    if direction in ["incoming", "both"]:
-                        # Check target note's outgoing links
-                        for link in note.links:
-                            if str(link.target_id) == str(
-                                note_id
-                            ):  # Explicit string conversion for comparison
-                                output += (
-                                    f"   Incoming link type: {link.link_type.value}\n"
-                                )
-                                if link.description:
-                                    output += f"   Description: {link.description}\n"
-                                break
-                    output += "\n"
-                return output
+                        if p["notes"]
+                        else f"No {p['direction']} links found for note {p['note_id']}."
+                    ),
+                )
             except Exception as e:
-                return self.format_error_response(e)
+                return self.format_error_response(e, output_format)
 
         self.zk_get_linked_notes = zk_get_linked_notes
 
+        # Find a chain of links between two notes
+        @self.mcp.tool(name="zk_find_path")
+        def zk_find_path(
+            source_id: str,
+            target_id: str,
+            link_types: str | None = None,
+            direction: str = "both",
+            max_depth: int = 6,
+            output_format: str = "text",
+        ) -> str:
+            """Find the shortest chain of links connecting two notes.
+            Args:
+                source_id: ID of the note to start from
+                target_id: ID of the note to reach
+                link_types: Comma-separated link types to follow (optional, default all)
+                direction: Follow links outgoing, incoming, or both (default)
+                max_depth: Maximum number of links in the path (default: 6)
+                output_format: Response format, "text" (default) or compact "json"
+            """
+            if error := check_output_format(output_format):
+                return error
+            try:
+                steps = self.search_service.graph_service.find_path(
+                    str(source_id),
+                    str(target_id),
+                    direction=direction,
+                    link_types=self._parse_link_types(link_types),
+                    max_depth=max_depth,
+                )
+                notes = {
+                    note.id: note
+                    for note in self.zettel_service.repository.get_summaries(
+                        step.note_id for step in steps or []
+                    )
+                }
+                payload = {
+                    "source_id": source_id,
+                    "target_id": target_id,
+                    "found": steps is not None,
+                    "length": len(steps) - 1 if steps else None,
+                    "path": [
+                        self._graph_step_item(step, notes) for step in steps or []
+                    ],
+                }
+                return render(
+                    payload,
+                    output_format,
+                    lambda p: (
+                        formatting.render_items(
+                            f"Found a path of {p['length']} links from {p['source_id']} to {p['target_id']}:\n\n",
+                            p["path"],
+                            [
+                                ("link_type", "Link type", str),
+                                ("direction", "Direction", str),
+                                formatting.TAGS_FIELD,
+                            ],
+                        )
+                        if p["found"]
+                        else f"No path found from {p['source_id']} to {p['target_id']} within {max_depth} links."
+                    ),
+                )
+            except Exception as e:
+                return self.format_error_response(e, output_format)
+
+        # Get the k-hop neighbourhood of a note
+        @self.mcp.tool(name="zk_get_neighborhood")
+        def zk_get_neighborhood(
+            note_id: str,
+            depth: int = 2,
+            link_types: str | None = None,
+            direction: str = "both",
+            max_nodes: int = 50,
+            output_format: str = "text",
+        ) -> str:
+            """Get all notes within a number of links of a note.
+            Args:
+                note_id: ID of the note to start from
+                depth: Maximum number of links from the note (default: 2)
+                link_types: Comma-separated link types to follow (optional, default all)
+                direction: Follow links outgoing, incoming, or both (default)
+                max_nodes: Maximum number of notes to return (default: 50)
+                output_format: Response format, "text" (default) or compact "json"
+            """
+            if error := check_output_format(output_format):
+                return error
+            try:
+                steps, truncated = self.search_service.graph_service.get_neighborhood(
+                    str(note_id),
+                    depth=depth,
+                    direction=direction,
+                    link_types=self._parse_link_types(link_types),
+                    max_nodes=max_nodes,
+                )
+                notes = {
+                    note.id: note
+                    for note in self.zettel_service.repository.get_summaries(
+                        step.note_id for step in steps
+                    )
+                }
+                payload = {
+                    "note_id": note_id,
+                    "depth": depth,
+                    "count": len(steps),
+                    "truncated": truncated,
+                    "notes": [self._graph_step_item(step, notes) for step in steps],
+                }
+                limit_note = f" (limited to {max_nodes})" if truncated else ""
+                return render(
+                    payload,
+                    output_format,
+                    lambda p: (
+                        formatting.render_items(
+                            f"Found {p['count']} notes within {p['depth']} links of {p['note_id']}{limit_note}:\n\n",
+                            p["notes"],
+                            [
+                                ("depth", "Depth", str),
+                                ("parent_id", "Via", str),
+                                ("link_type", "Link type", str),
+                                ("direction", "Direction", str),
+                                formatting.TAGS_FIELD,
+                            ],
+                        )
+                        if p["notes"]
+                        else f"No notes found within {p['depth']} links of {p['note_id']}."
+                    ),
+                )
+            except Exception as e:
+                return self.format_error_response(e, output_format)
+
         # Get all tags
         @self.mcp.tool(name="zk_get_all_tags")
-        def zk_get_all_tags() -> str:
-            """Get all tags in the Zettelkasten."""
+        async def zk_get_all_tags(output_format: str = "text") -> str:
+            """Get all tags in the Zettelkasten.
+            Args:
+                output_format: Response format, "text" (default) or compact "json"
+            """
+            if error := check_output_format(output_format):
+                return error
             try:
-                tags = self.zettel_service.get_all_tags()
-                if not tags:
-                    return "No tags found in the Zettelkasten."
-
-                # Format results
-                output = f"Found {len(tags)} tags:\n\n"
+                tags = await self._coalesced(
+                    "zk_get_all_tags", {}, self.zettel_service.get_all_tags
+                )
                 # Sort alphabetically
-                tags.sort(key=lambda t: t.name.lower())
-                for i, tag in enumerate(tags, 1):
-                    output += f"{i}. {tag.name}\n"
-                return output
+                tag_names = sorted((tag.name for tag in tags), key=str.lower)
+                payload = {"count": len(tag_names), "tags": tag_names}
+                return render(
+                    payload,
+                    output_format,
+                    lambda p: (
+                        "".join(
+                            [f"Found {p['count']} tags:\n\n"]
+                            + [f"{i}. {name}\n" for i, name in enumerate(p["tags"], 1)]
+                        )
+                        if p["tags"]
+                        else "No tags found in the Zettelkasten."
+                    ),
+                )
             except Exception as e:
-                return self.format_error_response(e)
+                return self.format_error_response(e, output_format)
 
         # Find similar notes
         @self.mcp.tool(name="zk_find_similar_notes")
         def zk_find_similar_notes(
-            note_id: str, threshold: float = 0.3, limit: int = 5
+            note_id: str,
+            threshold: float = 0.3,
+            limit: int = 5,
+            output_format: str = "text",
         ) -> str:
             """Find notes similar to a given note.
             Args:
                 note_id: ID of the reference note
                 threshold: Similarity threshold (0.0-1.0)
                 limit: Maximum number of results to return
+                output_format: Response format, "text" (default) or compact "json"
             """
+            if error := check_output_format(output_format):
+                return error
             try:
                 # Get similar notes
                 similar_notes = self.zettel_service.find_similar_notes(
@@ -467,88 +1003,142 @@ def zk_find_similar_notes(
                 )
                 # Limit results
                 similar_notes = similar_notes[:limit]
-                if not similar_notes:
-                    return f"No similar notes found for {note_id} with threshold {threshold}."
-
-                # Format results
-                output = f"Found {len(similar_notes)} similar notes for {note_id}:\n\n"
-                for i, (note, similarity) in enumerate(similar_notes, 1):
-                    output += f"{i}. {note.title} (ID: {note.id})\n"
-                    output += f"   Similarity: {similarity:.2f}\n"
-                    if note.tags:
-                        output += (
-                            f"   Tags: {', '.join(tag.name for tag in note.tags)}\n"
+                payload = {
+                    "note_id": note_id,
+                    "threshold": threshold,
+                    "count": len(similar_notes),
+                    "notes": [
+                        formatting.note_item(
+                            note, preview_length=100, similarity=similarity
                         )
-                    # Add a snippet of content (first 100 chars)
-                    content_preview = note.content[:100].replace("\n", " ")
-                    if len(note.content) > 100:
-                        content_preview += "..."
-                    output += f"   Preview: {content_preview}\n\n"
-                return output
+                        for note, similarity in similar_notes
+                    ],
+                }
+                return render(
+                    payload,
+                    output_format,
+                    lambda p: (
+                        formatting.render_items(
+                            f"Found {p['count']} similar notes for {p['note_id']}:\n\n",
+                            p["notes"],
+                            [
+                                ("similarity", "Similarity", "{:.2f}".format),
+                                formatting.TAGS_FIELD,
+                                formatting.PREVIEW_FIELD,
+                            ],
+                        )
+                        if p["notes"]
+                        else f"No similar notes found for {p['note_id']} with threshold {p['threshold']}."
+                    ),
+                )
             except Exception as e:
-                return self.format_error_response(e)
+                return self.format_error_response(e, output_format)
 
         # Find central notes
         @self.mcp.tool(name="zk_find_central_notes")
-        def zk_find_central_notes(limit: int = 10) -> str:
-            """Find notes with the most connections (incoming + outgoing links).
-            Notes are ranked by their total number of connections, determining
-            their centrality in the knowledge network. Due to database constraints,
-            only one link of each type is counted between any pair of notes.
+        async def zk_find_central_notes(
+            limit: int = 10, method: str = "degree", output_format: str = "text"
+        ) -> str:
+            """Find the most central notes in the knowledge network.
+            With the default "degree" method, notes are ranked by their total
+            number of connections (incoming + outgoing links). Due to database
+            constraints, only one link of each type is counted between any pair
+            of notes. "weighted" weighs each link by its type (e.g. extends and
+            refines count more than reference), and "pagerank" ranks notes by
+            how much of the network ultimately leads to them.
 
             Args:
                 limit: Maximum number of results to return (default: 10)
+                method: Centrality measure (degree, weighted, pagerank)
+                output_format: Response format, "text" (default) or compact "json"
             """
+            if error := check_output_format(output_format):
+                return error
             try:
+                if method not in CENTRALITY_METHODS:
+                    return self.format_message(
+                        f"Invalid method: {method}. Valid methods are: {', '.join(CENTRALITY_METHODS)}",
+                        output_format,
+                        error=True,
+                    )
                 # Get central notes
-                central_notes = self.search_service.find_central_notes(limit)
-                if not central_notes:
-                    return "No notes found with connections."
-
-                # Format results
-                output = "Central notes in the Zettelkasten (most connected):\n\n"
-                for i, (note, connection_count) in enumerate(central_notes, 1):
-                    output += f"{i}. {note.title} (ID: {note.id})\n"
-                    output += f"   Connections: {connection_count}\n"
-                    if note.tags:
-                        output += (
-                            f"   Tags: {', '.join(tag.name for tag in note.tags)}\n"
+                central_notes = await self._coalesced(
+                    "zk_find_central_notes",
+                    {"limit": limit, "method": method},
+                    lambda: self.search_service.find_central_notes(limit, method),
+                )
+                # Degree centrality is a connection count, the others are scores
+                score_key = "connections" if method == "degree" else "score"
+                payload = {
+                    "method": method,
+                    "count": len(central_notes),
+                    "notes": [
+                        formatting.note_item(
+                            note, preview_length=100, **{score_key: score}
+                        )
+                        for note, score in central_notes
+                    ],
+                }
+                header = {
+                    "degree": "most connected",
+                    "weighted": "by link-type-weighted connections",
+                    "pagerank": "by PageRank",
+                }[method]
+                return render(
+                    payload,
+                    output_format,
+                    lambda p: (
+                        formatting.render_items(
+                            f"Central notes in the Zettelkasten ({header}):\n\n",
+                            p["notes"],
+                            [
+                                ("connections", "Connections", str),
+                                ("score", "Score", "{:.4f}".format),
+                                formatting.TAGS_FIELD,
+                                formatting.PREVIEW_FIELD,
+                            ],
                         )
-                    # Add a snippet of content (first 100 chars)
-                    content_preview = note.content[:100].replace("\n", " ")
-                    if len(note.content) > 100:
-                        content_preview += "..."
-                    output += f"   Preview: {content_preview}\n\n"
-                return output
+                        if p["notes"]
+                        else "No notes found with connections."
+                    ),
+                )
             except Exception as e:
-                return self.format_error_response(e)
+                return self.format_error_response(e, output_format)
 
         # Find orphaned notes
         @self.mcp.tool(name="zk_find_orphaned_notes")
-        def zk_find_orphaned_notes() -> str:
-            """Find notes with no connections to other notes."""
+        def zk_find_orphaned_notes(output_format: str = "text") -> str:
+            """Find notes with no connections to other notes.
+            Args:
+                output_format: Response format, "text" (default) or compact "json"
+            """
+            if error := check_output_format(output_format):
+                return error
             try:
                 # Get orphaned notes
                 orphans = self.search_service.find_orphaned_notes()
-                if not orphans:
-                    return "No orphaned notes found."
-
-                # Format results
-                output = f"Found {len(orphans)} orphaned notes:\n\n"
-                for i, note in enumerate(orphans, 1):
-                    output += f"{i}. {note.title} (ID: {note.id})\n"
-                    if note.tags:
-                        output += (
-                            f"   Tags: {', '.join(tag.name for tag in note.tags)}\n"
+                payload = {
+                    "count": len(orphans),
+                    "notes": [
+                        formatting.note_item(note, preview_length=100)
+                        for note in orphans
+                    ],
+                }
+                return render(
+                    payload,
+                    output_format,
+                    lambda p: (
+                        formatting.render_items(
+                            f"Found {p['count']} orphaned notes:\n\n",
+                            p["notes"],
+                            [formatting.TAGS_FIELD, formatting.PREVIEW_FIELD],
                         )
-                    # Add a snippet of content (first 100 chars)
-                    content_preview = note.content[:100].replace("\n", " ")
-                    if len(note.content) > 100:
-                        content_preview += "..."
-                    output += f"   Preview: {content_preview}\n\n"
-                return output
+                        if p["notes"]
+                        else "No orphaned notes found."
+                    ),
+                )
             except Exception as e:
-                return self.format_error_response(e)
+                return self.format_error_response(e, output_format)
 
         # List notes by date range
         @self.mcp.tool(name="zk_list_notes_by_date")
@@ -557,6 +1147,7 @@ def zk_list_notes_by_date(
             end_date: str | None = None,
             use_updated: bool = False,
             limit: int = 10,
+            output_format: str = "text",
         ) -> str:
             """List notes created or updated within a date range.
             Args:
@@ -564,7 +1155,10 @@ def zk_list_notes_by_date(
                 end_date: End date in ISO format (YYYY-MM-DD)
                 use_updated: Whether to use updated_at instead of created_at
                 limit: Maximum number of results to return
+                output_format: Response format, "text" (default) or compact "json"
             """
+            if error := check_output_format(output_format):
+                return error
             try:
                 # Parse dates
                 start_datetime = None
@@ -583,73 +1177,123 @@ def zk_list_notes_by_date(
 
                 # Limit results
                 notes = notes[:limit]
-                if not notes:
-                    date_type = "updated" if use_updated else "created"
-                    date_range = ""
-                    if start_date and end_date:
-                        date_range = f" between {start_date} and {end_date}"
-                    elif start_date:
-                        date_range = f" after {start_date}"
-                    elif end_date:
-                        date_range = f" before {end_date}"
-                    return f"No notes found {date_type}{date_range}."
-
-                # Format results
                 date_type = "updated" if use_updated else "created"
-                output = f"Notes {date_type}"
-                if start_date or end_date:
-                    if start_date and end_date:
-                        output += f" between {start_date} and {end_date}"
-                    elif start_date:
-                        output += f" after {start_date}"
-                    elif end_date:
-                        output += f" before {end_date}"
-                output += f" (showing {len(notes)} results):\n\n"
-                for i, note in enumerate(notes, 1):
-                    date = note.updated_at if use_updated else note.created_at
-                    output += f"{i}. {note.title} (ID: {note.id})\n"
-                    output += f"   {date_type.capitalize()}: {date.strftime('%Y-%m-%d %H:%M')}\n"
-                    if note.tags:
-                        output += (
-                            f"   Tags: {', '.join(tag.name for tag in note.tags)}\n"
+                date_range = ""
+                if start_date and end_date:
+                    date_range = f" between {start_date} and {end_date}"
+                elif start_date:
+                    date_range = f" after {start_date}"
+                elif end_date:
+                    date_range = f" before {end_date}"
+
+                payload = {
+                    "date_type": date_type,
+                    "start_date": start_date,
+                    "end_date": end_date,
+                    "count": len(notes),
+                    "notes": [
+                        formatting.note_item(
+                            note,
+                            preview_length=100,
+                            date=note.updated_at if use_updated else note.created_at,
                         )
-                    # Add a snippet of content (first 100 chars)
-                    content_preview = note.content[:100].replace("\n", " ")
-                    if len(note.content) > 100:
-                        content_preview += "..."
-                    output += f"   Preview: {content_preview}\n\n"
-                return output
+                        for note in notes
+                    ],
+                }
+                return render(
+                    payload,
+                    output_format,
+                    lambda p: (
+                        formatting.render_items(
+                            f"Notes {date_type}{date_range} (showing {p['count']} results):\n\n",
+                            p["notes"],
+                            [
+                                formatting.date_field(
+                                    "date", date_type.capitalize(), "%Y-%m-%d %H:%M"
+                                ),
+                                formatting.TAGS_FIELD,
+                                formatting.PREVIEW_FIELD,
+                            ],
+                        )
+                        if p["notes"]
+                        else f"No notes found {date_type}{date_range}."
+                    ),
+                )
             except ValueError as e:
                 # Special handling for date parsing errors
                 logger.error(f"Date parsing error: {str(e)}")
-                return f"Error parsing date: {str(e)}"
+                return self.format_message(
+                    f"Error parsing date: {str(e)}", output_format, error=True
+                )
             except Exception as e:
-                return self.format_error_response(e)
+                return self.format_error_response(e, output_format)
 
         # Rebuild the index
         @self.mcp.tool(name="zk_rebuild_index")
-        def zk_rebuild_index() -> str:
-            """Rebuild the database index from files."""
+        async def zk_rebuild_index(
+            wait: bool = False,
+            output_format: str = "text",
+            ctx: Context | None = None,
+        ) -> str:
+            """Rebuild the database index from files in the background.
+            Returns once the rebuild has started; check zk_rebuild_status for its
+            progress. Searches keep using the previous index until it finishes.
+            Args:
+                wait: Wait for the rebuild to finish, sending progress notifications
+                output_format: Response format, "text" (default) or compact "json"
+            """
+            if error := check_output_format(output_format):
+                return error
             try:
-                # Get count before rebuild
-                note_count_before = len(self.zettel_service.get_all_notes())
+                status, started = self.zettel_service.start_rebuild()
+                if wait:
+                    status = await self._wait_for_rebuild(ctx)
+                return render(
+                    {**status, "started": started},
+                    output_format,
+                    formatting.rebuild_status_text,
+                )
+            except Exception as e:
+                logger.error(f"Failed to rebuild index: {e}", exc_info=True)
+                return self.format_error_response(e, output_format)
 
-                # Perform the rebuild
-                self.zettel_service.rebuild_index()
+        # Get the progress of an index rebuild
+        @self.mcp.tool(name="zk_rebuild_status")
+        def zk_rebuild_status(output_format: str = "text") -> str:
+            """Get the state and progress of the current or last index rebuild.
+            Args:
+                output_format: Response format, "text" (default) or compact "json"
+            """
+            if error := check_output_format(output_format):
+                return error
+            try:
+                return render(
+                    self.zettel_service.get_rebuild_status(),
+                    output_format,
+                    formatting.rebuild_status_text,
+                )
+            except Exception as e:
+                return self.format_error_response(e, output_format)
 
-                # Get count after rebuild
-                note_count_after = len(self.zettel_service.get_all_notes())
+    async def _wait_for_rebuild(self, ctx: Context | None) -> dict[str, Any]:
+        """Wait for the background rebuild, reporting its progress to the client.
 
-                # Return a detailed success message
-                return (
-                    f"Database index rebuilt successfully.\n"
-                    f"Notes processed: {note_count_after}\n"
-                    f"Change in note count: {note_count_after - note_count_before}"
+        Progress is the number of note files scanned. Notifications are only
+        sent if the client asked for them with a progress token.
+        """
+        job = self.zettel_service.rebuild_job
+        while True:
+            done = await anyio.to_thread.run_sync(job.wait, REBUILD_PROGRESS_INTERVAL)
+            status: dict[str, Any] = self.zettel_service.get_rebuild_status()
+            if done:
+                return status
+            if ctx is not None:
+                await ctx.report_progress(
+                    status["scanned"],
+                    status["total"] or None,
+                    f"Scanned {status['scanned']}/{status['total']} files, "
+                    f"indexed {status['indexed']}, errors {status['errors']}",
                 )
-            except Exception as e:
-                # Provide a detailed error message
-                logger.error(f"Failed to rebuild index: {e}", exc_info=True)
-                return self.format_error_response(e)
 
     def _register_resources(self) -> None:
         """Register MCP resources."""
@@ -661,12 +1305,64 @@ def _register_prompts(self) -> None:
         # Currently, we don't define prompts for the Zettelkasten server
         pass
 
+    def http_app(self, enable_cors: bool | None = None) -> Any:
+        """Build the ASGI application serving the MCP Streamable HTTP transport.
+
+        Args:
+            enable_cors: Wrap the app in CORS middleware (default: from config)
+
+        Returns:
+            The ASGI application, with a /health route and, if enabled in the
+            config, a /metrics route
+        """
+        from starlette.requests import Request
+        from starlette.responses import JSONResponse
+
+        enable_cors = (
+            enable_cors if enable_cors is not None else config.http_cors_enabled
+        )
+
+        # Add health check route directly to FastMCP to preserve lifespan
+        @self.mcp.custom_route(path="/health", methods=["GET"])
+        async def health_endpoint(request: Request) -> JSONResponse:
+            return JSONResponse(
+                {
+                    "status": "healthy",
+                    "service": "zettelkasten-mcp",
+                    "transport": "streamable-http",
+                }
+            )
+
+        # Unauthenticated, so only served when explicitly enabled
+        if config.http_metrics_enabled:
+
+            @self.mcp.custom_route(path="/metrics", methods=["GET"])
+            async def metrics_endpoint(request: Request) -> JSONResponse:
+                return JSONResponse(self.get_metrics())
+
+        # Get the Streamable HTTP app (includes health check now)
+        # Configuration (stateless_http, json_response) is set in FastMCP constructor
+        app = self.mcp.streamable_http_app()
+
+        if enable_cors:
+            from starlette.middleware.cors import CORSMiddleware
+
+            app = CORSMiddleware(
+                app,
+                allow_origins=config.http_cors_origins,
+                allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
+                allow_headers=["*"],
+                expose_headers=["Mcp-Session-Id"],
+            )
+        return app
+
     def run(
         self,
         transport: str = "stdio",
         host: str | None = None,
         port: int | None = None,
         enable_cors: bool | None = None,
+        workers: int | None = None,
     ) -> None:
         """Run the MCP server.
 
@@ -675,6 +1371,8 @@ def run(
             host: Host to bind to (for HTTP transport)
             port: Port to bind to (for HTTP transport)
             enable_cors: Enable CORS middleware (for HTTP transport)
+            workers: Number of worker processes (for HTTP transport); with
+                more than one, see `run_http_workers`
         """
         # Use config defaults if not provided
         host = host or config.http_host
@@ -682,44 +1380,86 @@ def run(
         enable_cors = (
             enable_cors if enable_cors is not None else config.http_cors_enabled
         )
+        workers = workers or config.http_workers
 
         if transport == "http":
             # Import here to avoid dependency issues if not using HTTP
             import uvicorn
-            from starlette.responses import JSONResponse
-
-            # Add health check route directly to FastMCP to preserve lifespan
-            @self.mcp.custom_route(path="/health", methods=["GET"])
-            async def health_endpoint(request):
-                return JSONResponse(
-                    {
-                        "status": "healthy",
-                        "service": "zettelkasten-mcp",
-                        "transport": "streamable-http",
-                    }
-                )
-
-            # Get the Streamable HTTP app (includes health check now)
-            # Configuration (stateless_http, json_response) is set in FastMCP constructor
-            app = self.mcp.streamable_http_app()
 
-            if enable_cors:
-                from starlette.middleware.cors import CORSMiddleware
-
-                app = CORSMiddleware(
-                    app,
-                    allow_origins=config.http_cors_origins,
-                    allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
-                    allow_headers=["*"],
-                    expose_headers=["Mcp-Session-Id"],
-                )
-
-                logger.info(f"Starting HTTP server on {host}:{port} with CORS enabled")
-                uvicorn.run(app, host=host, port=port)
-            else:
-                logger.info(f"Starting HTTP server on {host}:{port}")
-                uvicorn.run(app, host=host, port=port)
+            if workers > 1:
+                run_http_workers(host, port, workers, enable_cors)
+                return
+            cors_note = " with CORS enabled" if enable_cors else ""
+            logger.info(f"Starting HTTP server on {host}:{port}{cors_note}")
+            uvicorn.run(self.http_app(enable_cors), host=host, port=port)
         else:
             # Default STDIO transport
             logger.info("Starting STDIO server")
             self.mcp.run()
+
+
+def run_http_workers(
+    host: str | None = None,
+    port: int | None = None,
+    workers: int | None = None,
+    enable_cors: bool | None = None,
+) -> None:
+    """Serve the HTTP transport from several uvicorn worker processes.
+
+    Each worker builds its own server with `create_http_app`, configured from
+    the environment, so the effective settings are exported to it first. No
+    server is built in the calling process: every worker checks the index on
+    startup by itself.
+
+    Args:
+        host: Host to bind to (default: from config)
+        port: Port to bind to (default: from config)
+        workers: Number of worker processes (default: from config)
+        enable_cors: Enable CORS middleware (default: from config)
+    """
+    import uvicorn
+
+    host = host or config.http_host
+    port = port or config.http_port
+    workers = workers or config.http_workers
+    enable_cors = enable_cors if enable_cors is not None else config.http_cors_enabled
+
+    os.environ.update(
+        {
+            "ZETTELKASTEN_NOTES_DIR": str(config.get_absolute_path(config.notes_dir)),
+            "ZETTELKASTEN_DATABASE_PATH": str(
+                config.get_absolute_path(config.database_path)
+            ),
+            "ZETTELKASTEN_NOTES_LAYOUT": config.notes_layout,
+            "ZETTELKASTEN_HTTP_CORS": str(enable_cors).lower(),
+            "ZETTELKASTEN_HTTP_METRICS": str(config.http_metrics_enabled).lower(),
+            "ZETTELKASTEN_LOG_LEVEL": logging.getLevelName(
+                logging.getLogger().getEffectiveLevel()
+            ),
+        }
+    )
+    cors_note = " with CORS enabled" if enable_cors else ""
+    logger.info(
+        f"Starting HTTP server on {host}:{port}{cors_note} with {workers} workers"
+    )
+    uvicorn.run(
+        "zettelkasten_mcp.server.mcp_server:create_http_app",
+        factory=True,
+        host=host,
+        port=port,
+        workers=workers,
+    )
+
+
+def create_http_app() -> Any:
+    """Create the HTTP application for one uvicorn worker process.
+
+    Used as the uvicorn app factory when running several workers. Writes and
+    cache invalidation are coordinated between the workers, see
+    `config.process_safe`.
+    """
+    from zettelkasten_mcp.utils import setup_logging
+
+    setup_logging(os.environ.get("ZETTELKASTEN_LOG_LEVEL", "INFO"))
+    config.process_safe = True
+    return ZettelkastenMcpServer().http_app()
@@ -0,0 +1,114 @@
+"""Request coalescing for identical concurrent read operations."""
+
+import json
+import threading
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    """An in-flight computation shared by every caller with the same key."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Share one in-flight computation between concurrent identical calls.
+
+    The first caller for a key (the leader) runs the computation; callers that
+    arrive with the same key while it is running wait for and reuse its result
+    instead of repeating the work. Results are not cached once the leader
+    finishes - the next call starts a fresh computation.
+
+    Keys include the write generation a caller has seen, so a caller never
+    joins a computation that started before a write it already knows of.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the coalescing table and counters."""
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+        self._stats = {"calls": 0, "executions": 0, "coalesced": 0, "errors": 0}
+        self._by_name: dict[str, dict[str, int]] = {}
+
+    @staticmethod
+    def make_key(name: str, arguments: dict[str, Any], generation: int = 0) -> str:
+        """Build a coalescing key from an operation name and its arguments.
+
+        Args:
+            name: Name of the operation, e.g. the MCP tool name
+            arguments: Already-normalized arguments of the call
+            generation: Write generation the caller has seen
+
+        Returns:
+            A stable string key
+        """
+        arguments_json = json.dumps(arguments, sort_keys=True, default=str)
+        return f"{name}@{generation}:{arguments_json}"
+
+    def do(
+        self,
+        name: str,
+        arguments: dict[str, Any],
+        fn: Callable[[], T],
+        generation: int = 0,
+    ) -> T:
+        """Run `fn`, or wait for an identical call that is already running.
+
+        Args:
+            name: Name of the operation, used for the key and per-tool metrics
+            arguments: Normalized arguments identifying identical calls
+            fn: Zero-argument callable performing the computation
+            generation: Write generation the caller has seen, read before the
+                call; only computations started at the same generation are
+                joined, so their results include every write the caller saw
+
+        Returns:
+            The result of the (possibly shared) computation
+        """
+        key = self.make_key(name, arguments, generation)
+        with self._lock:
+            self._stats["calls"] += 1
+            tool_stats = self._by_name.setdefault(name, {"calls": 0, "coalesced": 0})
+            tool_stats["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats["executions"] += 1
+            else:
+                self._stats["coalesced"] += 1
+                tool_stats["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Return coalescing counters, overall and per operation name."""
+        with self._lock:
+            return {
+                **self._stats,
+                "in_flight": len(self._calls),
+                "by_tool": {name: dict(stats) for name, stats in self._by_name.items()},
+            }
@@ -0,0 +1,748 @@
+"""Graph analysis over the link index of the Zettelkasten."""
+
+import threading
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from zettelkasten_mcp.models.schema import LinkType, Note
+from zettelkasten_mcp.services.zettel_service import ZettelService
+from zettelkasten_mcp.storage.note_repository import GraphChange
+
+CENTRALITY_METHODS = ("degree", "weighted", "pagerank")
+TRAVERSAL_DIRECTIONS = ("outgoing", "incoming", "both")
+_REVERSED_DIRECTION = {"outgoing": "incoming", "incoming": "outgoing", "both": "both"}
+
+# Relative importance of each link type for weighted centrality measures.
+# Structural relations (extends, refines) count more than plain references.
+LINK_TYPE_WEIGHTS: dict[str, float] = {
+    LinkType.REFERENCE.value: 1.0,
+    LinkType.RELATED.value: 0.75,
+    LinkType.EXTENDS.value: 1.5,
+    LinkType.EXTENDED_BY.value: 1.5,
+    LinkType.REFINES.value: 1.5,
+    LinkType.REFINED_BY.value: 1.5,
+    LinkType.SUPPORTS.value: 1.25,
+    LinkType.SUPPORTED_BY.value: 1.25,
+    LinkType.CONTRADICTS.value: 1.25,
+    LinkType.CONTRADICTED_BY.value: 1.25,
+    LinkType.QUESTIONS.value: 1.0,
+    LinkType.QUESTIONED_BY.value: 1.0,
+}
+
+
+def _weight(link_type: str) -> float:
+    """Return the weight of a link type for weighted measures."""
+    return LINK_TYPE_WEIGHTS.get(link_type, 1.0)
+
+
+@dataclass
+class LinkGraph:
+    """In-memory copy of the link graph, indexed by note position.
+
+    The graph is built from the index once and then kept up to date by
+    applying the changes of later writes (see `apply`). Removing a note moves
+    the last note into its position, so positions are only stable between
+    changes.
+    """
+
+    note_ids: list[str]
+    index: dict[str, int]
+    # (neighbour index, link type) for links whose other end is a known note
+    outgoing: list[list[tuple[int, str]]]
+    incoming: list[list[tuple[int, str]]]
+    # Link counts as stored in the index, including links to missing notes
+    out_degree: list[int]
+    in_degree: list[int]
+    weighted_degree: list[float] = field(default_factory=list)
+    # Links to IDs that are not notes (yet), by source and by target ID
+    dangling_out: list[list[tuple[str, str]]] = field(default_factory=list)
+    dangling_in: dict[str, list[tuple[int, str]]] = field(default_factory=dict)
+    # PageRank parameters, see `pagerank`
+    damping: float = 0.85
+    tolerance: float = 1.0e-6
+    # Unnormalized PageRank and its residual, see `pagerank_scores`; only
+    # computed once PageRank is asked for, then kept up to date by changes
+    ranked: bool = False
+    rank: list[float] = field(default_factory=list)
+    residual: list[float] = field(default_factory=list)
+    # Notes whose residual changed since the last push
+    _pending: list[int] = field(default_factory=list, init=False, repr=False)
+
+    @classmethod
+    def build(
+        cls, note_ids: Iterable[str], links: Iterable[tuple[str, str, str]]
+    ) -> "LinkGraph":
+        """Build a graph from note IDs and (source, target, link type) rows."""
+        ids = list(note_ids)
+        index = {note_id: i for i, note_id in enumerate(ids)}
+        size = len(ids)
+        graph = cls(
+            note_ids=ids,
+            index=index,
+            outgoing=[[] for _ in range(size)],
+            incoming=[[] for _ in range(size)],
+            out_degree=[0] * size,
+            in_degree=[0] * size,
+            weighted_degree=[0.0] * size,
+            dangling_out=[[] for _ in range(size)],
+        )
+        for source_id, target_id, link_type in links:
+            source = index.get(source_id)
+            if source is not None:
+                graph._link(source, target_id, link_type)
+                continue
+            # Links from notes missing from the index only count for the target
+            target = index.get(target_id)
+            if target is not None:
+                graph.in_degree[target] += 1
+                graph.weighted_degree[target] += _weight(link_type)
+        return graph
+
+    def apply(self, change: GraphChange) -> None:
+        """Bring the graph up to date with a change of the link index."""
+        for note_id in change.removed:
+            self.remove_note(note_id)
+        for note_id, links in change.links.items():
+            self.set_links(note_id, links)
+
+    def set_links(self, note_id: str, links: Iterable[tuple[str, str]]) -> None:
+        """Replace the outgoing links of a note, adding the note if it is new.
+
+        Args:
+            note_id: ID of the note
+            links: (target ID, link type) of each link of the note
+        """
+        node = self.index.get(note_id)
+        if node is None:
+            node = self._add_node(note_id)
+        self._spread(node, -1.0)
+        self._unlink_outgoing(node)
+        for target_id, link_type in links:
+            self._link(node, target_id, link_type)
+        self._spread(node, 1.0)
+        self._push()
+
+    def remove_note(self, note_id: str) -> None:
+        """Remove a note with the links from and to it; unknown IDs are ignored."""
+        node = self.index.get(note_id)
+        if node is None:
+            return
+        self._spread(node, -1.0)
+        self._unlink_outgoing(node)
+        # The index drops the links to a removed note rather than keeping
+        # them as links to a missing note
+        for source, link_type in self.incoming[node]:
+            self._spread(source, -1.0)
+            self.outgoing[source].remove((node, link_type))
+            self.out_degree[source] -= 1
+            self.weighted_degree[source] -= _weight(link_type)
+            self._spread(source, 1.0)
+        self._push()
+        self._drop_node(node)
+
+    def pagerank_scores(self) -> dict[str, float]:
+        """Return PageRank scores, updated incrementally after changes.
+
+        PageRank with uniform teleports, where notes without links spread
+        their rank evenly, is proportional to the solution `y` of
+        `y = d * A * y + 1`, with `A` the column-normalized link weights.
+        That system involves links only, so after a change only the notes
+        near it need work: the graph keeps `y` together with its residual
+        `1 + d * A * y - y`, adjusts the residual where links changed and
+        pushes it on along the links until it is below the tolerance. A link
+        edit then only touches the notes around it instead of iterating over
+        the whole graph; the first call solves the whole graph by `pagerank`.
+
+        Returns:
+            Mapping of note ID to PageRank score (scores sum to 1)
+        """
+        if not self.ranked:
+            self._start_pagerank()
+        total = sum(self.rank)
+        return {
+            note_id: rank / total
+            for note_id, rank in zip(self.note_ids, self.rank, strict=True)
+        }
+
+    def _start_pagerank(self) -> None:
+        """Solve PageRank by power iteration and derive `y` and its residual."""
+        scores = pagerank(self, self.damping, self.tolerance)
+        out_weight = [self._out_weight(node) for node in range(len(self.note_ids))]
+        dangling = sum(
+            scores[note_id]
+            for note_id, weight in zip(self.note_ids, out_weight, strict=True)
+            if weight == 0
+        )
+        # Scores are `y` scaled by the teleport mass every note receives
+        scale = len(self.note_ids) / (1.0 - self.damping + self.damping * dangling)
+        rank = [scores[note_id] * scale for note_id in self.note_ids]
+        residual = [1.0 - value for value in rank]
+        for source, edges in enumerate(self.outgoing):
+            if edges:
+                share = self.damping * rank[source] / out_weight[source]
+                for target, link_type in edges:
+                    residual[target] += share * _weight(link_type)
+        self.ranked = True
+        self.rank = rank
+        self.residual = residual
+        # Settle what the power iteration left, so later pushes stay local
+        self._pending = list(range(len(rank)))
+        self._push()
+
+    def _out_weight(self, node: int) -> float:
+        """Return the total weight of the links of a note to known notes."""
+        return sum(_weight(link_type) for _, link_type in self.outgoing[node])
+
+    def _spread(self, node: int, sign: float) -> None:
+        """Add (or remove) the rank a note passes on along its links to the residual.
+
+        Call with -1 before and +1 after changing the links of a note.
+        """
+        if not self.ranked or not self.outgoing[node]:
+            return
+        share = sign * self.damping * self.rank[node] / self._out_weight(node)
+        for target, link_type in self.outgoing[node]:
+            self.residual[target] += share * _weight(link_type)
+            self._pending.append(target)
+
+    def _push(self) -> None:
+        """Push residuals above the tolerance on along the links."""
+        if not self.ranked:
+            return
+        rank, residual = self.rank, self.residual
+        # The scores then differ by at most the tolerance per note on the L1
+        # norm, as for `pagerank`, since y sums to at least the note count
+        limit = self.tolerance * (1.0 - self.damping) * len(rank)
+        queue = deque(
+            node for node in dict.fromkeys(self._pending) if abs(residual[node]) > limit
+        )
+        queued = set(queue)
+        self._pending = []
+        while queue:
+            node = queue.popleft()
+            queued.discard(node)
+            amount = residual[node]
+            rank[node] += amount
+            residual[node] = 0.0
+            if not self.outgoing[node]:
+                continue
+            share = self.damping * amount / self._out_weight(node)
+            for target, link_type in self.outgoing[node]:
+                residual[target] += share * _weight(link_type)
+                if target not in queued and abs(residual[target]) > limit:
+                    queued.add(target)
+                    queue.append(target)
+
+    def _link(self, source: int, target_id: str, link_type: str) -> None:
+        """Add a link from a known note."""
+        weight = _weight(link_type)
+        self.out_degree[source] += 1
+        self.weighted_degree[source] += weight
+        target = self.index.get(target_id)
+        if target is None:
+            self.dangling_out[source].append((target_id, link_type))
+            self.dangling_in.setdefault(target_id, []).append((source, link_type))
+            return
+        self.in_degree[target] += 1
+        self.weighted_degree[target] += weight
+        self.outgoing[source].append((target, link_type))
+        self.incoming[target].append((source, link_type))
+
+    def _unlink_outgoing(self, source: int) -> None:
+        """Remove all links from a note."""
+        for target, link_type in self.outgoing[source]:
+            self.incoming[target].remove((source, link_type))
+            self.in_degree[target] -= 1
+            self.weighted_degree[target] -= _weight(link_type)
+            self.weighted_degree[source] -= _weight(link_type)
+        for target_id, link_type in self.dangling_out[source]:
+            links = self.dangling_in[target_id]
+            links.remove((source, link_type))
+            if not links:
+                del self.dangling_in[target_id]
+            self.weighted_degree[source] -= _weight(link_type)
+        self.outgoing[source] = []
+        self.dangling_out[source] = []
+        self.out_degree[source] = 0
+
+    def _add_node(self, note_id: str) -> int:
+        """Add a note, turning links to its ID into links to it."""
+        node = len(self.note_ids)
+        self.note_ids.append(note_id)
+        self.index[note_id] = node
+        for values in (self.outgoing, self.incoming, self.dangling_out):
+            values.append([])
+        self.out_degree.append(0)
+        self.in_degree.append(0)
+        self.weighted_degree.append(0.0)
+        if self.ranked:
+            # y = 0 leaves a residual of 1 for the teleport mass
+            self.rank.append(0.0)
+            self.residual.append(1.0)
+            self._pending.append(node)
+        for source, link_type in self.dangling_in.pop(note_id, []):
+            self._spread(source, -1.0)
+            self.dangling_out[source].remove((note_id, link_type))
+            self.outgoing[source].append((node, link_type))
+            self.incoming[node].append((source, link_type))
+            self.in_degree[node] += 1
+            self.weighted_degree[node] += _weight(link_type)
+            self._spread(source, 1.0)
+        return node
+
+    def _drop_node(self, node: int) -> None:
+        """Drop a note without links, moving the last note into its position."""
+        del self.index[self.note_ids[node]]
+        last = len(self.note_ids) - 1
+        per_node: list[list[Any]] = [
+            self.note_ids,
+            self.outgoing,
+            self.incoming,
+            self.dangling_out,
+            self.out_degree,
+            self.in_degree,
+            self.weighted_degree,
+        ]
+        if self.ranked:
+            per_node += [self.rank, self.residual]
+        if node != last:
+            for values in per_node:
+                values[node] = values[last]
+            self.index[self.note_ids[node]] = node
+            self._renumber(last, node)
+        for values in per_node:
+            values.pop()
+
+    def _renumber(self, old: int, new: int) -> None:
+        """Point the links of a note moved from one position to another at it."""
+
+        def moved(links: list[tuple[int, str]]) -> list[tuple[int, str]]:
+            return [(new if other == old else other, kind) for other, kind in links]
+
+        self.outgoing[new] = moved(self.outgoing[new])
+        self.incoming[new] = moved(self.incoming[new])
+        for target in {target for target, _ in self.outgoing[new]} - {new}:
+            self.incoming[target] = moved(self.incoming[target])
+        for source in {source for source, _ in self.incoming[new]} - {new}:
+            self.outgoing[source] = moved(self.outgoing[source])
+        for target_id in {target_id for target_id, _ in self.dangling_out[new]}:
+            self.dangling_in[target_id] = moved(self.dangling_in[target_id])
+
+
+@dataclass
+class GraphStep:
+    """A note reached during a traversal and the link that led to it."""
+
+    note_id: str
+    depth: int = 0
+    # Note the link was followed from, None for the starting note
+    parent_id: str | None = None
+    link_type: str | None = None
+    # "outgoing" if parent links to this note, "incoming" if this note links
+    # to the parent
+    direction: str | None = None
+
+
+def _neighbors(
+    graph: LinkGraph, node: int, direction: str, link_types: set[str] | None
+) -> Iterable[tuple[int, str, str]]:
+    """Yield (neighbour, link type, direction) for the links of a node."""
+    if direction in ("outgoing", "both"):
+        for neighbor, link_type in graph.outgoing[node]:
+            if link_types is None or link_type in link_types:
+                yield neighbor, link_type, "outgoing"
+    if direction in ("incoming", "both"):
+        for neighbor, link_type in graph.incoming[node]:
+            if link_types is None or link_type in link_types:
+                yield neighbor, link_type, "incoming"
+
+
+def shortest_path(
+    graph: LinkGraph,
+    source_id: str,
+    target_id: str,
+    direction: str = "both",
+    link_types: set[str] | None = None,
+    max_depth: int | None = None,
+) -> list[GraphStep] | None:
+    """Find a shortest path between two notes by bidirectional BFS.
+
+    Both ends are expanded one level at a time, always growing the smaller
+    frontier, so only a fraction of the graph is visited on large networks.
+
+    Args:
+        graph: The link graph
+        source_id: ID of the note to start from
+        target_id: ID of the note to reach
+        direction: Follow links "outgoing" (source to target order),
+            "incoming" (reverse) or in "both" directions
+        link_types: Only follow links of these types (all types if None)
+        max_depth: Maximum number of links in the path
+
+    Returns:
+        The steps from source to target, or None if they are not connected
+    """
+    for note_id in (source_id, target_id):
+        if note_id not in graph.index:
+            raise ValueError(f"Note with ID {note_id} not found")
+    source = graph.index[source_id]
+    target = graph.index[target_id]
+    if source == target:
+        return [GraphStep(note_id=source_id)]
+
+    # node -> (previous node, link type, direction relative to the search)
+    forward: dict[int, tuple[int, str, str] | None] = {source: None}
+    backward: dict[int, tuple[int, str, str] | None] = {target: None}
+    forward_frontier, backward_frontier = [source], [target]
+    forward_depth = backward_depth = 0
+    reverse_direction = _REVERSED_DIRECTION[direction]
+
+    while forward_frontier and backward_frontier:
+        if max_depth is not None and forward_depth + backward_depth >= max_depth:
+            return None
+        expand_forward = len(forward_frontier) <= len(backward_frontier)
+        if expand_forward:
+            visited, other, frontier = forward, backward, forward_frontier
+            step_direction = direction
+            forward_depth += 1
+        else:
+            visited, other, frontier = backward, forward, backward_frontier
+            step_direction = reverse_direction
+            backward_depth += 1
+
+        next_frontier = []
+        meeting = None
+        for node in frontier:
+            for neighbor, link_type, link_direction in _neighbors(
+                graph, node, step_direction, link_types
+            ):
+                if neighbor in visited:
+                    continue
+                visited[neighbor] = (node, link_type, link_direction)
+                next_frontier.append(neighbor)
+                if neighbor in other:
+                    meeting = neighbor
+                    break
+            if meeting is not None:
+                break
+        if meeting is not None:
+            return _join_path(graph, forward, backward, meeting)
+
+        if expand_forward:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+    return None
+
+
+def _join_path(
+    graph: LinkGraph,
+    forward: dict[int, tuple[int, str, str] | None],
+    backward: dict[int, tuple[int, str, str] | None],
+    meeting: int,
+) -> list[GraphStep]:
+    """Combine the two half searches of `shortest_path` into one path."""
+    # Walk from the meeting node back to the source
+    chain: list[tuple[int, str | None, str | None]] = []
+    node = meeting
+    while forward[node] is not None:
+        previous, link_type, direction = forward[node]
+        chain.append((node, link_type, direction))
+        node = previous
+    chain.append((node, None, None))
+    chain.reverse()
+
+    # Walk from the meeting node on to the target, flipping link directions
+    # because the backward search followed links from the target's side
+    node = meeting
+    while backward[node] is not None:
+        following, link_type, direction = backward[node]
+        chain.append((following, link_type, _REVERSED_DIRECTION[direction]))
+        node = following
+
+    steps = []
+    for depth, (node, link_type, direction) in enumerate(chain):
+        steps.append(
+            GraphStep(
+                note_id=graph.note_ids[node],
+                depth=depth,
+                parent_id=steps[-1].note_id if steps else None,
+                link_type=link_type,
+                direction=direction,
+            )
+        )
+    return steps
+
+
+def neighborhood(
+    graph: LinkGraph,
+    note_id: str,
+    depth: int = 2,
+    direction: str = "both",
+    link_types: set[str] | None = None,
+    max_nodes: int | None = None,
+) -> tuple[list[GraphStep], bool]:
+    """Collect the notes within `depth` links of a note by BFS.
+
+    Args:
+        graph: The link graph
+        note_id: ID of the note to start from
+        depth: Maximum number of links from the starting note
+        direction: Follow links "outgoing", "incoming" or in "both" directions
+        link_types: Only follow links of these types (all types if None)
+        max_nodes: Stop after this many notes (excluding the starting note)
+
+    Returns:
+        Tuple of (reached notes in BFS order, whether the cap cut it short)
+    """
+    if note_id not in graph.index:
+        raise ValueError(f"Note with ID {note_id} not found")
+    start = graph.index[note_id]
+    visited = {start}
+    frontier = [start]
+    steps: list[GraphStep] = []
+    for level in range(1, depth + 1):
+        next_frontier = []
+        for node in frontier:
+            for neighbor, link_type, link_direction in _neighbors(
+                graph, node, direction, link_types
+            ):
+                if neighbor in visited:
+                    continue
+                if max_nodes is not None and len(steps) >= max_nodes:
+                    return steps, True
+                visited.add(neighbor)
+                next_frontier.append(neighbor)
+                steps.append(
+                    GraphStep(
+                        note_id=graph.note_ids[neighbor],
+                        depth=level,
+                        parent_id=graph.note_ids[node],
+                        link_type=link_type,
+                        direction=link_direction,
+                    )
+                )
+        if not next_frontier:
+            break
+        frontier = next_frontier
+    return steps, False
+
+
+def pagerank(
+    graph: LinkGraph,
+    damping: float = 0.85,
+    tolerance: float = 1.0e-6,
+    max_iterations: int = 100,
+    initial: dict[str, float] | None = None,
+) -> dict[str, float]:
+    """Compute link-type-weighted PageRank by sparse power iteration.
+
+    Each iteration is a single pass over the incoming adjacency lists, so the
+    cost is proportional to the number of links rather than notes squared.
+
+    Args:
+        graph: The link graph
+        damping: Probability of following a link rather than jumping
+        tolerance: Convergence threshold per note on the L1 change
+        max_iterations: Upper bound on power iterations
+        initial: Previous scores to warm-start from; after a small link
+            change this converges in a handful of iterations
+
+    Returns:
+        Mapping of note ID to PageRank score (scores sum to 1)
+    """
+    size = len(graph.note_ids)
+    if size == 0:
+        return {}
+
+    # Transition weights: each note spreads its rank over its outgoing links
+    # in proportion to the link type weights
+    out_weight = [
+        sum(LINK_TYPE_WEIGHTS.get(link_type, 1.0) for _, link_type in edges)
+        for edges in graph.outgoing
+    ]
+    incoming = [
+        [
+            (source, LINK_TYPE_WEIGHTS.get(link_type, 1.0) / out_weight[source])
+            for source, link_type in edges
+        ]
+        for edges in graph.incoming
+    ]
+    dangling = [i for i in range(size) if out_weight[i] == 0]
+
+    if initial:
+        rank = [initial.get(note_id, 1.0 / size) for note_id in graph.note_ids]
+        total = sum(rank)
+        rank = [r / total for r in rank]
+    else:
+        rank = [1.0 / size] * size
+
+    for _ in range(max_iterations):
+        dangling_rank = sum(rank[i] for i in dangling)
+        base = (1.0 - damping + damping * dangling_rank) / size
+        new_rank = [
+            base + damping * sum(rank[source] * weight for source, weight in edges)
+            for edges in incoming
+        ]
+        error = sum(abs(new - old) for new, old in zip(new_rank, rank, strict=True))
+        rank = new_rank
+        if error < size * tolerance:
+            break
+
+    return dict(zip(graph.note_ids, rank, strict=True))
+
+
+class GraphService:
+    """Service for centrality and other graph measures over note links.
+
+    The link graph is loaded once and then brought up to date with the link
+    changes the repository logs, including its PageRank scores; it is only
+    reloaded when some changes are unknown, such as those of a rebuild or
+    another process. Computed scores are cached per graph generation, so
+    edits that leave notes and links alone do not invalidate them.
+
+    The graph is changed in place, so it is only used with the service lock
+    held.
+    """
+
+    def __init__(self, zettel_service: ZettelService | None = None):
+        """Initialize the graph service."""
+        self.zettel_service = zettel_service or ZettelService()
+        self._lock = threading.RLock()
+        self._graph: LinkGraph | None = None
+        self._graph_generation = 0
+        self._scores: dict[str, tuple[int, dict[str, float]]] = {}
+
+    def get_graph(self) -> LinkGraph:
+        """Return the link graph, brought up to date with the repository.
+
+        Hold the service lock while using the graph, since later calls
+        change it in place.
+        """
+        repository = self.zettel_service.repository
+        with self._lock:
+            if self._graph is not None:
+                generation, changes = repository.graph_changes_since(
+                    self._graph_generation
+                )
+                if changes is not None:
+                    for change in changes:
+                        self._graph.apply(change)
+                    self._graph_generation = generation
+                    return self._graph
+            generation, note_ids, links = repository.load_link_graph()
+            self._graph = LinkGraph.build(note_ids, links)
+            self._graph_generation = generation
+            return self._graph
+
+    def centrality(self, method: str = "degree") -> dict[str, float]:
+        """Compute a centrality score for every note.
+
+        Args:
+            method: "degree" (incoming + outgoing links), "weighted" (link
+                type weighted degree) or "pagerank"
+
+        Returns:
+            Mapping of note ID to score
+        """
+        if method not in CENTRALITY_METHODS:
+            raise ValueError(
+                f"Invalid centrality method: {method}. "
+                f"Use one of: {', '.join(CENTRALITY_METHODS)}"
+            )
+        with self._lock:
+            graph = self.get_graph()
+            generation = self._graph_generation
+            cached = self._scores.get(method)
+            if cached and cached[0] == generation:
+                return cached[1]
+
+            scores: dict[str, float]
+            if method == "degree":
+                scores = {
+                    note_id: graph.in_degree[i] + graph.out_degree[i]
+                    for i, note_id in enumerate(graph.note_ids)
+                }
+            elif method == "weighted":
+                scores = dict(zip(graph.note_ids, graph.weighted_degree, strict=True))
+            else:
+                scores = graph.pagerank_scores()
+            self._scores[method] = (generation, scores)
+            return scores
+
+    def find_central_notes(
+        self, limit: int = 10, method: str = "degree"
+    ) -> list[tuple[Note, float]]:
+        """Find the most central notes that have at least one connection.
+
+        Args:
+            limit: Maximum number of notes to return
+            method: Centrality measure, see `centrality`
+
+        Returns:
+            List of (note, score) tuples, highest score first. Notes are
+            read from their files like `ZettelService.get_note`, so their
+            content starts with the title heading and tags keep their order.
+        """
+        with self._lock:
+            scores = self.centrality(method)
+            graph = self.get_graph()
+            connected = [
+                (note_id, score)
+                for note_id, score in scores.items()
+                if graph.in_degree[graph.index[note_id]]
+                + graph.out_degree[graph.index[note_id]]
+                > 0
+            ]
+        connected.sort(key=lambda item: (-item[1], item[0]))
+        top = [
+            (self.zettel_service.get_note(note_id), score)
+            for note_id, score in connected[:limit]
+        ]
+        return [(note, score) for note, score in top if note is not None]
+
+    def find_path(
+        self,
+        source_id: str,
+        target_id: str,
+        direction: str = "both",
+        link_types: set[str] | None = None,
+        max_depth: int | None = None,
+    ) -> list[GraphStep] | None:
+        """Find a shortest chain of links between two notes.
+
+        See `shortest_path` for the arguments.
+        """
+        self._check_direction(direction)
+        with self._lock:
+            return shortest_path(
+                self.get_graph(), source_id, target_id, direction, link_types, max_depth
+            )
+
+    def get_neighborhood(
+        self,
+        note_id: str,
+        depth: int = 2,
+        direction: str = "both",
+        link_types: set[str] | None = None,
+        max_nodes: int | None = None,
+    ) -> tuple[list[GraphStep], bool]:
+        """Collect the notes within a number of links of a note.
+
+        See `neighborhood` for the arguments.
+        """
+        self._check_direction(direction)
+        with self._lock:
+            return neighborhood(
+                self.get_graph(), note_id, depth, direction, link_types, max_nodes
+            )
+
+    @staticmethod
+    def _check_direction(direction: str) -> None:
+        """Reject unknown traversal directions."""
+        if direction not in TRAVERSAL_DIRECTIONS:
+            raise ValueError(
+                f"Invalid direction: {direction}. Use 'outgoing', 'incoming', or 'both'"
+            )
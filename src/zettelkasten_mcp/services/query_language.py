@@ -0,0 +1,333 @@
+"""A small boolean query language for notes, compiled to one SQL condition.
+
+Grammar (operators are case-sensitive; AND is implied between terms)::
+
+    query   := or_expr
+    or_expr := and_expr ("OR" and_expr)*
+    and_expr:= unary (["AND"] unary)*
+    unary   := ("NOT" | "-") unary | primary
+    primary := "(" or_expr ")" | field ":" value | '"' phrase '"' | word
+
+Words and phrases match as case-insensitive substrings of the title or
+content. Field qualifiers:
+
+    tag:NAME           note has the tag
+    type:TYPE          note type (permanent, fleeting, ...)
+    title:TEXT         substring of the title only
+    created:DATE       created that day; also created:>=DATE, created:<DATE,
+    updated:DATE       ... and created:DATE..DATE (both days included)
+    link:ID            note links to or is linked from the note ID
+    linkto:ID          note links to the note ID
+    linkfrom:ID        the note ID links to this note
+
+For example: ``tag:ml AND "gradient descent" -draft type:permanent``.
+"""
+
+import datetime
+import re
+from dataclasses import dataclass
+
+from sqlalchemy import (
+    ColumnElement,
+    and_,
+    column,
+    literal_column,
+    not_,
+    or_,
+    select,
+    table,
+)
+
+from zettelkasten_mcp.models.db_models import (
+    TRIGRAM_LENGTH,
+    DBLink,
+    DBNote,
+    DBTag,
+    note_tags,
+)
+from zettelkasten_mcp.models.schema import NoteType
+
+_TRIGRAM = table("notes_trigram", column("rowid"))
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<space>\s+)
+    | (?P<paren>[()])
+    | (?P<field>[A-Za-z]+):(?:"(?P<field_phrase>[^"]*)"|(?P<field_value>[^\s()"]+))
+    | "(?P<phrase>[^"]*)"
+    | (?P<negate>-)(?=[^\s)])
+    | (?P<word>[^\s()"]+)
+    """,
+    re.VERBOSE,
+)
+_DATE_RE = re.compile(r"^(?P<op>>=|<=|>|<|=)?(?P<date>[^.]+)(?:\.\.(?P<end>.+))?$")
+
+FIELDS = (
+    "tag",
+    "type",
+    "title",
+    "created",
+    "updated",
+    "link",
+    "linkto",
+    "linkfrom",
+)
+
+
+class QuerySyntaxError(ValueError):
+    """Raised for a query that does not follow the grammar."""
+
+
+@dataclass(frozen=True)
+class Text:
+    """A word or phrase to find in the title and content."""
+
+    value: str
+
+
+@dataclass(frozen=True)
+class FieldFilter:
+    """A field qualifier such as tag:ml."""
+
+    name: str
+    value: str
+
+
+@dataclass(frozen=True)
+class Not:
+    """Negation of a subquery."""
+
+    operand: "Node"
+
+
+@dataclass(frozen=True)
+class And:
+    """Conjunction of subqueries."""
+
+    operands: tuple["Node", ...]
+
+
+@dataclass(frozen=True)
+class Or:
+    """Disjunction of subqueries."""
+
+    operands: tuple["Node", ...]
+
+
+Node = Text | FieldFilter | Not | And | Or
+
+
+def _tokenize(query: str) -> list[tuple[str, str]]:
+    """Split a query into (kind, value) tokens."""
+    tokens = []
+    position = 0
+    while position < len(query):
+        match = _TOKEN_RE.match(query, position)
+        if match is None:
+            # Only an unterminated quote fails to match
+            raise QuerySyntaxError(f"Unterminated quote at position {position}")
+        position = match.end()
+        kind = match.lastgroup
+        if kind == "space":
+            continue
+        if kind in ("field_phrase", "field_value"):
+            name = match.group("field").lower()
+            if name not in FIELDS:
+                raise QuerySyntaxError(
+                    f"Unknown field: {name}. Valid fields are: {', '.join(FIELDS)}"
+                )
+            tokens.append(("field", f"{name}:{match.group(kind)}"))
+        elif kind == "paren" or match.group(kind) in ("AND", "OR", "NOT"):
+            # Operators and parentheses are their own kind
+            tokens.append((match.group(kind), match.group(kind)))
+        elif kind == "negate":
+            tokens.append(("NOT", "-"))
+        else:
+            tokens.append((kind, match.group(kind)))
+    return tokens
+
+
+class _Parser:
+    """Recursive descent parser over the tokens of a query."""
+
+    def __init__(self, tokens: list[tuple[str, str]]):
+        """Initialize the parser at the first token."""
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self) -> str | None:
+        """Return the kind of the next token, if any."""
+        if self.position < len(self.tokens):
+            return self.tokens[self.position][0]
+        return None
+
+    def take(self) -> tuple[str, str]:
+        """Consume the next token."""
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def parse_or(self) -> Node:
+        """Parse terms joined by OR."""
+        operands = [self.parse_and()]
+        while self.peek() == "OR":
+            self.take()
+            operands.append(self.parse_and())
+        return operands[0] if len(operands) == 1 else Or(tuple(operands))
+
+    def parse_and(self) -> Node:
+        """Parse terms joined by AND, explicitly or by juxtaposition."""
+        operands = [self.parse_unary()]
+        while self.peek() not in (None, "OR", ")"):
+            if self.peek() == "AND":
+                self.take()
+            operands.append(self.parse_unary())
+        return operands[0] if len(operands) == 1 else And(tuple(operands))
+
+    def parse_unary(self) -> Node:
+        """Parse a term with any number of negations."""
+        if self.peek() == "NOT":
+            self.take()
+            return Not(self.parse_unary())
+        return self.parse_primary()
+
+    def parse_primary(self) -> Node:
+        """Parse a parenthesized query, field qualifier, phrase or word."""
+        if self.peek() is None:
+            raise QuerySyntaxError("Query ends where a term was expected")
+        kind, value = self.take()
+        if kind == "(":
+            node = self.parse_or()
+            if self.peek() != ")":
+                raise QuerySyntaxError("Missing closing parenthesis")
+            self.take()
+            return node
+        if kind in ("word", "phrase"):
+            return Text(value)
+        if kind == "field":
+            name, _, field_value = value.partition(":")
+            return FieldFilter(name, field_value)
+        raise QuerySyntaxError(f"Unexpected {value!r}")
+
+
+def parse_query(query: str) -> Node:
+    """Parse a query into its syntax tree.
+
+    Raises:
+        QuerySyntaxError: If the query does not follow the grammar
+    """
+    tokens = _tokenize(query)
+    if not tokens:
+        raise QuerySyntaxError("Empty query")
+    parser = _Parser(tokens)
+    node = parser.parse_or()
+    if parser.peek() is not None:
+        raise QuerySyntaxError(f"Unexpected {parser.take()[1]!r}")
+    return node
+
+
+def positive_terms(node: Node) -> list[str]:
+    """Return the text terms that matching notes contain (those not negated)."""
+    if isinstance(node, Text):
+        return [node.value]
+    if isinstance(node, (And, Or)):
+        return [term for operand in node.operands for term in positive_terms(operand)]
+    return []
+
+
+def _contains(column_name: str, value: str) -> ColumnElement[bool]:
+    """Match a case-insensitive substring of the title or content (or both)."""
+    if len(value) >= TRIGRAM_LENGTH:
+        # Phrases of a trigram table match as substrings
+        phrase = '"' + value.replace('"', '""') + '"'
+        if column_name != "both":
+            phrase = f"{column_name} : {phrase}"
+        return literal_column("notes.rowid").in_(
+            select(_TRIGRAM.c.rowid).where(
+                literal_column("notes_trigram").op("MATCH")(phrase)
+            )
+        )
+    pattern = "%" + re.sub(r"([\\%_])", r"\\\1", value) + "%"
+    columns = (
+        [DBNote.title, DBNote.content]
+        if column_name == "both"
+        else [getattr(DBNote, column_name)]
+    )
+    return or_(*(col.ilike(pattern, escape="\\") for col in columns))
+
+
+def _parse_day(value: str) -> datetime.datetime:
+    """Parse the start of a day given as YYYY-MM-DD."""
+    try:
+        return datetime.datetime.combine(
+            datetime.date.fromisoformat(value), datetime.time()
+        )
+    except ValueError as e:
+        raise QuerySyntaxError(f"Invalid date {value!r}, use YYYY-MM-DD") from e
+
+
+def _date_condition(column_name: str, value: str) -> ColumnElement[bool]:
+    """Compile created:/updated: comparisons and ranges over whole days."""
+    match = _DATE_RE.match(value)
+    if match is None:
+        raise QuerySyntaxError(f"Invalid date filter {value!r}")
+    column_ = DBNote.created_at if column_name == "created" else DBNote.updated_at
+    start = _parse_day(match.group("date"))
+    day = datetime.timedelta(days=1)
+    if match.group("end"):
+        if match.group("op"):
+            raise QuerySyntaxError(f"A date range takes no comparison: {value!r}")
+        return and_(column_ >= start, column_ < _parse_day(match.group("end")) + day)
+    op = match.group("op") or "="
+    return {
+        "=": lambda: and_(column_ >= start, column_ < start + day),
+        ">=": lambda: column_ >= start,
+        ">": lambda: column_ >= start + day,
+        "<": lambda: column_ < start,
+        "<=": lambda: column_ < start + day,
+    }[op]()
+
+
+def _field_condition(node: FieldFilter) -> ColumnElement[bool]:
+    """Compile a field qualifier."""
+    name, value = node.name, node.value
+    if name == "tag":
+        return DBNote.id.in_(
+            select(note_tags.c.note_id)
+            .join(DBTag, DBTag.id == note_tags.c.tag_id)
+            .where(DBTag.name == value)
+        )
+    if name == "type":
+        try:
+            return DBNote.note_type == NoteType(value.lower()).value
+        except ValueError as e:
+            raise QuerySyntaxError(
+                f"Invalid note type: {value}. Valid types are: "
+                f"{', '.join(t.value for t in NoteType)}"
+            ) from e
+    if name == "title":
+        return _contains("title", value)
+    if name in ("created", "updated"):
+        return _date_condition(name, value)
+    links_to = DBNote.id.in_(select(DBLink.source_id).where(DBLink.target_id == value))
+    linked_from = DBNote.id.in_(
+        select(DBLink.target_id).where(DBLink.source_id == value)
+    )
+    if name == "linkto":
+        return links_to
+    if name == "linkfrom":
+        return linked_from
+    return or_(links_to, linked_from)
+
+
+def compile_query(node: Node) -> ColumnElement[bool]:
+    """Compile a syntax tree to a condition on the notes table."""
+    if isinstance(node, Text):
+        return _contains("both", node.value)
+    if isinstance(node, FieldFilter):
+        return _field_condition(node)
+    if isinstance(node, Not):
+        return not_(compile_query(node.operand))
+    if isinstance(node, And):
+        return and_(*(compile_query(operand) for operand in node.operands))
+    return or_(*(compile_query(operand) for operand in node.operands))
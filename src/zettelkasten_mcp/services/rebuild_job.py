@@ -0,0 +1,124 @@
+"""Background index rebuilds with progress tracking."""
+
+import logging
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import asdict
+from typing import Any
+
+from zettelkasten_mcp.storage.note_repository import RebuildProgress
+
+logger = logging.getLogger(__name__)
+
+
+class RebuildJob:
+    """Runs index rebuilds in a background thread, one at a time.
+
+    A rebuild of a large notes directory can take longer than an MCP client
+    is willing to wait for a tool call, so it runs detached from the call that
+    started it. Starting a rebuild while one is running returns the running
+    one. Its progress can be polled with `status` at any time, and `wait`
+    blocks until it finishes.
+    """
+
+    def __init__(
+        self,
+        rebuild: Callable[[Callable[[RebuildProgress], None]], RebuildProgress],
+    ):
+        """Initialize the job.
+
+        Args:
+            rebuild: Runs a rebuild, calling the given callable with its progress
+        """
+        self._rebuild = rebuild
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._job_id: str | None = None
+        self._state = "idle"
+        self._progress = RebuildProgress()
+        self._error: str | None = None
+        self._started_at: float | None = None
+        self._finished_at: float | None = None
+        self._done = threading.Event()
+        self._done.set()
+
+    def start(self) -> tuple[dict[str, Any], bool]:
+        """Start a rebuild unless one is already running.
+
+        Returns:
+            The status of the rebuild, and whether it was started by this call
+        """
+        with self._lock:
+            if self._state == "running":
+                return self._status(), False
+            self._job_id = uuid.uuid4().hex[:8]
+            self._state = "running"
+            self._progress = RebuildProgress()
+            self._error = None
+            self._started_at = time.time()
+            self._finished_at = None
+            self._done.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="zettelkasten-index-rebuild", daemon=True
+            )
+            self._thread.start()
+            return self._status(), True
+
+    def _run(self) -> None:
+        """Run the rebuild and record how it ended."""
+        try:
+            progress = self._rebuild(self._report)
+            state, error = "completed", None
+        except Exception as e:
+            logger.error(f"Index rebuild failed: {e}", exc_info=True)
+            progress, state, error = None, "failed", str(e)
+        with self._lock:
+            if progress is not None:
+                self._progress = progress
+            self._state = state
+            self._error = error
+            self._finished_at = time.time()
+        self._done.set()
+
+    def _report(self, progress: RebuildProgress) -> None:
+        """Record the progress reported by the rebuild."""
+        with self._lock:
+            # Copied, as the rebuild keeps updating its own instance
+            self._progress = RebuildProgress(**asdict(progress))
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait for the current rebuild, if any, to finish.
+
+        Returns:
+            True if no rebuild is running anymore
+        """
+        return self._done.wait(timeout)
+
+    def status(self) -> dict[str, Any]:
+        """Return the state and progress of the current or last rebuild."""
+        with self._lock:
+            return self._status()
+
+    def _status(self) -> dict[str, Any]:
+        """Build the status payload; the caller holds `self._lock`."""
+        progress = self._progress
+        end = self._finished_at or time.time()
+        elapsed = end - self._started_at if self._started_at else 0.0
+        eta = None
+        if self._state == "running" and progress.scanned:
+            remaining = max(progress.total - progress.scanned, 0)
+            eta = round(elapsed * remaining / progress.scanned, 1)
+        return {
+            "job_id": self._job_id,
+            "state": self._state,
+            "total": progress.total,
+            "scanned": progress.scanned,
+            "indexed": progress.indexed,
+            "errors": progress.errors,
+            "previous_count": progress.previous_count,
+            "elapsed_seconds": round(elapsed, 1),
+            "eta_seconds": eta,
+            "error": self._error,
+        }
@@ -0,0 +1,99 @@
+"""Bounded LRU cache for query results, invalidated by write generation."""
+
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class ResultCache:
+    """LRU cache of query results tied to a repository write generation.
+
+    Every mutation of the repository bumps its generation counter. Entries are
+    only valid for the generation they were computed at, so the whole cache is
+    dropped as soon as a lookup observes a newer generation. Between writes,
+    repeated identical queries are served from memory.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of results kept; the least recently
+                used entry is evicted first. 0 disables caching.
+        """
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self._generation: int | None = None
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    @staticmethod
+    def make_key(name: str, arguments: dict[str, Any]) -> str:
+        """Build a cache key from a query name and its arguments."""
+        return f"{name}:{json.dumps(arguments, sort_keys=True, default=str)}"
+
+    def get_or_compute(
+        self,
+        name: str,
+        arguments: dict[str, Any],
+        generation: int,
+        compute: Callable[[], T],
+    ) -> T:
+        """Return the cached result for a query, computing it on a miss.
+
+        Args:
+            name: Name of the query, e.g. the service method
+            arguments: Arguments identifying the query
+            generation: Current write generation of the repository
+            compute: Zero-argument callable producing the result
+
+        Returns:
+            The cached or freshly computed result
+        """
+        if self.max_entries <= 0:
+            return compute()
+
+        key = self.make_key(name, arguments)
+        with self._lock:
+            if generation != self._generation:
+                if self._entries:
+                    self._stats["invalidations"] += 1
+                self._entries.clear()
+                self._generation = generation
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return self._entries[key]
+            self._stats["misses"] += 1
+
+        result = compute()
+
+        with self._lock:
+            # Don't store a result computed against a generation that is
+            # already outdated
+            if generation == self._generation:
+                self._entries[key] = result
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._stats["evictions"] += 1
+        return result
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Return cache counters and current size."""
+        with self._lock:
+            return {
+                **self._stats,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "generation": self._generation,
+            }
@@ -1,15 +1,39 @@
 """Service for searching and discovering notes in the Zettelkasten."""
 
+import json
+import logging
+import re
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from datetime import datetime
-
-from sqlalchemy import or_, select, text
-from sqlalchemy.orm import joinedload
-
-from zettelkasten_mcp.models.db_models import DBLink, DBNote
+from typing import Any, TypeVar
+
+from sqlalchemy import func, literal, select, text, union_all
+
+from zettelkasten_mcp.config import config
+from zettelkasten_mcp.models.db_models import (
+    TRIGRAM_LENGTH,
+    DBLink,
+    DBNote,
+    DBTag,
+    note_tags,
+)
 from zettelkasten_mcp.models.schema import Note, NoteType
+from zettelkasten_mcp.services.graph_service import GraphService
+from zettelkasten_mcp.services.query_language import (
+    FieldFilter,
+    Or,
+    compile_query,
+    parse_query,
+    positive_terms,
+)
+from zettelkasten_mcp.services.result_cache import ResultCache
 from zettelkasten_mcp.services.zettel_service import ZettelService
 
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
 
 @dataclass
 class SearchResult:
@@ -21,12 +45,109 @@ class SearchResult:
     matched_context: str
 
 
+@dataclass
+class SearchFacets:
+    """Counts of the notes in a result set, to show how it can be narrowed."""
+
+    # Ordered by descending count
+    tags: dict[str, int]
+    note_types: dict[str, int]
+    # Keyed by creation month, "YYYY-MM", newest first
+    months: dict[str, int]
+
+
+@dataclass
+class GrepResult:
+    """A note with the lines matching a grep pattern."""
+
+    note: Note
+    # (line number, line) of each matching content line; line 0 is the title
+    lines: list[tuple[int, str]]
+
+
+def _literal_runs(sre_parse: Any, parsed: Any) -> list[str]:
+    """Collect the literal runs that every match of a parsed regex contains."""
+    repeats = {
+        sre_parse.MAX_REPEAT,
+        sre_parse.MIN_REPEAT,
+        getattr(sre_parse, "POSSESSIVE_REPEAT", sre_parse.MAX_REPEAT),
+    }
+    runs: list[str] = []
+    current: list[str] = []
+    for op, av in parsed:
+        if op is sre_parse.LITERAL:
+            current.append(chr(av))
+            continue
+        runs.append("".join(current))
+        current = []
+        if op is sre_parse.SUBPATTERN:
+            runs.extend(_literal_runs(sre_parse, av[-1]))
+        elif op in repeats and av[0] >= 1:
+            runs.extend(_literal_runs(sre_parse, av[2]))
+        elif op is getattr(sre_parse, "ATOMIC_GROUP", None):
+            runs.extend(_literal_runs(sre_parse, av))
+        # Alternations, classes, wildcards and optional parts guarantee nothing
+    runs.append("".join(current))
+    return runs
+
+
+def _regex_literal_runs(pattern: str) -> list[str]:
+    """Return the literal runs every match of a regex contains, if known.
+
+    They are read from the parse tree of the private parser behind `re`,
+    which may change between Python releases. Should reading it fail, no
+    runs are returned, so a search checks every note instead of failing.
+    """
+    try:
+        try:
+            from re import _parser as sre_parse
+        except ImportError:  # pragma: no cover - Python 3.10
+            import sre_parse
+        return _literal_runs(sre_parse, sre_parse.parse(pattern))
+    except Exception as e:
+        logger.debug(f"Cannot extract literals from regex {pattern!r}: {e}")
+        return []
+
+
+def required_substrings(pattern: str, regex: bool = False) -> list[str]:
+    """Return substrings that every text matching a pattern must contain.
+
+    Only substrings the trigram index can look up (three or more
+    characters) are returned; an empty list means any note may match.
+
+    Args:
+        pattern: Substring, or regular expression if `regex` is set
+        regex: Whether the pattern is a regular expression
+    """
+    runs = _regex_literal_runs(pattern) if regex else [pattern]
+    return list(dict.fromkeys(run for run in runs if len(run) >= TRIGRAM_LENGTH))
+
+
 class SearchService:
     """Service for searching notes in the Zettelkasten."""
 
     def __init__(self, zettel_service: ZettelService | None = None):
         """Initialize the search service."""
         self.zettel_service = zettel_service or ZettelService()
+        self.graph_service = GraphService(self.zettel_service)
+        # Results of expensive queries, valid until the next repository write
+        self.result_cache = ResultCache(max_entries=config.result_cache_size)
+
+    def _cached(
+        self,
+        name: str,
+        enabled: bool,
+        arguments: dict[str, Any],
+        compute: Callable[[], list[T]],
+    ) -> list[T]:
+        """Serve a query from the result cache if caching is enabled for it."""
+        if not enabled:
+            return compute()
+        results = self.result_cache.get_or_compute(
+            name, arguments, self.zettel_service.repository.generation, compute
+        )
+        # Callers may sort or truncate the list; keep the cached copy intact
+        return list(results)
 
     def initialize(self) -> None:
         """Initialize the service and dependencies."""
@@ -99,6 +220,138 @@ def search_by_text(
         results.sort(key=lambda x: x.score, reverse=True)
         return results
 
+    def grep_notes(
+        self,
+        pattern: str,
+        regex: bool = False,
+        case_sensitive: bool = False,
+        limit: int | None = None,
+    ) -> list[GrepResult]:
+        """Find notes whose title or content lines match a substring or regex.
+
+        The trigram index narrows the notes to those containing every
+        substring a match requires, and only those are checked line by
+        line. Patterns without three consecutive literal characters check
+        every note.
+
+        Args:
+            pattern: Substring to find, or regular expression if `regex` is set
+            regex: Whether the pattern is a regular expression
+            case_sensitive: Whether letter case must match
+            limit: Maximum number of notes to return
+
+        Returns:
+            Matching notes in ID order, with their matching lines
+
+        Raises:
+            ValueError: If the regular expression is invalid
+        """
+        if not pattern:
+            return []
+        try:
+            compiled = re.compile(
+                pattern if regex else re.escape(pattern),
+                0 if case_sensitive else re.IGNORECASE,
+            )
+        except re.error as e:
+            raise ValueError(f"Invalid regular expression: {e}") from e
+
+        substrings = required_substrings(pattern, regex)
+        repository = self.zettel_service.repository
+        matches: dict[str, list[tuple[int, str]]] = {}
+        with repository.session_factory() as session:
+            if substrings:
+                # Phrases of a trigram table match as substrings
+                query = " AND ".join(
+                    '"' + substring.replace('"', '""') + '"' for substring in substrings
+                )
+                rows = session.execute(
+                    text(
+                        "SELECT notes.id, notes.title, notes.content "
+                        "FROM notes_trigram "
+                        "JOIN notes ON notes.rowid = notes_trigram.rowid "
+                        "WHERE notes_trigram MATCH :query ORDER BY notes.id"
+                    ),
+                    {"query": query},
+                )
+            else:
+                rows = session.execute(
+                    select(DBNote.id, DBNote.title, DBNote.content).order_by(DBNote.id)
+                )
+            for note_id, title, content in rows:
+                lines = [(0, title)] if compiled.search(title) else []
+                lines.extend(
+                    (number, line)
+                    for number, line in enumerate(content.splitlines(), 1)
+                    if compiled.search(line)
+                )
+                if lines:
+                    matches[note_id] = lines
+                    if limit and len(matches) >= limit:
+                        break
+
+        return [
+            GrepResult(note=note, lines=matches[note.id])
+            for note in repository.get_summaries(matches)
+        ]
+
+    def facet_counts(
+        self, note_ids: Iterable[str], max_tags: int | None = None
+    ) -> SearchFacets:
+        """Count a set of notes per tag, note type and creation month.
+
+        All three facets are computed by one grouped query in the index; the
+        IDs are passed as a single JSON parameter, so any number of them
+        fits in the statement.
+
+        Args:
+            note_ids: IDs of the notes, e.g. of a search result
+            max_tags: Keep only this many of the most frequent tags
+        """
+        matched = (
+            func.json_each(json.dumps(list(note_ids)))
+            .table_valued("value")
+            .alias("matched")
+        )
+        by_tag = (
+            select(literal("tag"), DBTag.name, func.count())
+            .select_from(matched)
+            .join(note_tags, note_tags.c.note_id == matched.c.value)
+            .join(DBTag, DBTag.id == note_tags.c.tag_id)
+            .group_by(DBTag.name)
+        )
+        by_type = (
+            select(literal("type"), DBNote.note_type, func.count())
+            .select_from(matched)
+            .join(DBNote, DBNote.id == matched.c.value)
+            .group_by(DBNote.note_type)
+        )
+        month = func.strftime("%Y-%m", DBNote.created_at)
+        by_month = (
+            select(literal("month"), month, func.count())
+            .select_from(matched)
+            .join(DBNote, DBNote.id == matched.c.value)
+            .group_by(month)
+        )
+        counts: dict[str, list[tuple[str, int]]] = {"tag": [], "type": [], "month": []}
+        with self.zettel_service.repository.session_factory() as session:
+            for facet, value, count in session.execute(
+                union_all(by_tag, by_type, by_month)
+            ):
+                counts[facet].append((value, count))
+
+        def ordered(pairs: list[tuple[str, int]]) -> dict[str, int]:
+            return dict(sorted(pairs, key=lambda pair: (-pair[1], pair[0])))
+
+        tags = ordered(counts["tag"])
+        if max_tags is not None:
+            tags = dict(list(tags.items())[:max_tags])
+        return SearchFacets(
+            tags=tags,
+            note_types=ordered(counts["type"]),
+            months=dict(sorted(counts["month"], reverse=True)),
+        )
+
     def search_by_tag(self, tags: str | list[str]) -> list[Note]:
         """Search for notes by tags."""
         if isinstance(tags, str):
@@ -119,86 +372,49 @@ def search_by_link(self, note_id: str, direction: str = "both") -> list[Note]:
 
     def find_orphaned_notes(self) -> list[Note]:
         """Find notes with no incoming or outgoing links."""
-        orphans = []
-
-        with self.zettel_service.repository.session_factory() as session:
-            # Subquery for notes with links
-            notes_with_links = (
-                select(DBNote.id)
-                .outerjoin(
-                    DBLink,
-                    or_(DBNote.id == DBLink.source_id, DBNote.id == DBLink.target_id),
-                )
-                .where(or_(DBLink.source_id is not None, DBLink.target_id is not None))
-                .subquery()
-            )
+        return self._cached(
+            "find_orphaned_notes",
+            config.cache_orphaned_notes_enabled,
+            {},
+            self._find_orphaned_notes,
+        )
 
-            # Query for notes without links
+    def _find_orphaned_notes(self) -> list[Note]:
+        """Find orphaned notes without consulting the result cache."""
+        repository = self.zettel_service.repository
+        with repository.session_factory() as session:
+            # Anti-join: notes for which no link row exists in either direction
+            has_outgoing = select(DBLink.id).where(DBLink.source_id == DBNote.id)
+            has_incoming = select(DBLink.id).where(DBLink.target_id == DBNote.id)
             query = (
-                select(DBNote)
-                .options(
-                    joinedload(DBNote.tags),
-                    joinedload(DBNote.outgoing_links),
-                    joinedload(DBNote.incoming_links),
-                )
-                .where(DBNote.id.not_in(select(notes_with_links)))
-            )
-
-            result = session.execute(query)
-            orphaned_db_notes = result.unique().scalars().all()
-
-            # Convert DB notes to model Notes
-            for db_note in orphaned_db_notes:
-                note = self.zettel_service.get_note(db_note.id)
-                if note:
-                    orphans.append(note)
-
-        return orphans
-
-    def find_central_notes(self, limit: int = 10) -> list[tuple[Note, int]]:
-        """Find notes with the most connections (incoming + outgoing links)."""
-        note_connections = []
-        # Direct database query to count connections for all notes at once
-        with self.zettel_service.repository.session_factory() as session:
-            # Use a CTE for better readability and performance
-            query = text("""
-            WITH outgoing AS (
-                SELECT source_id as note_id, COUNT(*) as outgoing_count
-                FROM links
-                GROUP BY source_id
-            ),
-            incoming AS (
-                SELECT target_id as note_id, COUNT(*) as incoming_count
-                FROM links
-                GROUP BY target_id
+                select(DBNote.id)
+                .where(~has_outgoing.exists(), ~has_incoming.exists())
+                .order_by(DBNote.id)
             )
-            SELECT n.id,
-                COALESCE(o.outgoing_count, 0) as outgoing,
-                COALESCE(i.incoming_count, 0) as incoming,
-                (COALESCE(o.outgoing_count, 0) + COALESCE(i.incoming_count, 0)) as total
-            FROM notes n
-            LEFT JOIN outgoing o ON n.id = o.note_id
-            LEFT JOIN incoming i ON n.id = i.note_id
-            WHERE (COALESCE(o.outgoing_count, 0) + COALESCE(i.incoming_count, 0)) > 0
-            ORDER BY total DESC
-            LIMIT :limit
-            """)
-
-            results = session.execute(query, {"limit": limit}).all()
-
-            # Process results
-            for note_id, outgoing_count, incoming_count, total_connections in results:
-                total_connections = outgoing_count + incoming_count
-                if total_connections > 0:  # Only include notes with connections
-                    note = self.zettel_service.get_note(note_id)
-                    if note:
-                        note_connections.append((note, total_connections))
-
-        # Sort by total connections (descending)
-        note_connections.sort(key=lambda x: x[1], reverse=True)
-
-        # Return top N notes
-        return note_connections[:limit]
+            orphan_ids = session.scalars(query).all()
+
+        # Summaries come from the index, so no note files are opened
+        return repository.get_summaries(orphan_ids)
+
+    def find_central_notes(
+        self, limit: int = 10, method: str = "degree"
+    ) -> list[tuple[Note, float]]:
+        """Find the most central notes in the link graph.
+
+        Args:
+            limit: Maximum number of notes to return
+            method: "degree" ranks by incoming + outgoing links, "weighted" by
+                link-type-weighted degree and "pagerank" by PageRank
+
+        Returns:
+            List of (note, score) tuples, highest score first
+        """
+        return self._cached(
+            "find_central_notes",
+            config.cache_central_notes_enabled,
+            {"limit": limit, "method": method},
+            lambda: self.graph_service.find_central_notes(limit, method),
+        )
 
     def find_notes_by_date_range(
         self,
@@ -242,6 +458,28 @@ def search_combined(
         end_date: datetime | None = None,
     ) -> list[SearchResult]:
         """Perform a combined search with multiple criteria."""
+        return self._cached(
+            "search_combined",
+            config.cache_search_enabled,
+            {
+                "text": text,
+                "tags": sorted(tags) if tags else None,
+                "note_type": note_type,
+                "start_date": start_date,
+                "end_date": end_date,
+            },
+            lambda: self._search_combined(text, tags, note_type, start_date, end_date),
+        )
+
+    def _search_combined(
+        self,
+        text: str | None,
+        tags: list[str] | None,
+        note_type: NoteType | None,
+        start_date: datetime | None,
+        end_date: datetime | None,
+    ) -> list[SearchResult]:
+        """Perform a combined search without consulting the result cache."""
         # Start with all notes
         all_notes = self.zettel_service.get_all_notes()
 
@@ -326,3 +564,93 @@ def search_combined(
         # Sort by score (descending)
         results.sort(key=lambda x: x.score, reverse=True)
         return results
+
+    def search_query(
+        self,
+        query: str,
+        tags: list[str] | None = None,
+        note_type: NoteType | None = None,
+    ) -> list[SearchResult]:
+        """Search with the boolean query language of `query_language`.
+
+        The whole query is compiled to a single SQL condition, so only the
+        matching notes are loaded, from the index.
+
+        Args:
+            query: Query such as `tag:ml AND "gradient descent" -draft`
+            tags: Additionally require any of these tags
+            note_type: Additionally require this note type
+
+        Raises:
+            QuerySyntaxError: If the query does not follow the grammar
+        """
+        return self._cached(
+            "search_query",
+            config.cache_search_enabled,
+            {
+                "query": query,
+                "tags": sorted(tags) if tags else None,
+                "note_type": note_type,
+            },
+            lambda: self._search_query(query, tags, note_type),
+        )
+
+    def _search_query(
+        self,
+        query: str,
+        tags: list[str] | None,
+        note_type: NoteType | None,
+    ) -> list[SearchResult]:
+        """Run a query language search without consulting the result cache."""
+        node = parse_query(query)
+        conditions = [compile_query(node)]
+        if tags:
+            conditions.append(
+                compile_query(
+                    Or(tuple(FieldFilter("tag", tag) for tag in tags))
+                    if len(tags) > 1
+                    else FieldFilter("tag", tags[0])
+                )
+            )
+        if note_type:
+            conditions.append(DBNote.note_type == note_type.value)
+
+        repository = self.zettel_service.repository
+        with repository.session_factory() as session:
+            note_ids = session.scalars(
+                select(DBNote.id).where(*conditions).order_by(DBNote.id)
+            ).all()
+
+        # Rank by the terms the notes had to contain
+        terms = [term.lower() for term in positive_terms(node)]
+        results = []
+        for note in repository.get_summaries(note_ids):
+            title_lower = note.title.lower()
+            content_lower = note.content.lower()
+            score = 1.0
+            matched_context = ""
+            for term in terms:
+                if term in title_lower:
+                    score += 2.0
+                    matched_context = matched_context or f"Title: {note.title}"
+                if term in content_lower:
+                    score += 1.0
+                    if not matched_context:
+                        index = content_lower.find(term)
+                        start = max(0, index - 40)
+                        end = min(len(content_lower), index + len(term) + 40)
+                        matched_context = f"Content: ...{note.content[start:end]}..."
+            results.append(
+                SearchResult(
+                    note=note,
+                    score=score,
+                    matched_terms={
+                        term
+                        for term in terms
+                        if term in title_lower or term in content_lower
+                    },
+                    matched_context=matched_context,
+                )
+            )
+        results.sort(key=lambda x: x.score, reverse=True)
+        return results
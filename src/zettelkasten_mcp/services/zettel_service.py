@@ -4,8 +4,14 @@
 import logging
 from typing import Any
 
-from zettelkasten_mcp.models.schema import LinkType, Note, NoteType, Tag
-from zettelkasten_mcp.storage.note_repository import NoteRepository
+from zettelkasten_mcp.models.schema import Link, LinkType, Note, NoteType, Tag
+from zettelkasten_mcp.services.rebuild_job import RebuildJob
+from zettelkasten_mcp.storage.note_repository import (
+    DeleteResult,
+    NoteRepository,
+    RebuildProgress,
+)
+from zettelkasten_mcp.storage.title_index import TitleMatch
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +22,7 @@ class ZettelService:
     def __init__(self, repository: NoteRepository | None = None):
         """Initialize the service."""
         self.repository = repository or NoteRepository()
+        self.rebuild_job = RebuildJob(self.repository.rebuild_index)
 
     def initialize(self) -> None:
         """Initialize the service and dependencies."""
@@ -57,6 +64,10 @@ def get_note_by_title(self, title: str) -> Note | None:
         """Retrieve a note by title."""
         return self.repository.get_by_title(title)
 
+    def suggest_titles(self, title: str) -> list[TitleMatch]:
+        """Find notes whose titles are close to a title that matched none."""
+        return self.repository.find_similar_titles(title)
+
     def update_note(
         self,
         note_id: str,
@@ -67,31 +78,37 @@ def update_note(
         metadata: dict[str, Any] | None = None,
     ) -> Note:
         """Update an existing note."""
-        note = self.repository.get(note_id)
-        if not note:
-            raise ValueError(f"Note with ID {note_id} not found")
-
-        # Update fields
-        if title is not None:
-            note.title = title
-        if content is not None:
-            note.content = content
-        if note_type is not None:
-            note.note_type = note_type
-        if tags is not None:
-            note.tags = [Tag(name=tag) for tag in tags]
-        if metadata is not None:
-            note.metadata = metadata
-
-        note.updated_at = datetime.datetime.now()
-
-        # Save to repository
-        return self.repository.update(note)
+        # Hold the note's lock across the read-modify-write
+        with self.repository.lock_notes(note_id):
+            note = self.repository.get(note_id)
+            if not note:
+                raise ValueError(f"Note with ID {note_id} not found")
+
+            # Update fields
+            if title is not None:
+                note.title = title
+            if content is not None:
+                note.content = content
+            if note_type is not None:
+                note.note_type = note_type
+            if tags is not None:
+                note.tags = [Tag(name=tag) for tag in tags]
+            if metadata is not None:
+                note.metadata = metadata
+
+            note.updated_at = datetime.datetime.now()
+
+            # Save to repository
+            return self.repository.update(note)
 
     def delete_note(self, note_id: str) -> None:
         """Delete a note."""
         self.repository.delete(note_id)
 
+    def delete_notes(self, note_ids: list[str]) -> DeleteResult:
+        """Delete a set of notes in one operation."""
+        return self.repository.delete_many(note_ids)
+
     def get_all_notes(self) -> list[Note]:
         """Get all notes."""
         return self.repository.get_all()
@@ -106,19 +123,21 @@ def get_notes_by_tag(self, tag: str) -> list[Note]:
 
     def add_tag_to_note(self, note_id: str, tag: str) -> Note:
         """Add a tag to a note."""
-        note = self.repository.get(note_id)
-        if not note:
-            raise ValueError(f"Note with ID {note_id} not found")
-        note.add_tag(tag)
-        return self.repository.update(note)
+        with self.repository.lock_notes(note_id):
+            note = self.repository.get(note_id)
+            if not note:
+                raise ValueError(f"Note with ID {note_id} not found")
+            note.add_tag(tag)
+            return self.repository.update(note)
 
     def remove_tag_from_note(self, note_id: str, tag: str) -> Note:
         """Remove a tag from a note."""
-        note = self.repository.get(note_id)
-        if not note:
-            raise ValueError(f"Note with ID {note_id} not found")
-        note.remove_tag(tag)
-        return self.repository.update(note)
+        with self.repository.lock_notes(note_id):
+            note = self.repository.get(note_id)
+            if not note:
+                raise ValueError(f"Note with ID {note_id} not found")
+            note.remove_tag(tag)
+            return self.repository.update(note)
 
     def get_all_tags(self) -> list[Tag]:
         """Get all tags in the system."""
@@ -147,58 +166,63 @@ def create_link(
         Returns:
             Tuple of (source_note, target_note or None)
         """
-        source_note = self.repository.get(source_id)
-        if not source_note:
-            raise ValueError(f"Source note with ID {source_id} not found")
-        target_note = self.repository.get(target_id)
-        if not target_note:
-            raise ValueError(f"Target note with ID {target_id} not found")
-
-        # Check if this link already exists before attempting to add it
-        for link in source_note.links:
-            if link.target_id == target_id and link.link_type == link_type:
-                # Link already exists, no need to add it again
-                if not bidirectional:
-                    return source_note, None
-                break
-        else:
-            # Only add the link if it doesn't exist
-            source_note.add_link(target_id, link_type, description)
-            source_note = self.repository.update(source_note)
+        # Lock both notes so a bidirectional link is written as a consistent pair
+        with self.repository.lock_notes(source_id, target_id):
+            source_note = self.repository.get(source_id)
+            if not source_note:
+                raise ValueError(f"Source note with ID {source_id} not found")
+            target_note = self.repository.get(target_id)
+            if not target_note:
+                raise ValueError(f"Target note with ID {target_id} not found")
+
+            # Check if this link already exists before attempting to add it
+            for link in source_note.links:
+                if link.target_id == target_id and link.link_type == link_type:
+                    # Link already exists, no need to add it again
+                    if not bidirectional:
+                        return source_note, None
+                    break
+            else:
+                # Only add the link if it doesn't exist
+                source_note.add_link(target_id, link_type, description)
+                source_note = self.repository.update(source_note)
+
+            # If bidirectional, add link from target to source with appropriate semantics
+            reverse_note = None
+            if bidirectional:
+                # If no explicit bidirectional type is provided, determine appropriate inverse
+                if bidirectional_type is None:
+                    # Map link types to their semantic inverses
+                    inverse_map = {
+                        LinkType.REFERENCE: LinkType.REFERENCE,
+                        LinkType.EXTENDS: LinkType.EXTENDED_BY,
+                        LinkType.EXTENDED_BY: LinkType.EXTENDS,
+                        LinkType.REFINES: LinkType.REFINED_BY,
+                        LinkType.REFINED_BY: LinkType.REFINES,
+                        LinkType.CONTRADICTS: LinkType.CONTRADICTED_BY,
+                        LinkType.CONTRADICTED_BY: LinkType.CONTRADICTS,
+                        LinkType.QUESTIONS: LinkType.QUESTIONED_BY,
+                        LinkType.QUESTIONED_BY: LinkType.QUESTIONS,
+                        LinkType.SUPPORTS: LinkType.SUPPORTED_BY,
+                        LinkType.SUPPORTED_BY: LinkType.SUPPORTS,
+                        LinkType.RELATED: LinkType.RELATED,
+                    }
+                    bidirectional_type = inverse_map.get(link_type, link_type)
+
+                # Check if the reverse link already exists before adding it
+                for link in target_note.links:
+                    if (
+                        link.target_id == source_id
+                        and link.link_type == bidirectional_type
+                    ):
+                        # Reverse link already exists, no need to add it again
+                        return source_note, target_note
+
+                # Only add the reverse link if it doesn't exist
+                target_note.add_link(source_id, bidirectional_type, description)
+                reverse_note = self.repository.update(target_note)
 
-        # If bidirectional, add link from target to source with appropriate semantics
-        reverse_note = None
-        if bidirectional:
-            # If no explicit bidirectional type is provided, determine appropriate inverse
-            if bidirectional_type is None:
-                # Map link types to their semantic inverses
-                inverse_map = {
-                    LinkType.REFERENCE: LinkType.REFERENCE,
-                    LinkType.EXTENDS: LinkType.EXTENDED_BY,
-                    LinkType.EXTENDED_BY: LinkType.EXTENDS,
-                    LinkType.REFINES: LinkType.REFINED_BY,
-                    LinkType.REFINED_BY: LinkType.REFINES,
-                    LinkType.CONTRADICTS: LinkType.CONTRADICTED_BY,
-                    LinkType.CONTRADICTED_BY: LinkType.CONTRADICTS,
-                    LinkType.QUESTIONS: LinkType.QUESTIONED_BY,
-                    LinkType.QUESTIONED_BY: LinkType.QUESTIONS,
-                    LinkType.SUPPORTS: LinkType.SUPPORTED_BY,
-                    LinkType.SUPPORTED_BY: LinkType.SUPPORTS,
-                    LinkType.RELATED: LinkType.RELATED,
-                }
-                bidirectional_type = inverse_map.get(link_type, link_type)
-
-            # Check if the reverse link already exists before adding it
-            for link in target_note.links:
-                if link.target_id == source_id and link.link_type == bidirectional_type:
-                    # Reverse link already exists, no need to add it again
-                    return source_note, target_note
-
-            # Only add the reverse link if it doesn't exist
-            target_note.add_link(source_id, bidirectional_type, description)
-            reverse_note = self.repository.update(target_note)
-
-        return source_note, reverse_note
+            return source_note, reverse_note
 
     def remove_link(
         self,
@@ -208,23 +232,25 @@ def remove_link(
         bidirectional: bool = False,
     ) -> tuple[Note, Note | None]:
         """Remove a link between notes."""
-        source_note = self.repository.get(source_id)
-        if not source_note:
-            raise ValueError(f"Source note with ID {source_id} not found")
-
-        # Remove link from source to target
-        source_note.remove_link(target_id, link_type)
-        source_note = self.repository.update(source_note)
+        # Lock both notes so a bidirectional link is removed as a consistent pair
+        with self.repository.lock_notes(source_id, target_id):
+            source_note = self.repository.get(source_id)
+            if not source_note:
+                raise ValueError(f"Source note with ID {source_id} not found")
+
+            # Remove link from source to target
+            source_note.remove_link(target_id, link_type)
+            source_note = self.repository.update(source_note)
 
-        # If bidirectional, remove link from target to source
-        reverse_note = None
-        if bidirectional:
-            target_note = self.repository.get(target_id)
-            if target_note:
-                target_note.remove_link(source_id, link_type)
-                reverse_note = self.repository.update(target_note)
+            # If bidirectional, remove link from target to source
+            reverse_note = None
+            if bidirectional:
+                target_note = self.repository.get(target_id)
+                if target_note:
+                    target_note.remove_link(source_id, link_type)
+                    reverse_note = self.repository.update(target_note)
 
-        return source_note, reverse_note
+            return source_note, reverse_note
 
     def get_linked_notes(self, note_id: str, direction: str = "outgoing") -> list[Note]:
         """Get notes linked to/from a note."""
@@ -233,9 +259,25 @@ def get_linked_notes(self, note_id: str, direction: str = "outgoing") -> list[No
             raise ValueError(f"Note with ID {note_id} not found")
         return self.repository.find_linked_notes(note_id, direction)
 
-    def rebuild_index(self) -> None:
+    def get_link_neighbors(
+        self, note_id: str, direction: str = "outgoing"
+    ) -> list[tuple[Link, Note]]:
+        """Get the links of a note paired with the note at their other end."""
+        if not self.repository.get_summaries([note_id]):
+            raise ValueError(f"Note with ID {note_id} not found")
+        return self.repository.find_link_neighbors(note_id, direction)
+
+    def rebuild_index(self) -> RebuildProgress:
         """Rebuild the database index from files."""
-        self.repository.rebuild_index()
+        return self.repository.rebuild_index()
+
+    def start_rebuild(self) -> tuple[dict[str, Any], bool]:
+        """Start rebuilding the index in the background (see `RebuildJob`)."""
+        return self.rebuild_job.start()
+
+    def get_rebuild_status(self) -> dict[str, Any]:
+        """Get the state and progress of the current or last background rebuild."""
+        return self.rebuild_job.status()
 
     def export_note(self, note_id: str, format: str = "markdown") -> str:
         """Export a note in the specified format."""
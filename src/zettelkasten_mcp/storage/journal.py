@@ -0,0 +1,218 @@
+"""Intent journal for recovering note writes interrupted by a crash."""
+
+import json
+import logging
+import os
+import threading
+import uuid
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from zettelkasten_mcp.storage.locking import fcntl
+
+logger = logging.getLogger(__name__)
+
+# Journal files opened by any WriteJournal of this process. Deliberately
+# process-wide: fcntl locks only exclude other processes, so this is how one
+# repository knows not to recover the live journal of another in the same
+# process (as happens with several repositories on one database in tests).
+_open_paths: set[Path] = set()
+_open_paths_lock = threading.Lock()
+
+
+def fsync_directory(path: Path) -> None:
+    """Flush a directory entry change (create, rename, unlink) to disk."""
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class WriteJournal:
+    """Append-only log of note writes that may not have reached the index yet.
+
+    Before a note file is written or removed, an intent naming the note is
+    appended and flushed to disk; once the database index reflects the change
+    the intent is marked as done. After a crash, the notes with unfinished
+    intents are the only ones whose file and index can disagree, so recovery
+    reconciles just those notes instead of rebuilding the whole index.
+
+    Every process appends to its own file in the journal directory and holds
+    an advisory lock on it while running. `recover` only replays files whose
+    lock can be taken, i.e. those left behind by processes that are gone.
+    """
+
+    def __init__(self, directory: Path, compact_bytes: int = 1 << 20):
+        """Create this process's journal file.
+
+        Args:
+            directory: Directory holding the journal files
+            compact_bytes: Rewrite the journal with only unfinished intents
+                once it grows beyond this size
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self.compact_bytes = compact_bytes
+        self.path = directory / f"{os.getpid()}-{uuid.uuid4().hex[:8]}.jsonl"
+        self._lock = threading.Lock()
+        self._pending: dict[int, tuple[str, ...]] = {}
+        self._seq = 0
+        self._size = 0
+        self._fd = self._open(self.path)
+        with _open_paths_lock:
+            _open_paths.add(self.path)
+
+    @staticmethod
+    def _open(path: Path, create: bool = True) -> int:
+        """Open a journal file for appending and mark it as in use."""
+        flags = os.O_WRONLY | os.O_APPEND | (os.O_CREAT if create else 0)
+        fd = os.open(path, flags, 0o644)
+        if fcntl is not None:
+            try:
+                fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                raise
+        return fd
+
+    def _append(self, entry: dict, sync: bool) -> None:
+        """Append one entry; `sync` forces it to disk before returning."""
+        data = (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+        os.write(self._fd, data)
+        self._size += len(data)
+        if sync:
+            os.fsync(self._fd)
+
+    def begin(self, *note_ids: str) -> int:
+        """Durably record that one or more notes are about to change.
+
+        All notes share a single entry, so a batch of changes costs one
+        flush to disk.
+
+        Args:
+            *note_ids: IDs of the notes being written or deleted
+
+        Returns:
+            Sequence number to pass to `end`
+        """
+        with self._lock:
+            self._seq += 1
+            self._append(self._entry(self._seq, note_ids), sync=True)
+            self._pending[self._seq] = note_ids
+            return self._seq
+
+    @staticmethod
+    def _entry(seq: int, note_ids: tuple[str, ...]) -> dict:
+        """Build the journal entry of an intent."""
+        if len(note_ids) == 1:
+            return {"seq": seq, "id": note_ids[0]}
+        return {"seq": seq, "ids": list(note_ids)}
+
+    def end(self, seq: int) -> None:
+        """Record that a change started with `begin` is fully indexed."""
+        with self._lock:
+            # Not synced: losing this entry only makes recovery re-check a
+            # note that is already consistent
+            self._append({"seq": seq, "done": True}, sync=False)
+            self._pending.pop(seq, None)
+            if self._size > self.compact_bytes:
+                self._compact()
+
+    @contextmanager
+    def intent(self, *note_ids: str) -> Iterator[None]:
+        """Journal a change of one or more notes for the duration of a block.
+
+        If the block raises, the intent stays unfinished, so the notes are
+        reconciled the next time the journal is recovered.
+        """
+        seq = self.begin(*note_ids)
+        yield
+        self.end(seq)
+
+    def _compact(self) -> None:
+        """Replace the journal with one holding only unfinished intents."""
+        tmp_path = self.path.with_suffix(".tmp")
+        fd = self._open(tmp_path)
+        old_fd, self._fd, self._size = self._fd, fd, 0
+        for seq, note_ids in self._pending.items():
+            self._append(self._entry(seq, note_ids), sync=False)
+        os.fsync(fd)
+        os.replace(tmp_path, self.path)
+        os.close(old_fd)
+
+    @staticmethod
+    def read_pending(path: Path) -> list[str]:
+        """Return the IDs of notes with unfinished intents in a journal file."""
+        pending: dict[int, list[str]] = {}
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-append
+                    continue
+                if entry.get("done"):
+                    pending.pop(entry["seq"], None)
+                elif "ids" in entry:
+                    pending[entry["seq"]] = entry["ids"]
+                else:
+                    pending[entry["seq"]] = [entry["id"]]
+        return list(
+            dict.fromkeys(note_id for ids in pending.values() for note_id in ids)
+        )
+
+    def recover(self, reconcile: Callable[[str], None]) -> int:
+        """Replay journals left behind by processes that exited uncleanly.
+
+        Args:
+            reconcile: Callable bringing the index of one note in line with
+                its file
+
+        Returns:
+            Number of notes reconciled
+        """
+        recovered = 0
+        for path in sorted(self.directory.glob("*.jsonl")):
+            with _open_paths_lock:
+                if path in _open_paths:
+                    continue
+            try:
+                fd = self._open(path, create=False)
+            except OSError:
+                # Still locked by a running process, or already recovered
+                continue
+            try:
+                note_ids = self.read_pending(path)
+                for note_id in note_ids:
+                    reconcile(note_id)
+                if note_ids:
+                    logger.info(
+                        f"Recovered {len(note_ids)} interrupted note writes "
+                        f"from {path.name}"
+                    )
+                recovered += len(note_ids)
+                path.unlink()
+            finally:
+                os.close(fd)
+        return recovered
+
+    def close(self) -> None:
+        """Close and remove this process's journal if nothing is unfinished."""
+        with self._lock:
+            if self._fd < 0:
+                return
+            if not self._pending:
+                self.path.unlink(missing_ok=True)
+            os.close(self._fd)
+            self._fd = -1
+            with _open_paths_lock:
+                _open_paths.discard(self.path)
+
+    def __del__(self) -> None:
+        """Release the journal when the repository owning it goes away."""
+        if getattr(self, "_fd", -1) >= 0:
+            self.close()
@@ -0,0 +1,201 @@
+"""On-disk layouts for note files in the notes directory."""
+
+import os
+import re
+import zlib
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+# "flat": notes_dir/{id}.md
+# "sharded": notes_dir/{YYYY}/{MM}/{id}.md, keyed on the timestamp ID
+NOTE_LAYOUTS = ("flat", "sharded")
+
+# Shard for IDs that are not timestamps, split further by a hash of the ID
+OTHER_SHARD = "other"
+
+_TIMESTAMP_ID_RE = re.compile(r"^(\d{4})(\d{2})\d{2}T")
+# Names of the directories `shard_for` produces, by level
+_YEAR_RE = re.compile(r"^\d{4}$")
+_MONTH_RE = re.compile(r"^\d{2}$")
+_BUCKET_RE = re.compile(r"^[0-9a-f]{2}$")
+
+
+def check_layout(layout: str) -> str:
+    """Validate a layout name and return it."""
+    if layout not in NOTE_LAYOUTS:
+        raise ValueError(
+            f"Invalid notes layout: {layout}. "
+            f"Valid layouts are: {', '.join(NOTE_LAYOUTS)}"
+        )
+    return layout
+
+
+def shard_for(note_id: str) -> tuple[str, str]:
+    """Return the two shard directory names for a note ID."""
+    match = _TIMESTAMP_ID_RE.match(note_id)
+    if match:
+        return match.group(1), match.group(2)
+    return OTHER_SHARD, f"{zlib.crc32(note_id.encode('utf-8')) % 256:02x}"
+
+
+def note_path(notes_dir: Path, note_id: str, layout: str) -> Path:
+    """Return where a note's file lives in the given layout."""
+    if layout == "sharded":
+        year, month = shard_for(note_id)
+        return notes_dir / year / month / f"{note_id}.md"
+    return notes_dir / f"{note_id}.md"
+
+
+def candidate_paths(notes_dir: Path, note_id: str, layout: str) -> list[Path]:
+    """Return the possible paths of a note's file, the given layout first.
+
+    Notes written before a layout change (or by an interrupted migration) may
+    still be in another layout, so lookups fall back to it.
+    """
+    return [
+        note_path(notes_dir, note_id, name)
+        for name in (layout, *(other for other in NOTE_LAYOUTS if other != layout))
+    ]
+
+
+def _is_note_file(name: str) -> bool:
+    """Return whether a file name is a note file."""
+    return name.endswith(".md") and not name.startswith(".")
+
+
+def _is_temp_file(name: str) -> bool:
+    """Return whether a file name is a leftover temporary note file."""
+    return name.startswith(".") and name.endswith(".md.tmp")
+
+
+def _shard_dirs(notes_dir: Path | str) -> Iterator[os.DirEntry]:
+    """Yield the top-level shard directories (years and `OTHER_SHARD`).
+
+    Other folders in the notes directory belong to the user, such as
+    attachments or exports, and are never treated as holding notes. Shards
+    only exist in the sharded layout, or while notes are still being moved
+    out of it, so a flat notes directory costs one listing.
+    """
+    with os.scandir(notes_dir) as top:
+        for entry in top:
+            if entry.is_dir(follow_symlinks=False) and (
+                entry.name == OTHER_SHARD or _YEAR_RE.match(entry.name)
+            ):
+                yield entry
+
+
+def _sub_shard_dirs(shard: os.DirEntry) -> Iterator[os.DirEntry]:
+    """Yield the month (or hash bucket) directories of a top-level shard."""
+    pattern = _BUCKET_RE if shard.name == OTHER_SHARD else _MONTH_RE
+    with os.scandir(shard.path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False) and pattern.match(entry.name):
+                yield entry
+
+
+def _scan(notes_dir: Path, match: Callable[[str], bool]) -> Iterator[os.DirEntry]:
+    """Yield matching entries at the top level and in the shard directories.
+
+    Uses `os.scandir`, which reads file types from the directory listing
+    instead of stat-ing every entry.
+    """
+    with os.scandir(notes_dir) as top:
+        for entry in top:
+            if not entry.is_dir(follow_symlinks=False) and match(entry.name):
+                yield entry
+    for shard in _shard_dirs(notes_dir):
+        for sub_shard in _sub_shard_dirs(shard):
+            with os.scandir(sub_shard.path) as files:
+                yield from (
+                    entry
+                    for entry in files
+                    if match(entry.name) and not entry.is_dir(follow_symlinks=False)
+                )
+
+
+def iter_note_files(notes_dir: Path, temp_files: bool = False) -> Iterator[Path]:
+    """Yield the note files in any layout, without sorting or buffering.
+
+    Args:
+        notes_dir: Root directory of the notes
+        temp_files: Yield leftover temporary files of atomic writes instead
+    """
+    match = _is_temp_file if temp_files else _is_note_file
+    for entry in _scan(notes_dir, match):
+        yield Path(entry.path)
+
+
+def count_note_files(notes_dir: Path) -> int:
+    """Count the note files in any layout."""
+    return sum(1 for _ in _scan(notes_dir, _is_note_file))
+
+
+def note_file_stats(notes_dir: Path) -> dict[Path, tuple[int, int, int]]:
+    """Map the note files in any layout to their mtime, size and inode.
+
+    A file whose stats are unchanged has not been written in between; atomic
+    writes replace the file, so they change the inode even when the mtime
+    resolution of the filesystem is coarse.
+    """
+    stats = {}
+    for entry in _scan(notes_dir, _is_note_file):
+        try:
+            st = entry.stat(follow_symlinks=False)
+        except FileNotFoundError:
+            continue
+        stats[Path(entry.path)] = (st.st_mtime_ns, st.st_size, st.st_ino)
+    return stats
+
+
+def list_directories(notes_dir: Path) -> list[Path]:
+    """Return the notes directory and all shard directories below it."""
+    directories = [notes_dir]
+    for shard in _shard_dirs(notes_dir):
+        directories.append(Path(shard.path))
+        directories.extend(Path(sub_shard.path) for sub_shard in _sub_shard_dirs(shard))
+    return directories
+
+
+def directory_fingerprint(
+    notes_dir: Path, directories: list[str] | None = None
+) -> dict[str, int]:
+    """Map note directories, relative to `notes_dir`, to their mtimes.
+
+    Adding, removing or renaming a note changes the modification time of the
+    directory holding it, so two equal fingerprints mean no note file was
+    added or removed in between. Only directories are stat-ed, which keeps
+    this independent of the number of notes.
+
+    Args:
+        notes_dir: Root directory of the notes
+        directories: Relative directories to check, usually those of a stored
+            fingerprint; None lists the current ones (which scans the notes
+            directory)
+
+    Returns:
+        Relative directory path to mtime in nanoseconds, -1 if it is missing
+    """
+    if directories is None:
+        directories = [
+            path.relative_to(notes_dir).as_posix()
+            for path in list_directories(notes_dir)
+        ]
+    fingerprint = {}
+    for relative in directories:
+        try:
+            fingerprint[relative] = (notes_dir / relative).stat().st_mtime_ns
+        except FileNotFoundError:
+            fingerprint[relative] = -1
+    return fingerprint
+
+
+def remove_empty_shards(notes_dir: Path) -> None:
+    """Remove shard directories left empty after notes moved out of them."""
+    for shard in list(_shard_dirs(notes_dir)):
+        shard_dir = Path(shard.path)
+        for sub_shard in list(_sub_shard_dirs(shard)):
+            month_dir = Path(sub_shard.path)
+            if not any(month_dir.iterdir()):
+                month_dir.rmdir()
+        if not any(shard_dir.iterdir()):
+            shard_dir.rmdir()
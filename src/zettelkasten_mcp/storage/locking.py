@@ -0,0 +1,185 @@
+"""Striped per-note locks and cross-process write coordination."""
+
+import logging
+import os
+import struct
+import threading
+import zlib
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, ExitStack, contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def process_locks_supported() -> bool:
+    """Return whether advisory file locks are available on this platform."""
+    return fcntl is not None
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on a file for the duration of a block.
+
+    The lock excludes other processes only; threads of this process need a
+    lock of their own. Without fcntl this does nothing.
+    """
+    if not process_locks_supported():
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.lockf(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the file releases the lock
+        os.close(fd)
+
+
+class StripedLock:
+    """A fixed pool of reentrant locks shared out between keys by hash.
+
+    Writes to different notes usually map to different stripes and can run in
+    parallel, while every write to the same note is serialized. Memory stays
+    bounded no matter how many notes exist; two notes sharing a stripe only
+    costs some parallelism.
+
+    Operations touching several notes must take all of their locks at once via
+    `acquire`, which always locks stripes in ascending order so that two such
+    operations can never deadlock. The locks are reentrant, so code already
+    holding a note's lock may call into code that locks the same note again.
+
+    When a lock file is given, each stripe is additionally backed by an
+    advisory `fcntl` lock on one byte of that file, so the same stripe is also
+    exclusive across processes sharing the file (e.g. uvicorn workers). POSIX
+    record locks belong to the process, so the file lock is only taken by the
+    outermost holder of a stripe and released when it exits.
+    """
+
+    def __init__(self, stripes: int = 64, lock_file: Path | None = None):
+        """Initialize the lock pool.
+
+        Args:
+            stripes: Number of locks in the pool
+            lock_file: File backing the stripes with cross-process locks;
+                None keeps the locks local to this process
+        """
+        if stripes < 1:
+            raise ValueError("At least one lock stripe is required")
+        self._locks = [threading.RLock() for _ in range(stripes)]
+        self._depths = [0] * stripes
+        self._fd: int | None = None
+        if lock_file is not None:
+            if process_locks_supported():
+                lock_file.parent.mkdir(parents=True, exist_ok=True)
+                self._fd = os.open(lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+            else:
+                logger.warning(
+                    "fcntl is not available; note locks only apply within this process"
+                )
+
+    def stripe(self, key: str) -> int:
+        """Return the index of the lock guarding a key."""
+        # crc32 rather than hash() so the mapping is stable across processes
+        return zlib.crc32(key.encode("utf-8")) % len(self._locks)
+
+    def _enter(self, index: int) -> None:
+        """Take one stripe, including its file lock for the outermost holder."""
+        self._locks[index].acquire()
+        try:
+            if self._depths[index] == 0 and self._fd is not None:
+                fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, index)
+        except BaseException:
+            self._locks[index].release()
+            raise
+        self._depths[index] += 1
+
+    def _exit(self, index: int) -> None:
+        """Release one stripe taken with `_enter`."""
+        self._depths[index] -= 1
+        try:
+            if self._depths[index] == 0 and self._fd is not None:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, index)
+        finally:
+            self._locks[index].release()
+
+    @contextmanager
+    def _stripes(self, indexes: set[int]) -> Iterator[None]:
+        """Hold the given stripes, taken in ascending order."""
+        with ExitStack() as stack:
+            for index in sorted(indexes):
+                self._enter(index)
+                stack.callback(self._exit, index)
+            yield
+
+    def acquire(self, *keys: str) -> AbstractContextManager[None]:
+        """Hold the locks of all given keys for the duration of a block.
+
+        Args:
+            *keys: Keys to lock, in any order; duplicates are allowed
+        """
+        return self._stripes({self.stripe(key) for key in keys})
+
+    def acquire_all(self) -> AbstractContextManager[None]:
+        """Hold every stripe, excluding all other writers for a block."""
+        return self._stripes(set(range(len(self._locks))))
+
+    def close(self) -> None:
+        """Close the backing lock file, if any."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class SharedCounter:
+    """A monotonically increasing counter stored in a file.
+
+    Processes sharing the file see each other's increments, which lets every
+    worker notice writes made by the others and drop its caches. Reads are a
+    single 8-byte `pread`; increments are serialized with an `fcntl` lock.
+    """
+
+    _FORMAT = "<Q"
+
+    def __init__(self, path: Path):
+        """Open (or create) the counter file.
+
+        Args:
+            path: File holding the counter value
+        """
+        if not process_locks_supported():
+            raise OSError("A shared counter requires fcntl file locking")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        # fcntl locks don't exclude threads of the same process
+        self._lock = threading.Lock()
+
+    @property
+    def value(self) -> int:
+        """Current value of the counter (0 for a new file)."""
+        data = os.pread(self._fd, struct.calcsize(self._FORMAT), 0)
+        if len(data) < struct.calcsize(self._FORMAT):
+            return 0
+        return struct.unpack(self._FORMAT, data)[0]
+
+    def increment(self) -> int:
+        """Increase the counter by one and return the new value."""
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX)
+            try:
+                value = self.value + 1
+                os.pwrite(self._fd, struct.pack(self._FORMAT, value), 0)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN)
+        return value
+
+    def close(self) -> None:
+        """Close the counter file."""
+        os.close(self._fd)
@@ -1,29 +1,152 @@
 """Repository for note storage and retrieval."""
 
 import datetime
+import json
 import logging
 import os
+import re
 import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 import frontmatter
-from sqlalchemy import and_, func, or_, select, text
-from sqlalchemy.orm import joinedload
+from sqlalchemy import (
+    and_,
+    create_engine,
+    delete,
+    event,
+    func,
+    insert,
+    or_,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, joinedload, selectinload, sessionmaker
 
 from zettelkasten_mcp.config import config
 from zettelkasten_mcp.models.db_models import (
+    Base,
+    DBIndexState,
     DBLink,
     DBNote,
     DBTag,
     get_session_factory,
     init_db,
+    note_tags,
 )
 from zettelkasten_mcp.models.schema import Link, LinkType, Note, NoteType, Tag
+from zettelkasten_mcp.storage import layout
 from zettelkasten_mcp.storage.base import Repository
+from zettelkasten_mcp.storage.journal import WriteJournal, fsync_directory
+from zettelkasten_mcp.storage.locking import (
+    SharedCounter,
+    StripedLock,
+    file_lock,
+    process_locks_supported,
+)
+from zettelkasten_mcp.storage.title_index import (
+    DEFAULT_SUGGESTIONS,
+    TitleIndex,
+    TitleMatch,
+)
 
 logger = logging.getLogger(__name__)
 
+# index_state key of the notes directory fingerprint of the last verification
+_FINGERPRINT_KEY = "notes_fingerprint"
+# Directory changes this close to recording a fingerprint make it untrusted
+_FINGERPRINT_RACY_NS = 2_000_000_000
+# Note files between two progress reports (and commits) of a rebuild
+_REBUILD_BATCH_SIZE = 100
+# IDs bound in one IN (...) clause, well below SQLite's parameter limit
+_ID_BATCH_SIZE = 500
+# Tables replaced by a rebuild, in an order that satisfies foreign keys
+_INDEX_TABLES = ("tags", "notes", "note_tags", "links")
+# Link graph changes kept for graph caches to catch up with
+_GRAPH_CHANGES_KEPT = 1024
+
+# A "## Links" heading followed by every line up to the next "## " heading
+_LINKS_SECTION_RE = re.compile(
+    r"^[ \t]*## Links[ \t]*\r?$\n?(?P<body>(?:(?![ \t]*## ).*(?:\n|$))*)",
+    re.MULTILINE,
+)
+# A single link entry, e.g. "- reference [[202101010000]] Optional description"
+_LINK_LINE_RE = re.compile(
+    r"^[ \t]*- (?P<type>.*?)\[\[(?P<target>.*?)\]\](?P<description>.*)$",
+    re.MULTILINE,
+)
+
+
+def parse_links_section(content: str) -> list[tuple[str, str, str]]:
+    """Extract raw link entries from all Links sections of note content.
+
+    Args:
+        content: Markdown body of a note (without frontmatter)
+
+    Returns:
+        List of (link_type, target_id, description) string tuples
+    """
+    return [
+        (
+            match.group("type").strip(),
+            match.group("target").strip(),
+            match.group("description").strip(),
+        )
+        for section in _LINKS_SECTION_RE.finditer(content)
+        for match in _LINK_LINE_RE.finditer(section.group("body"))
+    ]
+
+
+def strip_links_section(content: str) -> str:
+    """Remove all Links sections from note content."""
+    return _LINKS_SECTION_RE.sub("", content)
+
+
+@dataclass
+class RebuildProgress:
+    """Progress of an index rebuild, reported after every batch of files."""
+
+    # Note files to read, including files re-read because they changed
+    total: int = 0
+    # Note files read and parsed so far
+    scanned: int = 0
+    # Notes written to the new index so far
+    indexed: int = 0
+    # Note files that could not be read or parsed
+    errors: int = 0
+    # Number of notes in the index before it was replaced
+    previous_count: int | None = None
+
+
+@dataclass
+class DeleteResult:
+    """Outcome of deleting a set of notes."""
+
+    # IDs of the notes that were deleted
+    deleted: list[str] = field(default_factory=list)
+    # Requested IDs that matched no note
+    missing: list[str] = field(default_factory=list)
+    # (source_id, target_id) links from remaining notes to deleted ones; they
+    # stay in the source notes' markdown until those notes are edited
+    dangling_links: list[tuple[str, str]] = field(default_factory=list)
+
+
+@dataclass
+class GraphChange:
+    """Change of the link graph made by one write to the index."""
+
+    # Outgoing links, as (target ID, link type), of the notes that were written
+    links: dict[str, list[tuple[str, str]]] = field(default_factory=dict)
+    # IDs of the notes that were removed, with the links from and to them
+    removed: list[str] = field(default_factory=list)
+
 
 class NoteRepository(Repository[Note]):
     """Repository for note storage and retrieval.
@@ -43,65 +166,612 @@ def __init__(self, notes_dir: Path | None = None):
 
         # Ensure directories exist
         self.notes_dir.mkdir(parents=True, exist_ok=True)
+        # Where new and updated note files are written (see storage.layout)
+        self.layout = layout.check_layout(config.notes_layout)
 
         # Initialize database
         self.engine = init_db()
         self.session_factory = get_session_factory(self.engine)
 
-        # File access lock
-        self.file_lock = threading.RLock()
+        # Per-note write locks; unrelated notes can be written in parallel.
+        # In process-safe mode they are backed by file locks next to the
+        # database and the write generation is shared through a file, so
+        # several worker processes can serve the same notes.
+        db_path = config.get_absolute_path(config.database_path)
+        self._db_path = db_path
+        self.process_safe = config.process_safe and process_locks_supported()
+        if config.process_safe and not self.process_safe:
+            logger.warning(
+                "Process-safe mode requires fcntl; falling back to in-process locks"
+            )
+        self.note_locks = StripedLock(
+            lock_file=db_path.with_name(f"{db_path.name}.lock")
+            if self.process_safe
+            else None
+        )
+
+        # Serializes rebuilds, which share one shadow index file
+        self._rebuild_lock = threading.Lock()
+
+        # Parsed links keyed by note ID, validated against a hash of the
+        # content; the least recently used notes are evicted beyond the limit
+        self._links_cache: OrderedDict[str, tuple[int, list[Link]]] = OrderedDict()
+        self._links_cache_size = config.links_cache_size
+        self._links_cache_lock = threading.Lock()
+
+        # Write generation, bumped by every mutation to invalidate result caches
+        self._generation = 0
+        self._generation_lock = threading.Lock()
+        self._shared_generation = (
+            SharedCounter(db_path.with_name(f"{db_path.name}.generation"))
+            if self.process_safe
+            else None
+        )
+
+        # Bumped by writes that add or remove notes or links, for graph caches
+        self._graph_generation = 0
+        self._shared_graph_generation = (
+            SharedCounter(db_path.with_name(f"{db_path.name}.graph-generation"))
+            if self.process_safe
+            else None
+        )
+        # Link graph changes of this process by the graph generation they
+        # produced, so graph caches can catch up instead of reloading
+        self._graph_changes: deque[tuple[int, GraphChange]] = deque(
+            maxlen=_GRAPH_CHANGES_KEPT
+        )
+        self._graph_changes_lock = threading.Lock()
+
+        # Bumped whenever a rebuild replaces the index, which renumbers rows
+        self._index_epoch = 0
+        self._shared_index_epoch = (
+            SharedCounter(db_path.with_name(f"{db_path.name}.epoch"))
+            if self.process_safe
+            else None
+        )
+        # Tag IDs by name, valid for the index epoch they were read at
+        self._tag_ids: dict[str, int] = {}
+        self._tag_ids_epoch = 0
+        self._tag_ids_lock = threading.Lock()
+
+        # Fuzzy index of the note titles, loaded by the first lookup and kept
+        # up to date by the writes of this process; valid while the write
+        # generation is the one it expects
+        self._title_index: TitleIndex | None = None
+        self._title_index_generation = 0
+        self._title_index_lock = threading.Lock()
+
+        # Intents of note writes that may not have reached the index yet
+        self._journal = WriteJournal(db_path.with_name(f"{db_path.name}.journal"))
+
+        # Recover interrupted writes, then check the index against the notes
+        # directory; concurrently starting workers must not do this at the
+        # same time
+        self.verification: threading.Thread | None = None
+        with self.note_locks.acquire_all():
+            self.recover_interrupted_writes()
+            self._check_index_on_startup()
+
+    @property
+    def generation(self) -> int:
+        """Counter that changes whenever notes, tags or links are written.
+
+        In process-safe mode this also changes on writes by other processes.
+        """
+        if self._shared_generation is not None:
+            return self._shared_generation.value
+        return self._generation
 
-        # Initialize by rebuilding index if needed
-        self.rebuild_index_if_needed()
+    @property
+    def graph_generation(self) -> int:
+        """Counter that changes whenever notes are added or removed or links change.
 
-    def rebuild_index_if_needed(self) -> None:
-        """Rebuild the database index from files if needed."""
+        Edits to the title, content or tags of a note leave it unchanged, so
+        caches of the link graph can outlive them. In process-safe mode this
+        also changes on writes by other processes.
+        """
+        if self._shared_graph_generation is not None:
+            return self._shared_graph_generation.value
+        return self._graph_generation
+
+    def _bump_generation(self, graph: bool = True) -> None:
+        """Mark the repository contents as changed.
+
+        Args:
+            graph: Whether the link graph may have changed as well
+        """
+        if graph:
+            self._bump_graph_generation()
+        if self._shared_generation is not None:
+            self._shared_generation.increment()
+            return
+        with self._generation_lock:
+            self._generation += 1
+
+    def _bump_graph_generation(self) -> int:
+        """Mark the link graph as changed and return the new graph generation."""
+        if self._shared_graph_generation is not None:
+            return self._shared_graph_generation.increment()
+        with self._generation_lock:
+            self._graph_generation += 1
+            return self._graph_generation
+
+    def _commit_graph_change(self, session: Session, change: GraphChange) -> None:
+        """Commit a session that changes the link graph and log the change.
+
+        The commit, the graph generation bump and the log entry happen
+        together, so the log lists the changes in the order the index
+        received them.
+        """
+        with self._graph_changes_lock:
+            session.commit()
+            generation = self._bump_graph_generation()
+            self._graph_changes.append((generation, change))
+
+    def graph_changes_since(
+        self, generation: int
+    ) -> tuple[int, list[GraphChange] | None]:
+        """Return the link graph changes made after a graph generation.
+
+        Args:
+            generation: Graph generation the caller is up to date with
+
+        Returns:
+            Tuple of (current graph generation, changes in the order they were
+            made). The changes are None if some are unknown: made by another
+            process or a rebuild, or too long ago to be kept.
+        """
+        with self._graph_changes_lock:
+            current = self.graph_generation
+            changes = [
+                change for logged, change in self._graph_changes if logged > generation
+            ]
+        # Every graph generation bumped in between must have a logged change
+        if len(changes) != current - generation:
+            return current, None
+        return current, changes
+
+    def load_link_graph(self) -> tuple[int, list[str], list[tuple[str, str, str]]]:
+        """Read the IDs of all notes and all links from the index.
+
+        Returns:
+            Tuple of (graph generation the rows are current at, note IDs,
+            (source ID, target ID, link type) of every link)
+        """
+        # Graph changes of this process wait, so the rows match the generation
+        with self._graph_changes_lock:
+            generation = self.graph_generation
+            with self.session_factory() as session:
+                note_ids = list(session.scalars(select(DBNote.id)))
+                links = [
+                    (source_id, target_id, link_type)
+                    for source_id, target_id, link_type in session.execute(
+                        select(DBLink.source_id, DBLink.target_id, DBLink.link_type)
+                    )
+                ]
+        return generation, note_ids, links
+
+    @property
+    def index_epoch(self) -> int:
+        """Counter that changes whenever a rebuild replaces the index.
+
+        Row IDs, such as those of tags, are only stable within an epoch. In
+        process-safe mode this also changes on rebuilds by other processes.
+        """
+        if self._shared_index_epoch is not None:
+            return self._shared_index_epoch.value
+        return self._index_epoch
+
+    def lock_notes(self, *note_ids: str) -> AbstractContextManager[None]:
+        """Hold the write locks of the given notes for the duration of a block.
+
+        Use this around read-modify-write sequences spanning several notes,
+        such as creating a bidirectional link. Locks are always taken in the
+        same order, so concurrent callers cannot deadlock, and they are
+        reentrant, so `update` and `delete` may be called inside the block.
+        """
+        return self.note_locks.acquire(*note_ids)
+
+    def recover_interrupted_writes(self) -> int:
+        """Bring notes touched by interrupted writes back in line with the index.
+
+        Only notes with unfinished intents in the write journal of a process
+        that has exited are reconciled, so recovery after a crash costs a
+        few file reads rather than a full `rebuild_index`.
+
+        Returns:
+            Number of notes reconciled
+        """
+        with self.note_locks.acquire_all():
+            recovered = self._journal.recover(self._reconcile_note)
+        if recovered:
+            self._bump_generation()
+        return recovered
+
+    def _reconcile_note(self, note_id: str) -> None:
+        """Re-index a note from its file, or drop it from the index if gone."""
+        file_path = self._find_note_file(note_id)
+        if file_path is None:
+            self._unindex_note(note_id)
+            return
+        note = self._read_note_file(file_path)
+        if note is not None:
+            self._index_note(note)
+
+    def _current_fingerprint(
+        self, directories: list[str] | None = None
+    ) -> dict[str, Any]:
+        """Fingerprint the notes directory (see `layout.directory_fingerprint`)."""
+        return {
+            "notes_dir": str(self.notes_dir),
+            "directories": layout.directory_fingerprint(self.notes_dir, directories),
+        }
+
+    @staticmethod
+    def _fingerprint_is_racy(fingerprint: dict[str, Any]) -> bool:
+        """Return whether a stored fingerprint may have missed a change.
+
+        A directory modified shortly before the fingerprint was recorded can
+        be modified again without its mtime changing on filesystems with
+        coarse timestamps, so such a fingerprint is never trusted.
+        """
+        newest = max(fingerprint["directories"].values(), default=0)
+        return newest + _FINGERPRINT_RACY_NS >= fingerprint.get("recorded_at", 0)
+
+    def _load_fingerprint(self) -> dict[str, Any] | None:
+        """Return the fingerprint stored when the index was last known-good."""
+        with self.session_factory() as session:
+            state = session.get(DBIndexState, _FINGERPRINT_KEY)
+            return json.loads(state.value) if state else None
+
+    def _store_fingerprint(self, fingerprint: dict[str, Any]) -> None:
+        """Record that the index matches the notes directory as fingerprinted."""
+        fingerprint = {**fingerprint, "recorded_at": time.time_ns()}
+        with self.session_factory() as session:
+            session.merge(
+                DBIndexState(key=_FINGERPRINT_KEY, value=json.dumps(fingerprint))
+            )
+            session.commit()
+
+    def _check_index_on_startup(self) -> None:
+        """Check the index without scanning the notes directory if possible.
+
+        If the notes directory fingerprint still matches the one stored when
+        the index was last verified, no note file has been added or removed
+        since and the index is used as is; this costs a handful of `stat`
+        calls regardless of the number of notes. Otherwise `verify_index`
+        runs in a background thread, so the server can answer requests from
+        the existing index meanwhile. An index that was never verified (a new
+        or deleted database) is checked before returning.
+        """
+        stored = self._load_fingerprint()
+        if stored is None:
+            self.verify_index()
+            return
+        current = self._current_fingerprint(list(stored["directories"]))
+        if current == {
+            key: stored[key] for key in current
+        } and not self._fingerprint_is_racy(stored):
+            logger.debug("Notes directory unchanged since last verification")
+            return
+        self.verification = threading.Thread(
+            target=self._verify_index_in_background,
+            name="zettelkasten-index-verification",
+            daemon=True,
+        )
+        self.verification.start()
+
+    def _verify_index_in_background(self) -> None:
+        """Run `verify_index`, logging instead of raising errors."""
+        try:
+            self.verify_index()
+        except Exception as e:
+            logger.error(f"Background index verification failed: {e}", exc_info=True)
+
+    def wait_for_verification(self, timeout: float | None = None) -> bool:
+        """Wait for a background index verification to finish.
+
+        Returns:
+            True if no verification is running anymore
+        """
+        if self.verification is not None:
+            self.verification.join(timeout)
+            return not self.verification.is_alive()
+        return True
+
+    def verify_index(self) -> bool:
+        """Check the index against the note files and rebuild it if needed.
+
+        Leftover temporary files of interrupted atomic writes are removed, and
+        the notes directory fingerprint is stored for the next startup.
+
+        Returns:
+            True if the index had to be rebuilt
+        """
+        with self.note_locks.acquire_all():
+            # Taken before the scan, so changes during it are caught next time
+            fingerprint = self._current_fingerprint()
+            for tmp_path in layout.iter_note_files(self.notes_dir, temp_files=True):
+                tmp_path.unlink(missing_ok=True)
+            needed = self._index_out_of_date()
+            if not needed:
+                self._store_fingerprint(fingerprint)
+        if needed:
+            self.rebuild_index()
+        return needed
+
+    def _index_out_of_date(self) -> bool:
+        """Return whether the number of indexed notes differs from the files."""
         # Count notes in database
         with self.session_factory() as session:
             db_count = session.scalar(select(text("COUNT(*)")).select_from(DBNote))
 
         # Count note files
-        file_count = len(list(self.notes_dir.glob("*.md")))
+        file_count = layout.count_note_files(self.notes_dir)
+        return db_count != file_count
 
-        # Rebuild if counts don't match
-        if db_count != file_count:
+    def rebuild_index_if_needed(self) -> bool:
+        """Rebuild the database index from files if needed.
+
+        Returns:
+            True if the index was rebuilt
+        """
+        if self._index_out_of_date():
             self.rebuild_index()
+            return True
+        return False
+
+    def rebuild_index(
+        self, progress: Callable[[RebuildProgress], None] | None = None
+    ) -> RebuildProgress:
+        """Rebuild the database index from all markdown files.
+
+        The new index is built in a separate SQLite file, so the rebuild
+        neither blocks nor waits for readers and writers of the live index.
+        Note files are read and indexed into it without holding the note
+        locks, so writes carry on meanwhile. The locks are then taken, files
+        written, added or removed during the scan are caught up with, and the
+        new tables are copied over the live ones in a single transaction.
+        Until it commits, readers keep seeing the previous index; the
+        database uses write-ahead logging, so they are not blocked by it.
 
-    def rebuild_index(self) -> None:
-        """Rebuild the database index from all markdown files."""
-        # Clear the database first
-        with self.session_factory() as session:
-            # Delete all records from link table
-            session.execute(text("DELETE FROM links"))
-            # Delete all records from note_tags table
-            session.execute(text("DELETE FROM note_tags"))
-            # Delete all records from notes table
-            session.execute(text("DELETE FROM notes"))
-            # Commit changes
-            session.commit()
+        Args:
+            progress: Called with the progress after every batch of files
 
-        # Read all markdown files
-        note_files = list(self.notes_dir.glob("*.md"))
+        Returns:
+            The final progress, with the counts of the rebuild
+        """
+        report = progress or (lambda _: None)
+        status = RebuildProgress()
+        # IDs of the indexed notes (None if unreadable) by file, with the
+        # file stats they were read at
+        indexed: dict[Path, tuple[tuple[int, int, int], str | None]] = {}
+        with self._shadow_index() as (shadow_path, shadow_session_factory):
+            tag_ids: dict[str, int] = {}
+            with shadow_session_factory() as session:
+                self._scan_note_files(
+                    layout.note_file_stats(self.notes_dir),
+                    indexed,
+                    tag_ids,
+                    session,
+                    status,
+                    report,
+                )
 
-        # Process files in batches to avoid memory issues with large Zettelkasten systems
-        batch_size = 100
-        for i in range(0, len(note_files), batch_size):
-            batch = note_files[i : i + batch_size]
-            notes = []
+            # Keep every writer out while the index is replaced
+            with self.note_locks.acquire_all():
+                fingerprint = self._current_fingerprint()
+                stats = layout.note_file_stats(self.notes_dir)
+                with shadow_session_factory() as session:
+                    for file_path in indexed.keys() - stats.keys():
+                        _, note_id = indexed.pop(file_path)
+                        if note_id is not None:
+                            self._remove_index_rows(session, note_id)
+                    self._scan_note_files(
+                        stats, indexed, tag_ids, session, status, report
+                    )
+                    status.indexed = session.scalar(
+                        select(text("COUNT(*)")).select_from(DBNote)
+                    )
+                status.errors = sum(1 for _, note_id in indexed.values() if not note_id)
+                status.previous_count = self._swap_in_index(shadow_path)
+                if self._shared_index_epoch is not None:
+                    self._shared_index_epoch.increment()
+                else:
+                    self._index_epoch += 1
+                self._store_fingerprint(fingerprint)
+                self._bump_generation()
+        report(status)
+        return status
+
+    @contextmanager
+    def _shadow_index(self) -> Iterator[tuple[Path, sessionmaker]]:
+        """Provide an empty index database next to the live one to rebuild into.
+
+        The file is disposable, so it is written without journaling or
+        syncing. Rebuilds share it and are therefore serialized, across
+        processes too in process-safe mode. It is removed afterwards; one
+        left behind by a crash is replaced by the next rebuild.
+        """
+        path = self._db_path.with_name(f"{self._db_path.name}.rebuild")
+        lock_path = path.with_name(f"{path.name}.lock")
+        process_lock = file_lock(lock_path) if self.process_safe else nullcontext()
+        with self._rebuild_lock, process_lock:
+            path.unlink(missing_ok=True)
+            engine = create_engine(f"sqlite:///{path}")
+
+            @event.listens_for(engine, "connect")
+            def _configure(dbapi_connection, connection_record):
+                dbapi_connection.execute("PRAGMA journal_mode=OFF")
+                dbapi_connection.execute("PRAGMA synchronous=OFF")
+
+            try:
+                with engine.begin() as conn:
+                    conn.info["skip_trigram_index"] = True
+                    Base.metadata.create_all(
+                        conn,
+                        tables=[Base.metadata.tables[name] for name in _INDEX_TABLES],
+                    )
+                yield path, get_session_factory(engine)
+            finally:
+                engine.dispose()
+                path.unlink(missing_ok=True)
 
-            # Read files
-            for file_path in batch:
-                try:
-                    with open(file_path, encoding="utf-8") as f:
-                        content = f.read()
-                    note = self._parse_note_from_markdown(content)
-                    notes.append(note)
-                except Exception as e:
-                    logger.error(f"Error processing file {file_path}: {e}")
+    def _swap_in_index(self, shadow_path: Path) -> int:
+        """Replace the live index tables with those of a shadow index.
 
-            # Index notes
-            for note in notes:
-                self._index_note(note)
+        Returns:
+            Number of notes in the index before it was replaced
+        """
+        with self.engine.connect() as conn:
+            conn.exec_driver_sql("ATTACH DATABASE ? AS shadow", (str(shadow_path),))
+            conn.commit()
+            try:
+                previous_count = conn.exec_driver_sql(
+                    "SELECT COUNT(*) FROM main.notes"
+                ).scalar()
+                for name in reversed(_INDEX_TABLES):
+                    conn.exec_driver_sql(f"DELETE FROM main.{name}")
+                for name in _INDEX_TABLES:
+                    columns = ", ".join(
+                        column.name for column in Base.metadata.tables[name].columns
+                    )
+                    conn.exec_driver_sql(
+                        f"INSERT INTO main.{name} ({columns}) "
+                        f"SELECT {columns} FROM shadow.{name}"
+                    )
+                conn.commit()
+            finally:
+                conn.rollback()
+                conn.exec_driver_sql("DETACH DATABASE shadow")
+        return previous_count
+
+    def _scan_note_files(
+        self,
+        stats: dict[Path, tuple[int, int, int]],
+        indexed: dict[Path, tuple[tuple[int, int, int], str | None]],
+        tag_ids: dict[str, int],
+        session: Session,
+        status: RebuildProgress,
+        report: Callable[[RebuildProgress], None],
+    ) -> None:
+        """Index the note files that are new or changed since they were indexed.
+
+        Rows are inserted in bulk and committed after every batch, so the
+        session does not hold on to every note of a large notes directory.
+        """
+        stale = [
+            path for path, st in stats.items() if indexed.get(path, (None,))[0] != st
+        ]
+        status.total += len(stale)
+        present = {note_id for _, note_id in indexed.values() if note_id}
+        batch: list[Note] = []
+        for i, file_path in enumerate(stale, 1):
+            previous = indexed.get(file_path)
+            if previous is not None and previous[1] is not None:
+                self._remove_index_rows(session, previous[1])
+                present.discard(previous[1])
+            note = self._read_note_file(file_path)
+            if note is None:
+                status.errors += 1
+            else:
+                if note.id in present:
+                    # The same ID in another file: the file read last wins
+                    self._insert_index_rows(session, batch, tag_ids)
+                    batch = []
+                    self._remove_index_rows(session, note.id)
+                batch.append(note)
+                present.add(note.id)
+                status.indexed += 1
+            indexed[file_path] = (stats[file_path], note.id if note else None)
+            status.scanned += 1
+            if i % _REBUILD_BATCH_SIZE == 0:
+                self._insert_index_rows(session, batch, tag_ids)
+                batch = []
+                session.commit()
+                report(status)
+        self._insert_index_rows(session, batch, tag_ids)
+        session.commit()
+        report(status)
+
+    @staticmethod
+    def _insert_index_rows(
+        session: Session, notes: list[Note], tag_ids: dict[str, int]
+    ) -> None:
+        """Bulk insert the rows of notes that are not indexed yet.
+
+        Args:
+            session: Session to insert with; not committed
+            notes: Notes with distinct IDs
+            tag_ids: IDs of the indexed tags by name, extended with the tags
+                inserted here
+        """
+        if not notes:
+            return
+        new_tags = sorted(
+            {tag.name for note in notes for tag in note.tags} - tag_ids.keys()
+        )
+        if new_tags:
+            session.execute(insert(DBTag.__table__), [{"name": n} for n in new_tags])
+            tag_ids.update(
+                session.execute(
+                    select(DBTag.name, DBTag.id).where(DBTag.name.in_(new_tags))
+                ).all()
+            )
+        session.execute(
+            insert(DBNote.__table__),
+            [
+                {
+                    "id": note.id,
+                    "title": note.title,
+                    "content": note.content,
+                    "note_type": note.note_type.value,
+                    "created_at": note.created_at,
+                    "updated_at": note.updated_at,
+                }
+                for note in notes
+            ],
+        )
+        tag_rows = [
+            {"note_id": note.id, "tag_id": tag_ids[name]}
+            for note in notes
+            for name in dict.fromkeys(tag.name for tag in note.tags)
+        ]
+        if tag_rows:
+            session.execute(insert(note_tags), tag_rows)
+        link_rows = [
+            {
+                "source_id": note.id,
+                "target_id": link.target_id,
+                "link_type": link.link_type.value,
+                "description": link.description,
+                "created_at": link.created_at,
+            }
+            for note in notes
+            # Only the first of several links with the same target and type
+            for link in {
+                (link.target_id, link.link_type): link for link in reversed(note.links)
+            }.values()
+        ]
+        if link_rows:
+            session.execute(insert(DBLink.__table__), link_rows)
+
+    @staticmethod
+    def _remove_index_rows(session: Session, note_id: str) -> None:
+        """Delete a note with its tags and outgoing links, without committing."""
+        params = {"id": note_id}
+        session.execute(text("DELETE FROM links WHERE source_id = :id"), params)
+        session.execute(text("DELETE FROM note_tags WHERE note_id = :id"), params)
+        session.execute(text("DELETE FROM notes WHERE id = :id"), params)
+
+    def _read_note_file(self, file_path: Path) -> Note | None:
+        """Read and parse a note file, logging and returning None on errors."""
+        try:
+            with open(file_path, encoding="utf-8") as f:
+                return self._parse_note_from_markdown(f.read())
+        except Exception as e:
+            logger.error(f"Error processing file {file_path}: {e}")
+            return None
 
     def _parse_note_from_markdown(self, content: str) -> Note:
         """Parse a note from markdown content."""
@@ -143,55 +813,8 @@ def _parse_note_from_markdown(self, content: str) -> Note:
             tag_names = []
         tags = [Tag(name=name) for name in tag_names]
 
-        # Extract links
-        links = []
-        links_section = False
-        for line in post.content.split("\n"):
-            line = line.strip()
-            # Check if we're in the links section
-            if line.startswith("## Links"):
-                links_section = True
-                continue
-            if links_section and line.startswith("## "):
-                # We've reached the next section
-                links_section = False
-                continue
-            if links_section and line.startswith("- "):
-                # Parse link line
-                try:
-                    # Example format: - reference [[202101010000]] Optional description
-                    line_content = line.strip()
-                    if "[[" in line_content and "]]" in line_content:
-                        # Split the line at the [[ delimiter
-                        parts = line_content.split("[[", 1)
-                        # Extract the link type from before [[
-                        link_type_str = parts[0].strip()
-                        # Remove the leading "- " from the link type string
-                        if link_type_str.startswith("- "):
-                            link_type_str = link_type_str[2:].strip()
-                        # Extract target ID and description
-                        id_and_description = parts[1].split("]]", 1)
-                        target_id = id_and_description[0].strip()
-                        description = None
-                        if len(id_and_description) > 1:
-                            description = id_and_description[1].strip()
-                        # Validate link type
-                        try:
-                            link_type = LinkType(link_type_str)
-                        except ValueError:
-                            # If not a valid type, default to reference
-                            link_type = LinkType.REFERENCE
-                        links.append(
-                            Link(
-                                source_id=note_id,
-                                target_id=target_id,
-                                link_type=link_type,
-                                description=description,
-                                created_at=datetime.datetime.now(),
-                            )
-                        )
-                except Exception as e:
-                    logger.error(f"Error parsing link: {line} - {e}")
+        # Extract links (cached per note so unchanged content is never re-parsed)
+        links = self._get_cached_links(note_id, post.content)
 
         # Extract timestamps
         created_str = metadata.get("created")
@@ -222,71 +845,232 @@ def _parse_note_from_markdown(self, content: str) -> Note:
             },
         )
 
-    def _index_note(self, note: Note) -> None:
-        """Index a note in the database."""
+    def _get_cached_links(self, note_id: str, content: str) -> list[Link]:
+        """Return the links of a note, re-parsing only if its content changed."""
+        content_hash = hash(content)
+        with self._links_cache_lock:
+            cached = self._links_cache.get(note_id)
+            if cached and cached[0] == content_hash:
+                self._links_cache.move_to_end(note_id)
+                return list(cached[1])
+
+        links = []
+        for link_type_str, target_id, description in parse_links_section(content):
+            try:
+                link_type = LinkType(link_type_str)
+            except ValueError:
+                # If not a valid type, default to reference
+                link_type = LinkType.REFERENCE
+            try:
+                links.append(
+                    Link(
+                        source_id=note_id,
+                        target_id=target_id,
+                        link_type=link_type,
+                        description=description,
+                        created_at=datetime.datetime.now(),
+                    )
+                )
+            except Exception as e:
+                logger.error(f"Error parsing link to {target_id} in {note_id}: {e}")
+        if self._links_cache_size > 0:
+            with self._links_cache_lock:
+                self._links_cache[note_id] = (content_hash, links)
+                self._links_cache.move_to_end(note_id)
+                while len(self._links_cache) > self._links_cache_size:
+                    self._links_cache.popitem(last=False)
+        return list(links)
+
+    def _index_note(self, note: Note) -> bool:
+        """Index a note in the database.
+
+        A change of the link graph is committed together with a bump of the
+        graph generation (see `_commit_graph_change`).
+
+        Returns:
+            True if the note is new to the index or its links changed
+        """
         with self.session_factory() as session:
-            # Create or update note
-            db_note = session.scalar(select(DBNote).where(DBNote.id == note.id))
-            if db_note:
-                # Update existing note
-                db_note.title = note.title
-                db_note.content = note.content
-                db_note.note_type = note.note_type.value
-                db_note.updated_at = note.updated_at
-                # Clear existing links and tags to rebuild them
-                session.execute(
-                    text(f"DELETE FROM links WHERE source_id = '{note.id}'")
+            graph_changed = self._add_to_index(session, note)
+            if graph_changed:
+                links = dict.fromkeys(
+                    (link.target_id, link.link_type.value) for link in note.links
                 )
-                session.execute(
-                    text(f"DELETE FROM note_tags WHERE note_id = '{note.id}'")
+                self._commit_graph_change(
+                    session, GraphChange(links={note.id: list(links)})
                 )
             else:
-                # Create new note
-                db_note = DBNote(
-                    id=note.id,
-                    title=note.title,
-                    content=note.content,
-                    note_type=note.note_type.value,
-                    created_at=note.created_at,
-                    updated_at=note.updated_at,
+                session.commit()
+            # Tags inserted by this session exist now, so their IDs can be cached
+            if "new_tag_ids" in session.info:
+                self._cache_tag_ids(*session.info.pop("new_tag_ids"))
+        return graph_changed
+
+    def _add_to_index(self, session: Session, note: Note) -> bool:
+        """Add or update a note's index rows in a session, without committing.
+
+        Returns:
+            True if the note is new to the index or its links changed
+        """
+        # Create or update note
+        db_note = session.scalar(select(DBNote).where(DBNote.id == note.id))
+        is_new = db_note is None
+        if db_note:
+            # Update existing note
+            db_note.title = note.title
+            db_note.content = note.content
+            db_note.note_type = note.note_type.value
+            db_note.updated_at = note.updated_at
+        else:
+            # Create new note
+            db_note = DBNote(
+                id=note.id,
+                title=note.title,
+                content=note.content,
+                note_type=note.note_type.value,
+                created_at=note.created_at,
+                updated_at=note.updated_at,
+            )
+            session.add(db_note)
+
+        session.flush()  # Flush to get the note ID
+
+        self._sync_tags(session, note.id, [tag.name for tag in note.tags])
+        links_changed = self._sync_links(session, note.id, note.links)
+        return is_new or links_changed
+
+    def _sync_tags(self, session: Session, note_id: str, names: list[str]) -> None:
+        """Bring a note's tags in line with the given names, without committing.
+
+        Only the difference between the indexed and the given tag set is
+        written, so saving a note with unchanged tags doesn't touch
+        `note_tags` at all.
+        """
+        current = dict(
+            session.execute(
+                select(DBTag.name, DBTag.id)
+                .join(note_tags, note_tags.c.tag_id == DBTag.id)
+                .where(note_tags.c.note_id == note_id)
+            ).all()
+        )
+        wanted = set(names)
+        removed = [current[name] for name in current.keys() - wanted]
+        if removed:
+            session.execute(
+                delete(note_tags).where(
+                    note_tags.c.note_id == note_id, note_tags.c.tag_id.in_(removed)
                 )
-                session.add(db_note)
+            )
+        added = sorted(wanted - current.keys())
+        if added:
+            tag_ids = self._get_tag_ids(session, added)
+            session.execute(
+                insert(note_tags),
+                [{"note_id": note_id, "tag_id": tag_ids[name]} for name in added],
+            )
 
-            session.flush()  # Flush to get the note ID
+    @staticmethod
+    def _sync_links(session: Session, note_id: str, links: list[Link]) -> bool:
+        """Bring a note's outgoing links in line with the given ones, without committing.
 
-            # Add tags
-            for tag in note.tags:
-                # Check if tag exists
-                db_tag = session.scalar(select(DBTag).where(DBTag.name == tag.name))
-                if not db_tag:
-                    db_tag = DBTag(name=tag.name)
-                    session.add(db_tag)
-                    session.flush()  # Flush to get the tag ID
-                db_note.tags.append(db_tag)
+        Only links whose target or type changed are deleted or inserted, so
+        unchanged links keep their row and `created_at`; changed descriptions
+        are updated in place. Of several links with the same target and type,
+        the first is kept.
 
-            # Add links
-            for link in note.links:
-                # Check if this link already exists in the database
-                existing_link = session.scalar(
-                    select(DBLink).where(
-                        (DBLink.source_id == link.source_id)
-                        & (DBLink.target_id == link.target_id)
-                        & (DBLink.link_type == link.link_type.value)
-                    )
+        Returns:
+            True if any link was added or removed
+        """
+        current = {
+            (target_id, link_type): (link_id, description)
+            for link_id, target_id, link_type, description in session.execute(
+                select(
+                    DBLink.id, DBLink.target_id, DBLink.link_type, DBLink.description
+                ).where(DBLink.source_id == note_id)
+            )
+        }
+        wanted: dict[tuple[str, str], Link] = {}
+        for link in links:
+            wanted.setdefault((link.target_id, link.link_type.value), link)
+
+        removed = [current[key][0] for key in current.keys() - wanted.keys()]
+        if removed:
+            session.execute(delete(DBLink).where(DBLink.id.in_(removed)))
+        added = [link for key, link in wanted.items() if key not in current]
+        if added:
+            session.execute(
+                insert(DBLink.__table__),
+                [
+                    {
+                        "source_id": note_id,
+                        "target_id": link.target_id,
+                        "link_type": link.link_type.value,
+                        "description": link.description,
+                        "created_at": link.created_at,
+                    }
+                    for link in added
+                ],
+            )
+        for key, link in wanted.items():
+            if key in current and current[key][1] != link.description:
+                session.execute(
+                    update(DBLink)
+                    .where(DBLink.id == current[key][0])
+                    .values(description=link.description)
                 )
+        return bool(removed or added)
 
-                if not existing_link:
-                    db_link = DBLink(
-                        source_id=link.source_id,
-                        target_id=link.target_id,
-                        link_type=link.link_type.value,
-                        description=link.description,
-                        created_at=link.created_at,
-                    )
-                    session.add(db_link)
+    def _get_tag_ids(self, session: Session, names: list[str]) -> dict[str, int]:
+        """Return the IDs of tags by name, inserting missing tags in bulk.
 
-            # Commit changes
-            session.commit()
+        IDs are cached in memory for the current index epoch. The IDs of
+        tags inserted here are left in `session.info` for the caller to cache
+        after committing, so a rolled-back insert never leaves a stale ID
+        behind.
+        """
+        with self._tag_ids_lock:
+            epoch = self.index_epoch
+            if epoch != self._tag_ids_epoch:
+                self._tag_ids.clear()
+                self._tag_ids_epoch = epoch
+            tag_ids = {
+                name: self._tag_ids[name] for name in names if name in self._tag_ids
+            }
+        missing = [name for name in names if name not in tag_ids]
+        if not missing:
+            return tag_ids
+
+        stored = dict(
+            session.execute(
+                select(DBTag.name, DBTag.id).where(DBTag.name.in_(missing))
+            ).all()
+        )
+        self._cache_tag_ids(epoch, stored)
+        tag_ids.update(stored)
+
+        new = [name for name in missing if name not in stored]
+        if new:
+            session.execute(
+                sqlite_insert(DBTag.__table__).on_conflict_do_nothing(
+                    index_elements=["name"]
+                ),
+                [{"name": name} for name in new],
+            )
+            inserted = dict(
+                session.execute(
+                    select(DBTag.name, DBTag.id).where(DBTag.name.in_(new))
+                ).all()
+            )
+            _, pending = session.info.setdefault("new_tag_ids", (epoch, {}))
+            pending.update(inserted)
+            tag_ids.update(inserted)
+        return tag_ids
+
+    def _cache_tag_ids(self, epoch: int, tag_ids: dict[str, int]) -> None:
+        """Remember committed tag IDs read at the given index epoch."""
+        with self._tag_ids_lock:
+            if self._tag_ids_epoch == epoch:
+                self._tag_ids.update(tag_ids)
 
     def _note_to_markdown(self, note: Note) -> str:
         """Convert a note to markdown with frontmatter."""
@@ -310,20 +1094,7 @@ def _note_to_markdown(self, note: Note) -> str:
             content = f"{title_heading}\n\n{note.content}"
 
         # Remove existing Links section(s)
-        content_parts = []
-        skip_section = False
-        for line in content.split("\n"):
-            if line.strip() == "## Links":
-                skip_section = True
-                continue
-            elif skip_section and line.startswith("## "):
-                skip_section = False
-
-            if not skip_section:
-                content_parts.append(line)
-
-        # Reconstruct the content without the Links sections
-        content = "\n".join(content_parts).rstrip()
+        content = strip_links_section(content).rstrip()
 
         # Add links section (with deduplication)
         if note.links:
@@ -331,15 +1102,77 @@ def _note_to_markdown(self, note: Note) -> str:
             for link in note.links:
                 key = f"{link.target_id}:{link.link_type.value}"
                 unique_links[key] = link
-            content += "\n\n## Links\n"
-            for link in unique_links.values():
-                desc = f" {link.description}" if link.description else ""
-                content += f"- {link.link_type.value} [[{link.target_id}]]{desc}\n"
+            link_lines = [
+                f"- {link.link_type.value} [[{link.target_id}]]"
+                + (f" {link.description}" if link.description else "")
+                + "\n"
+                for link in unique_links.values()
+            ]
+            content = f"{content}\n\n## Links\n{''.join(link_lines)}"
 
         # Create markdown with frontmatter
         post = frontmatter.Post(content, **metadata)
         return frontmatter.dumps(post)
 
+    def _note_path(self, note_id: str) -> Path:
+        """Return where a note's file is written in the configured layout."""
+        return layout.note_path(self.notes_dir, note_id, self.layout)
+
+    def _find_note_file(self, note_id: str) -> Path | None:
+        """Return the path of an existing note file in any layout."""
+        for path in layout.candidate_paths(self.notes_dir, note_id, self.layout):
+            if path.exists():
+                return path
+        return None
+
+    def migrate_layout(self, target: str) -> int:
+        """Move every note file into the given layout.
+
+        Files are moved with atomic renames while all note locks are held, so
+        the notes stay readable throughout and an interrupted migration can
+        simply be run again. The database index is unaffected.
+
+        Args:
+            target: Layout to migrate to, "flat" or "sharded"
+
+        Returns:
+            Number of files moved
+        """
+        layout.check_layout(target)
+        moved = 0
+        with self.note_locks.acquire_all():
+            for file_path in list(layout.iter_note_files(self.notes_dir)):
+                target_path = layout.note_path(self.notes_dir, file_path.stem, target)
+                if target_path == file_path:
+                    continue
+                target_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(file_path, target_path)
+                moved += 1
+            layout.remove_empty_shards(self.notes_dir)
+            self.layout = target
+        logger.info(f"Moved {moved} note files to the {target} layout")
+        return moved
+
+    def _write_note_file(self, file_path: Path, markdown: str) -> None:
+        """Atomically replace a note file with new content.
+
+        The content is written to a temporary file in the same directory and
+        flushed to disk before being renamed over the note, so a crash leaves
+        either the old or the new version but never a truncated file.
+        """
+        tmp_path = file_path.with_name(f".{file_path.name}.tmp")
+        try:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(markdown)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, file_path)
+            fsync_directory(file_path.parent)
+        except OSError as e:
+            tmp_path.unlink(missing_ok=True)
+            raise OSError(f"Failed to write note to {file_path}: {e}") from e
+
     def create(self, note: Note) -> Note:
         """Create a new note."""
         # Ensure the note has an ID
@@ -351,17 +1184,16 @@ def create(self, note: Note) -> Note:
         # Convert note to markdown
         markdown = self._note_to_markdown(note)
 
-        # Write to file
-        file_path = self.notes_dir / f"{note.id}.md"
-        try:
-            with self.file_lock:
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(markdown)
-        except OSError as e:
-            raise OSError(f"Failed to write note to {file_path}: {e}") from e
+        # Write to file and index under the note's lock, so the file and its
+        # index row always come from the same write
+        file_path = self._note_path(note.id)
+        with self.lock_notes(note.id), self._journal.intent(note.id):
+            self._write_note_file(file_path, markdown)
 
-        # Index in database
-        self._index_note(note)
+            # Index in database
+            self._index_note(note)
+            self._update_title_index({note.id: note.title})
+        self._bump_generation(graph=False)
         return note
 
     def get(self, id: str) -> Note | None:
@@ -373,8 +1205,8 @@ def get(self, id: str) -> Note | None:
         Returns:
             Note object if found, None otherwise
         """
-        file_path = self.notes_dir / f"{id}.md"
-        if not file_path.exists():
+        file_path = self._find_note_file(id)
+        if file_path is None:
             return None
         try:
             with open(file_path, encoding="utf-8") as f:
@@ -391,6 +1223,102 @@ def get_by_title(self, title: str) -> Note | None:
                 return None
             return self.get(db_note.id)
 
+    def find_similar_titles(
+        self, title: str, limit: int = DEFAULT_SUGGESTIONS
+    ) -> list[TitleMatch]:
+        """Find the notes with titles within a few typos of a title.
+
+        Case and whitespace are ignored, and about one edit per four
+        characters of the title is tolerated.
+
+        Args:
+            title: Title to look up
+            limit: Maximum number of matches
+
+        Returns:
+            Matches ordered by edit distance, then title
+        """
+        with self._title_index_lock:
+            if (
+                self._title_index is None
+                or self._title_index_generation != self.generation
+            ):
+                # Read the generation first: writes landing during the load
+                # bump it again and make the next lookup reload
+                self._title_index_generation = self.generation
+                with self.session_factory() as session:
+                    self._title_index = TitleIndex(
+                        session.execute(select(DBNote.id, DBNote.title)).tuples()
+                    )
+            return self._title_index.closest(title, limit=limit)
+
+    def _update_title_index(self, titles: dict[str, str | None]) -> None:
+        """Apply a write of this process to the title index, if loaded.
+
+        Call this after indexing the write and before bumping the generation
+        for it. If the generation shows a write the index has missed, such
+        as one by another process or a rebuild, the index is dropped and the
+        next lookup reloads it instead.
+
+        Args:
+            titles: New title of each written note, or None if deleted
+        """
+        with self._title_index_lock:
+            if self._title_index is None:
+                return
+            if self._title_index_generation != self.generation:
+                self._title_index = None
+                return
+            for note_id, title in titles.items():
+                if title is None:
+                    self._title_index.remove(note_id)
+                else:
+                    self._title_index.add(note_id, title)
+            # Expect the bump of the write itself
+            self._title_index_generation += 1
+
+    def _note_from_db(self, db_note: DBNote) -> Note:
+        """Build a note from its indexed database row, without links."""
+        try:
+            note_type = NoteType(db_note.note_type)
+        except ValueError:
+            note_type = NoteType.PERMANENT
+        return Note(
+            id=db_note.id,
+            title=db_note.title,
+            content=db_note.content,
+            note_type=note_type,
+            tags=[Tag(name=tag.name) for tag in db_note.tags],
+            created_at=db_note.created_at,
+            updated_at=db_note.updated_at,
+        )
+
+    def get_summaries(self, ids: Iterable[str]) -> list[Note]:
+        """Get notes from the database index without reading their files.
+
+        The returned notes carry the indexed title, content, type, tags and
+        timestamps but no links or custom metadata. Use `get` when the full
+        note as stored on disk is needed.
+
+        Args:
+            ids: IDs of the notes to load
+
+        Returns:
+            Notes in the order of `ids`; unknown IDs are skipped
+        """
+        ids = list(ids)
+        notes: dict[str, Note] = {}
+        with self.session_factory() as session:
+            for i in range(0, len(ids), _ID_BATCH_SIZE):
+                query = (
+                    select(DBNote)
+                    .options(selectinload(DBNote.tags))
+                    .where(DBNote.id.in_(ids[i : i + _ID_BATCH_SIZE]))
+                )
+                for db_note in session.scalars(query):
+                    notes[db_note.id] = self._note_from_db(db_note)
+        return [notes[note_id] for note_id in ids if note_id in notes]
+
     def get_all(self) -> list[Note]:
         """Get all notes."""
         with self.session_factory() as session:
@@ -425,111 +1353,145 @@ def get_all(self) -> list[Note]:
 
     def update(self, note: Note) -> Note:
         """Update a note."""
-        # Check if note exists
-        existing_note = self.get(note.id)
-        if not existing_note:
-            raise ValueError(f"Note with ID {note.id} does not exist")
-
-        # Update timestamp
-        note.updated_at = datetime.datetime.now()
-
-        # Convert note to markdown
-        markdown = self._note_to_markdown(note)
-
-        # Write to file
-        file_path = self.notes_dir / f"{note.id}.md"
-        try:
-            with self.file_lock:
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(markdown)
-        except OSError as e:
-            raise OSError(f"Failed to write note to {file_path}: {e}") from e
-
-        try:
-            # Re-index in database
-            with self.session_factory() as session:
-                # Get the existing note from the database
-                db_note = session.scalar(select(DBNote).where(DBNote.id == note.id))
-                if db_note:
-                    # Update the note fields
-                    db_note.title = note.title
-                    db_note.content = note.content
-                    db_note.note_type = note.note_type.value
-                    db_note.updated_at = note.updated_at
-
-                    # Clear existing tags
-                    db_note.tags = []
-
-                    # Add tags
-                    for tag in note.tags:
-                        # Check if tag exists
-                        db_tag = session.scalar(
-                            select(DBTag).where(DBTag.name == tag.name)
-                        )
-                        if not db_tag:
-                            db_tag = DBTag(name=tag.name)
-                            session.add(db_tag)
-                            session.flush()
-                        db_note.tags.append(db_tag)
-
-                    # For links, we'll delete existing links and add the new ones
-                    session.execute(
-                        text(f"DELETE FROM links WHERE source_id = '{note.id}'")
-                    )
-
-                    # Add new links
-                    for link in note.links:
-                        db_link = DBLink(
-                            source_id=link.source_id,
-                            target_id=link.target_id,
-                            link_type=link.link_type.value,
-                            description=link.description,
-                            created_at=link.created_at,
-                        )
-                        session.add(db_link)
-
-                    session.commit()
-                else:
-                    # This would be unusual, but handle it by creating a new database record
+        # Hold the note's lock from reading the current version until the file
+        # and its index are written, so concurrent updates cannot interleave
+        with self.lock_notes(note.id):
+            # Check if note exists
+            existing_note = self.get(note.id)
+            if not existing_note:
+                raise ValueError(f"Note with ID {note.id} does not exist")
+
+            # Update timestamp
+            note.updated_at = datetime.datetime.now()
+
+            # Convert note to markdown
+            markdown = self._note_to_markdown(note)
+
+            # Write to file; the journal intent stays open until the index
+            # has been updated too
+            file_path = self._note_path(note.id)
+            old_path = self._find_note_file(note.id)
+            with self._journal.intent(note.id):
+                self._write_note_file(file_path, markdown)
+                if old_path is not None and old_path != file_path:
+                    # The note was stored in a previous layout; move it over
+                    old_path.unlink(missing_ok=True)
+
+                # Indexing bumps the graph generation itself; a failed write
+                # may have left the link graph in any state
+                indexed = False
+                try:
+                    # Re-index in database
                     self._index_note(note)
-        except Exception as e:
-            # Log and re-raise the exception
-            logger.error(f"Failed to update note in database: {e}")
-            raise
+                    indexed = True
+                    self._update_title_index({note.id: note.title})
+                except Exception as e:
+                    # Log and re-raise the exception
+                    logger.error(f"Failed to update note in database: {e}")
+                    raise
+                finally:
+                    self._bump_generation(graph=not indexed)
 
         return note
 
     def delete(self, id: str) -> None:
         """Delete a note by ID."""
-        # Check if note exists
-        file_path = self.notes_dir / f"{id}.md"
-        if not file_path.exists():
+        if not self.delete_many([id]).deleted:
             raise ValueError(f"Note with ID {id} does not exist")
 
-        # Delete from file system
-        try:
-            with self.file_lock:
-                os.remove(file_path)
-        except OSError as e:
-            raise OSError(f"Failed to delete note {id}: {e}") from e
+    def delete_many(self, ids: Iterable[str]) -> DeleteResult:
+        """Delete a set of notes, removing them from the index in one transaction.
 
-        # Delete from database
+        The files are removed first and the index rows of the notes (their
+        tags, and links from and to them) are deleted together afterwards.
+        The whole batch is covered by a single journal intent, so a crash
+        midway is reconciled by `recover_interrupted_writes`.
+
+        Args:
+            ids: IDs of the notes to delete; unknown IDs are reported as missing
+
+        Returns:
+            The deleted and missing IDs, and the links of other notes that
+            now point at deleted notes
+        """
+        result = DeleteResult()
+        files: dict[str, Path] = {}
+        for note_id in dict.fromkeys(ids):
+            file_path = self._find_note_file(note_id)
+            if file_path is None:
+                result.missing.append(note_id)
+            else:
+                files[note_id] = file_path
+        if not files:
+            return result
+
+        with self.lock_notes(*files), self._journal.intent(*files):
+            try:
+                for note_id, file_path in files.items():
+                    try:
+                        os.remove(file_path)
+                    except FileNotFoundError:
+                        # Removed by someone else since it was looked up
+                        pass
+                    except OSError as e:
+                        raise OSError(f"Failed to delete note {note_id}: {e}") from e
+                    with self._links_cache_lock:
+                        self._links_cache.pop(note_id, None)
+                    result.deleted.append(note_id)
+            finally:
+                for directory in {files[note_id].parent for note_id in result.deleted}:
+                    fsync_directory(directory)
+                if result.deleted:
+                    result.dangling_links = self._unindex_notes(result.deleted)
+                    self._update_title_index(dict.fromkeys(result.deleted))
+                    self._bump_generation(graph=False)
+        return result
+
+    def _unindex_note(self, id: str) -> None:
+        """Remove a note and its tags and links from the database index."""
+        self._unindex_notes([id])
+
+    def _unindex_notes(self, ids: list[str]) -> list[tuple[str, str]]:
+        """Remove notes and their tags and links from the index in one transaction.
+
+        SQLite only cascades deletes when foreign keys are enforced, which the
+        index cannot do: links may point at notes that have no file. The
+        dependent rows are therefore deleted explicitly.
+
+        Returns:
+            (source_id, target_id) of the removed links from notes that remain
+        """
+        removed = set(ids)
+        dangling = []
         with self.session_factory() as session:
-            # Delete note and its relationships
-            session.execute(
-                text(
-                    f"DELETE FROM links WHERE source_id = '{id}' OR target_id = '{id}'"
+            for i in range(0, len(ids), _ID_BATCH_SIZE):
+                batch = ids[i : i + _ID_BATCH_SIZE]
+                dangling.extend(
+                    (source_id, target_id)
+                    for source_id, target_id in session.execute(
+                        select(DBLink.source_id, DBLink.target_id).where(
+                            DBLink.target_id.in_(batch)
+                        )
+                    )
+                    if source_id not in removed
                 )
-            )
-            session.execute(text(f"DELETE FROM note_tags WHERE note_id = '{id}'"))
-            session.execute(text(f"DELETE FROM notes WHERE id = '{id}'"))
-            session.commit()
+                session.execute(
+                    delete(DBLink).where(
+                        or_(DBLink.source_id.in_(batch), DBLink.target_id.in_(batch))
+                    )
+                )
+                session.execute(delete(note_tags).where(note_tags.c.note_id.in_(batch)))
+                session.execute(delete(DBNote).where(DBNote.id.in_(batch)))
+            self._commit_graph_change(session, GraphChange(removed=list(ids)))
+        return dangling
 
     def search(self, **kwargs: Any) -> list[Note]:
         """Search for notes based on criteria."""
         with self.session_factory() as session:
+            # Tags are loaded in a second query: joining note_tags and tags
+            # into this one makes SQLite materialize and scan all of note_tags
             query = select(DBNote).options(
-                joinedload(DBNote.tags),
+                selectinload(DBNote.tags),
                 joinedload(DBNote.outgoing_links),
                 joinedload(DBNote.incoming_links),
             )
@@ -610,7 +1572,7 @@ def find_linked_notes(
                     .join(DBLink, DBNote.id == DBLink.target_id)
                     .where(DBLink.source_id == note_id)
                     .options(
-                        joinedload(DBNote.tags),
+                        selectinload(DBNote.tags),
                         joinedload(DBNote.outgoing_links),
                         joinedload(DBNote.incoming_links),
                     )
@@ -622,7 +1584,7 @@ def find_linked_notes(
                     .join(DBLink, DBNote.id == DBLink.source_id)
                     .where(DBLink.target_id == note_id)
                     .options(
-                        joinedload(DBNote.tags),
+                        selectinload(DBNote.tags),
                         joinedload(DBNote.outgoing_links),
                         joinedload(DBNote.incoming_links),
                     )
@@ -645,7 +1607,7 @@ def find_linked_notes(
                         ),
                     )
                     .options(
-                        joinedload(DBNote.tags),
+                        selectinload(DBNote.tags),
                         joinedload(DBNote.outgoing_links),
                         joinedload(DBNote.incoming_links),
                     )
@@ -667,6 +1629,64 @@ def find_linked_notes(
                     notes.append(note)
             return notes
 
+    def find_link_neighbors(
+        self, note_id: str, direction: str = "outgoing"
+    ) -> list[tuple[Link, Note]]:
+        """Find the links of a note together with the note at their other end.
+
+        Unlike `find_linked_notes`, this reads only the database index: each
+        link row is joined to the note on its other end in a single query, and
+        the neighbouring notes are built without reading their files (see
+        `get_summaries`).
+
+        Args:
+            note_id: ID of the note
+            direction: "outgoing", "incoming" or "both"
+
+        Returns:
+            (link, neighbour) pairs, outgoing links first; a neighbour linked
+            several times appears once per link
+        """
+        conditions = []
+        if direction in ("outgoing", "both"):
+            conditions.append(
+                and_(DBLink.source_id == note_id, DBNote.id == DBLink.target_id)
+            )
+        if direction in ("incoming", "both"):
+            conditions.append(
+                and_(DBLink.target_id == note_id, DBNote.id == DBLink.source_id)
+            )
+        if not conditions:
+            raise ValueError(
+                f"Invalid direction: {direction}. Use 'outgoing', 'incoming', or 'both'"
+            )
+        query = (
+            select(DBLink, DBNote)
+            .join(DBNote, or_(*conditions))
+            .options(selectinload(DBNote.tags))
+            .order_by(DBLink.source_id != note_id, DBLink.id)
+        )
+        with self.session_factory() as session:
+            rows = session.execute(query).unique().all()
+            notes: dict[str, Note] = {}
+            neighbors = []
+            for db_link, db_note in rows:
+                if db_note.id not in notes:
+                    notes[db_note.id] = self._note_from_db(db_note)
+                try:
+                    link_type = LinkType(db_link.link_type)
+                except ValueError:
+                    link_type = LinkType.REFERENCE
+                link = Link(
+                    source_id=db_link.source_id,
+                    target_id=db_link.target_id,
+                    link_type=link_type,
+                    description=db_link.description,
+                    created_at=db_link.created_at,
+                )
+                neighbors.append((link, notes[db_note.id]))
+        return neighbors
+
     def get_all_tags(self) -> list[Tag]:
         """Get all tags in the system."""
         with self.session_factory() as session:
@@ -0,0 +1,197 @@
+"""In-memory fuzzy index of note titles for did-you-mean lookups."""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+# Suggestions returned by a lookup unless asked otherwise
+DEFAULT_SUGGESTIONS = 5
+
+
+@dataclass(frozen=True)
+class TitleMatch:
+    """A note whose title is close to the one looked up."""
+
+    note_id: str
+    title: str
+    distance: int
+
+
+def normalize_title(title: str) -> str:
+    """Fold case and collapse whitespace, which lookups should ignore."""
+    return " ".join(title.casefold().split())
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Return the Levenshtein distance between two strings.
+
+    Uses the bit-parallel algorithm of Myers (in Hyyrö's formulation): one
+    column of the edit distance matrix is kept as bit vectors of +1/-1
+    vertical deltas, so each character of the longer string costs a few
+    integer operations instead of a loop over the shorter one.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return len(a)
+    # Positions of each character in the shorter string
+    masks: dict[str, int] = {}
+    for i, char in enumerate(b):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    mask = (1 << len(b)) - 1
+    last = 1 << (len(b) - 1)
+    positive, negative, distance = mask, 0, len(b)
+    for char in a:
+        eq = masks.get(char, 0)
+        xv = eq | negative
+        xh = (((eq & positive) + positive) ^ positive) | eq
+        horizontal_positive = negative | ~(xh | positive)
+        horizontal_negative = positive & xh
+        if horizontal_positive & last:
+            distance += 1
+        elif horizontal_negative & last:
+            distance -= 1
+        horizontal_positive = (horizontal_positive << 1) | 1
+        horizontal_negative <<= 1
+        positive = (horizontal_negative | ~(xv | horizontal_positive)) & mask
+        negative = horizontal_positive & xv & mask
+    return distance
+
+
+def max_distance_for(key: str) -> int:
+    """Return how many edits a lookup of a normalized title tolerates."""
+    # About one typo per four characters, so short titles stay strict
+    return max(1, len(key) // 4)
+
+
+class _Node:
+    """A normalized title in the BK-tree, with children keyed by distance."""
+
+    __slots__ = ("children", "key")
+
+    def __init__(self, key: str):
+        self.key = key
+        self.children: dict[int, _Node] = {}
+
+
+class TitleIndex:
+    """BK-tree over normalized note titles.
+
+    A BK-tree stores each title under its parent at the edit distance
+    between the two. As edit distance is a metric, a lookup within `k`
+    edits of a title only has to descend into the children whose distance
+    to the node lies within `k` of the node's own distance to the title,
+    which skips most of the tree for small `k`.
+
+    Titles are added and removed one note at a time. The tree itself cannot
+    drop a node cheaply, so a title that no note carries anymore is left in
+    place and skipped by lookups until such stale nodes outnumber the live
+    ones and the tree is rebuilt. The index is not thread-safe.
+    """
+
+    def __init__(self, titles: Iterable[tuple[str, str]] = ()):
+        """Initialize the index.
+
+        Args:
+            titles: (note_id, title) pairs to start with
+        """
+        self._root: _Node | None = None
+        self._titles: dict[str, str] = {}
+        # Note IDs by normalized title; keys without IDs are stale tree nodes
+        self._ids_by_key: dict[str, set[str]] = {}
+        self._stale = 0
+        for note_id, title in titles:
+            self.add(note_id, title)
+
+    def __len__(self) -> int:
+        """Return the number of notes in the index."""
+        return len(self._titles)
+
+    def add(self, note_id: str, title: str) -> None:
+        """Add a note, replacing the title it was indexed with before."""
+        if note_id in self._titles:
+            if self._titles[note_id] == title:
+                return
+            self.remove(note_id)
+        self._titles[note_id] = title
+        key = normalize_title(title)
+        ids = self._ids_by_key.get(key)
+        if ids is not None:
+            if not ids:
+                self._stale -= 1
+            ids.add(note_id)
+            return
+        self._ids_by_key[key] = {note_id}
+        self._insert(key)
+
+    def remove(self, note_id: str) -> None:
+        """Remove a note; unknown IDs are ignored."""
+        title = self._titles.pop(note_id, None)
+        if title is None:
+            return
+        ids = self._ids_by_key[normalize_title(title)]
+        ids.discard(note_id)
+        if ids:
+            return
+        self._stale += 1
+        if self._stale > len(self._ids_by_key) - self._stale:
+            self._rebuild()
+
+    def closest(
+        self,
+        title: str,
+        max_distance: int | None = None,
+        limit: int = DEFAULT_SUGGESTIONS,
+    ) -> list[TitleMatch]:
+        """Find the notes with the titles closest to a title.
+
+        Args:
+            title: Title to look up; case and whitespace are ignored
+            max_distance: Most edits a match may be away from the title,
+                by default about one per four characters
+            limit: Maximum number of matches
+
+        Returns:
+            Matches ordered by distance, then title
+        """
+        key = normalize_title(title)
+        if max_distance is None:
+            max_distance = max_distance_for(key)
+        found: list[tuple[int, str]] = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = edit_distance(key, node.key)
+            if distance <= max_distance and self._ids_by_key[node.key]:
+                found.append((distance, node.key))
+            for child_distance, child in node.children.items():
+                if abs(child_distance - distance) <= max_distance:
+                    stack.append(child)
+        matches = [
+            TitleMatch(note_id, self._titles[note_id], distance)
+            for distance, node_key in found
+            for note_id in self._ids_by_key[node_key]
+        ]
+        matches.sort(key=lambda m: (m.distance, m.title, m.note_id))
+        return matches[:limit]
+
+    def _insert(self, key: str) -> None:
+        """Insert a normalized title that is not in the tree yet."""
+        if self._root is None:
+            self._root = _Node(key)
+            return
+        node = self._root
+        while True:
+            distance = edit_distance(key, node.key)
+            child = node.children.get(distance)
+            if child is None:
+                node.children[distance] = _Node(key)
+                return
+            node = child
+
+    def _rebuild(self) -> None:
+        """Rebuild the tree from the titles that notes still carry."""
+        self._ids_by_key = {key: ids for key, ids in self._ids_by_key.items() if ids}
+        self._stale = 0
+        self._root = None
+        for key in self._ids_by_key:
+            self._insert(key)
@@ -0,0 +1,334 @@
+"""Tests for centrality measures over the link graph."""
+
+import json
+import random
+from unittest.mock import patch
+
+import pytest
+
+from zettelkasten_mcp.models.schema import LinkType
+from zettelkasten_mcp.services.graph_service import (
+    GraphService,
+    LinkGraph,
+    neighborhood,
+    pagerank,
+    shortest_path,
+)
+from zettelkasten_mcp.storage.note_repository import GraphChange
+
+
+class TestLinkGraph:
+    """Tests for the LinkGraph snapshot and PageRank."""
+
+    def test_build_counts_degrees_and_skips_missing_notes(self):
+        """Test degree counts and adjacency for known and missing notes."""
+        graph = LinkGraph.build(
+            ["a", "b", "c"],
+            [
+                ("a", "b", "extends"),
+                ("c", "b", "reference"),
+                ("a", "missing", "reference"),
+            ],
+        )
+        a, b, c = (graph.index[note_id] for note_id in "abc")
+        assert graph.out_degree[a] == 2
+        assert graph.in_degree[b] == 2
+        assert graph.outgoing[a] == [(b, "extends")]
+        assert graph.incoming[b] == [(a, "extends"), (c, "reference")]
+        assert graph.weighted_degree[b] == 2.5
+
+    def test_pagerank_ranks_linked_to_note_highest(self):
+        """Test that PageRank favours the note everything points to."""
+        graph = LinkGraph.build(
+            ["hub", "x", "y", "z"],
+            [
+                ("x", "hub", "reference"),
+                ("y", "hub", "reference"),
+                ("z", "x", "reference"),
+            ],
+        )
+        scores = pagerank(graph)
+        assert sum(scores.values()) == pytest.approx(1.0)
+        assert max(scores, key=scores.get) == "hub"
+        assert scores["x"] > scores["y"]
+
+    def test_pagerank_warm_start_matches_cold_start(self):
+        """Test that starting from previous scores converges to the same result."""
+        graph = LinkGraph.build(
+            ["a", "b", "c"],
+            [("a", "b", "reference"), ("b", "c", "supports"), ("c", "a", "extends")],
+        )
+        cold = pagerank(graph)
+        warm = pagerank(graph, initial={"a": 0.9, "b": 0.05})
+        for note_id in cold:
+            assert warm[note_id] == pytest.approx(cold[note_id], abs=1e-5)
+
+    def test_changes_match_a_rebuilt_graph(self):
+        """Test that applied changes leave the graph as if built from scratch."""
+        generator = random.Random(7)
+        types = [link_type.value for link_type in LinkType]
+        links = {
+            f"n{i}": [
+                (f"n{generator.randrange(25)}", generator.choice(types))
+                for _ in range(generator.randrange(4))
+            ]
+            for i in range(20)
+        }
+        graph = LinkGraph.build(
+            links, [(s, t, kind) for s, targets in links.items() for t, kind in targets]
+        )
+        graph.pagerank_scores()
+        for _ in range(60):
+            note_id = f"n{generator.randrange(25)}"
+            if note_id in links and generator.random() < 0.2:
+                graph.apply(GraphChange(removed=[note_id]))
+                del links[note_id]
+                # The index drops the links to a removed note
+                for targets in links.values():
+                    targets[:] = [link for link in targets if link[0] != note_id]
+            else:
+                targets = [
+                    (f"n{generator.randrange(25)}", generator.choice(types))
+                    for _ in range(generator.randrange(4))
+                ]
+                graph.apply(GraphChange(links={note_id: targets}))
+                links[note_id] = targets
+
+            fresh = LinkGraph.build(
+                links,
+                [(s, t, kind) for s, targets in links.items() for t, kind in targets],
+            )
+            assert sorted(graph.note_ids) == sorted(fresh.note_ids)
+            for note_id in fresh.note_ids:
+                node, fresh_node = graph.index[note_id], fresh.index[note_id]
+                assert graph.note_ids[node] == note_id
+                for attribute in ("out_degree", "in_degree", "weighted_degree"):
+                    assert getattr(graph, attribute)[node] == pytest.approx(
+                        getattr(fresh, attribute)[fresh_node]
+                    )
+                for attribute in ("outgoing", "incoming"):
+                    assert sorted(
+                        (graph.note_ids[other], kind)
+                        for other, kind in getattr(graph, attribute)[node]
+                    ) == sorted(
+                        (fresh.note_ids[other], kind)
+                        for other, kind in getattr(fresh, attribute)[fresh_node]
+                    )
+            scores = graph.pagerank_scores()
+            for note_id, score in pagerank(fresh, tolerance=1e-10).items():
+                assert scores[note_id] == pytest.approx(score, abs=1e-4)
+
+
+class TestTraversal:
+    """Tests for shortest paths and neighbourhoods on the link graph."""
+
+    @pytest.fixture
+    def graph(self):
+        """A small graph: a -> b -> c -> d, plus a shortcut a -> d via e."""
+        return LinkGraph.build(
+            ["a", "b", "c", "d", "e", "f"],
+            [
+                ("a", "b", "extends"),
+                ("b", "c", "extends"),
+                ("c", "d", "extends"),
+                ("a", "e", "reference"),
+                ("d", "e", "supports"),
+            ],
+        )
+
+    def test_shortest_path_undirected(self, graph):
+        """Test that links are followed in both directions by default."""
+        path = shortest_path(graph, "a", "d")
+        assert [step.note_id for step in path] == ["a", "e", "d"]
+        assert [(step.link_type, step.direction) for step in path] == [
+            (None, None),
+            ("reference", "outgoing"),
+            ("supports", "incoming"),
+        ]
+        assert path[2].parent_id == "e"
+        assert path[2].depth == 2
+
+    def test_shortest_path_directed_and_filtered(self, graph):
+        """Test direction and link type restrictions."""
+        path = shortest_path(graph, "a", "d", direction="outgoing")
+        assert [step.note_id for step in path] == ["a", "b", "c", "d"]
+        assert all(step.direction == "outgoing" for step in path[1:])
+
+        path = shortest_path(
+            graph, "d", "a", direction="incoming", link_types={"extends"}
+        )
+        assert [step.note_id for step in path] == ["d", "c", "b", "a"]
+        assert all(step.direction == "incoming" for step in path[1:])
+
+        assert shortest_path(graph, "a", "d", direction="outgoing", max_depth=2) is None
+        assert shortest_path(graph, "a", "f") is None
+        assert [step.note_id for step in shortest_path(graph, "a", "a")] == ["a"]
+
+    def test_shortest_path_unknown_note(self, graph):
+        """Test that unknown note IDs are rejected."""
+        with pytest.raises(ValueError, match="not found"):
+            shortest_path(graph, "a", "zzz")
+
+    def test_neighborhood_depth_and_cap(self, graph):
+        """Test k-hop collection and the node cap."""
+        steps, truncated = neighborhood(graph, "a", depth=1)
+        assert {step.note_id for step in steps} == {"b", "e"}
+        assert not truncated
+
+        steps, truncated = neighborhood(graph, "a", depth=2)
+        assert {step.note_id: step.depth for step in steps} == {
+            "b": 1,
+            "e": 1,
+            "c": 2,
+            "d": 2,
+        }
+
+        steps, truncated = neighborhood(graph, "a", depth=3, max_nodes=2)
+        assert len(steps) == 2
+        assert truncated
+
+
+class TestGraphService:
+    """Tests for the GraphService class."""
+
+    def test_find_central_notes_by_method(self, zettel_service):
+        """Test degree, weighted and PageRank centrality on real notes."""
+        graph_service = GraphService(zettel_service)
+        hub = zettel_service.create_note(title="Hub", content="Hub note.")
+        first = zettel_service.create_note(title="First", content="First note.")
+        second = zettel_service.create_note(title="Second", content="Second note.")
+        orphan = zettel_service.create_note(title="Orphan", content="Alone.")
+        zettel_service.create_link(first.id, hub.id, LinkType.EXTENDS)
+        zettel_service.create_link(second.id, hub.id, LinkType.REFERENCE)
+
+        for method in ("degree", "weighted", "pagerank"):
+            central = graph_service.find_central_notes(limit=10, method=method)
+            ids = [note.id for note, _ in central]
+            assert ids[0] == hub.id
+            assert orphan.id not in ids
+
+        degree = {note.id: score for note, score in graph_service.find_central_notes()}
+        assert degree[hub.id] == 2
+        weighted = {
+            note.id: score
+            for note, score in graph_service.find_central_notes(method="weighted")
+        }
+        assert weighted[first.id] > weighted[second.id]
+
+    def test_central_notes_are_read_from_their_files(self, zettel_service):
+        """Test that central notes carry the title heading and tag order."""
+        hub = zettel_service.create_note(
+            title="Hub", content="Hub note.", tags=["zeta", "alpha"]
+        )
+        other = zettel_service.create_note(title="Other", content="Other note.")
+        zettel_service.create_link(other.id, hub.id)
+
+        (note, _), _ = GraphService(zettel_service).find_central_notes(limit=2)
+        assert note.id == hub.id
+        assert note.content.startswith("# Hub\n\nHub note.")
+        assert [tag.name for tag in note.tags] == ["zeta", "alpha"]
+
+    def test_scores_recomputed_after_link_change(self, zettel_service):
+        """Test that cached scores are refreshed when links change."""
+        graph_service = GraphService(zettel_service)
+        a = zettel_service.create_note(title="A", content="A.")
+        b = zettel_service.create_note(title="B", content="B.")
+        c = zettel_service.create_note(title="C", content="C.")
+        zettel_service.create_link(a.id, b.id)
+        assert graph_service.centrality("degree")[c.id] == 0
+
+        zettel_service.create_link(a.id, c.id)
+        zettel_service.create_link(b.id, c.id)
+        assert graph_service.centrality("degree")[c.id] == 2
+        scores = graph_service.centrality("pagerank")
+        assert max(scores, key=scores.get) == c.id
+
+    def test_link_changes_update_the_loaded_graph(self, zettel_service):
+        """Test that link writes are applied to the graph without reloading it."""
+        graph_service = GraphService(zettel_service)
+        a = zettel_service.create_note(title="A", content="A.")
+        b = zettel_service.create_note(title="B", content="B.")
+        graph = graph_service.get_graph()
+        graph_service.centrality("pagerank")
+
+        repository = zettel_service.repository
+        with patch.object(
+            repository, "load_link_graph", side_effect=AssertionError("reloaded")
+        ):
+            c = zettel_service.create_note(title="C", content="C.")
+            zettel_service.create_link(a.id, c.id)
+            zettel_service.create_link(b.id, c.id)
+            zettel_service.delete_note(b.id)
+            assert graph_service.get_graph() is graph
+            assert graph_service.centrality("degree") == {a.id: 1, c.id: 1}
+            scores = graph_service.centrality("pagerank")
+
+        fresh = LinkGraph.build(*repository.load_link_graph()[1:])
+        for note_id, score in pagerank(fresh, tolerance=1e-10).items():
+            assert scores[note_id] == pytest.approx(score, abs=1e-4)
+
+        # Changes the repository did not log make the graph reload
+        repository.rebuild_index()
+        assert graph_service.get_graph() is not graph
+
+    def test_traversals_follow_link_changes(self, zettel_service):
+        """Test that paths and neighbourhoods see new links without a reload."""
+        graph_service = GraphService(zettel_service)
+        a = zettel_service.create_note(title="A", content="A.")
+        b = zettel_service.create_note(title="B", content="B.")
+        assert graph_service.find_path(a.id, b.id) is None
+
+        with patch.object(
+            zettel_service.repository,
+            "load_link_graph",
+            side_effect=AssertionError("reloaded"),
+        ):
+            c = zettel_service.create_note(title="C", content="C.")
+            zettel_service.create_link(a.id, c.id, LinkType.EXTENDS)
+            zettel_service.create_link(c.id, b.id, LinkType.SUPPORTS)
+            path = graph_service.find_path(a.id, b.id, direction="outgoing")
+            assert [step.note_id for step in path] == [a.id, c.id, b.id]
+
+            zettel_service.delete_note(c.id)
+            assert graph_service.find_path(a.id, b.id) is None
+            steps, _ = graph_service.get_neighborhood(a.id)
+            assert steps == []
+
+    def test_invalid_method(self, zettel_service):
+        """Test that an unknown centrality method is rejected."""
+        with pytest.raises(ValueError, match="Invalid centrality method"):
+            GraphService(zettel_service).centrality("betweenness")
+
+    def test_traversal_tools(self, zettel_service):
+        """Test zk_find_path and zk_get_neighborhood end to end."""
+        from zettelkasten_mcp.server.mcp_server import ZettelkastenMcpServer
+
+        server = ZettelkastenMcpServer()
+        server.zettel_service = zettel_service
+        server.search_service.graph_service = GraphService(zettel_service)
+        a = zettel_service.create_note(title="Idea A", content="A.")
+        b = zettel_service.create_note(title="Idea B", content="B.")
+        c = zettel_service.create_note(title="Idea C", content="C.")
+        zettel_service.create_link(a.id, b.id, LinkType.EXTENDS)
+        zettel_service.create_link(c.id, b.id, LinkType.SUPPORTS)
+
+        tools = server.mcp._tool_manager
+        result = tools.get_tool("zk_find_path").fn(source_id=a.id, target_id=c.id)
+        assert "Found a path of 2 links" in result
+        assert "Idea B" in result
+        assert "Link type: supports" in result
+
+        payload = json.loads(
+            tools.get_tool("zk_get_neighborhood").fn(
+                note_id=a.id, depth=2, output_format="json"
+            )
+        )
+        assert [(n["id"], n["depth"]) for n in payload["notes"]] == [
+            (b.id, 1),
+            (c.id, 2),
+        ]
+
+        result = tools.get_tool("zk_find_path").fn(
+            source_id=a.id, target_id=c.id, link_types="refines"
+        )
+        assert result.startswith("No path found")
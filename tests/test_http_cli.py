@@ -76,6 +76,14 @@ def test_cors_default_is_none(self):
             args = parse_args()
             assert args.cors is None
 
+    def test_workers_argument(self):
+        """Test --workers argument."""
+        test_args = ["program", "--transport", "http", "--workers", "4"]
+
+        with patch.object(sys, "argv", test_args):
+            args = parse_args()
+            assert args.workers == 4
+
     def test_combined_http_arguments(self):
         """Test multiple HTTP arguments together."""
         test_args = [
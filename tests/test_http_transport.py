@@ -1,5 +1,9 @@
 """Tests for HTTP transport functionality."""
 
+import asyncio
+import os
+import sys
+import threading
 from unittest.mock import MagicMock, Mock, call, patch
 
 import pytest
@@ -12,7 +16,7 @@ class TestHTTPTransport:
     """Test HTTP transport functionality."""
 
     @pytest.fixture
-    def server(self):
+    def server(self, test_config):
         """Create a server instance for testing."""
         return ZettelkastenMcpServer()
 
@@ -243,3 +247,137 @@ def test_stdio_logging(self, mock_logger, server):
 
             # Verify logging message
             mock_logger.info.assert_called_with("Starting STDIO server")
+
+    @pytest.fixture
+    def worker_env(self, monkeypatch):
+        """Restore the environment variables exported to worker processes."""
+        for name in (
+            "ZETTELKASTEN_NOTES_DIR",
+            "ZETTELKASTEN_DATABASE_PATH",
+            "ZETTELKASTEN_NOTES_LAYOUT",
+            "ZETTELKASTEN_HTTP_CORS",
+            "ZETTELKASTEN_HTTP_METRICS",
+            "ZETTELKASTEN_LOG_LEVEL",
+        ):
+            monkeypatch.delenv(name, raising=False)
+
+    def test_http_workers_use_app_factory(self, server, worker_env):
+        """Test that several workers are started from the app factory."""
+        with patch("uvicorn.run") as mock_run:
+            server.run(transport="http", host="localhost", port=8080, workers=3)
+
+        mock_run.assert_called_once_with(
+            "zettelkasten_mcp.server.mcp_server:create_http_app",
+            factory=True,
+            host="localhost",
+            port=8080,
+            workers=3,
+        )
+
+    def test_http_workers_get_settings_from_run(self, test_config, worker_env):
+        """Test that run() hands the storage paths down to the workers."""
+        server = ZettelkastenMcpServer()
+        with patch("uvicorn.run"):
+            server.run(transport="http", workers=2, enable_cors=True)
+
+        assert os.environ["ZETTELKASTEN_NOTES_DIR"] == str(
+            test_config.get_absolute_path(test_config.notes_dir)
+        )
+        assert os.environ["ZETTELKASTEN_DATABASE_PATH"] == str(
+            test_config.get_absolute_path(test_config.database_path)
+        )
+        assert os.environ["ZETTELKASTEN_HTTP_CORS"] == "true"
+
+    def test_main_starts_workers_without_building_a_server(
+        self, test_config, worker_env, monkeypatch
+    ):
+        """Test that the parent of several workers does not load the index."""
+        from zettelkasten_mcp import main
+
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            ["program", "--transport", "http", "--workers", "2", "--port", "8081"],
+        )
+        monkeypatch.setattr(config, "http_workers", config.http_workers)
+        with (
+            patch(
+                "zettelkasten_mcp.server.mcp_server.ZettelkastenMcpServer",
+                side_effect=AssertionError("server built"),
+            ),
+            patch("uvicorn.run") as mock_run,
+        ):
+            main.main()
+
+        mock_run.assert_called_once_with(
+            "zettelkasten_mcp.server.mcp_server:create_http_app",
+            factory=True,
+            host=config.http_host,
+            port=8081,
+            workers=2,
+        )
+        assert os.environ["ZETTELKASTEN_NOTES_DIR"] == str(
+            test_config.get_absolute_path(test_config.notes_dir)
+        )
+
+    def test_metrics_route_disabled_by_default(self, server):
+        """Test that /metrics is not served unless enabled."""
+        from starlette.testclient import TestClient
+
+        client = TestClient(server.http_app(enable_cors=False))
+        assert client.get("/metrics").status_code == 404
+
+    def test_metrics_route_when_enabled(self, test_config, monkeypatch):
+        """Test that /metrics serves the server metrics when enabled."""
+        from starlette.testclient import TestClient
+
+        monkeypatch.setattr(config, "http_metrics_enabled", True)
+        server = ZettelkastenMcpServer()
+        client = TestClient(server.http_app(enable_cors=False))
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert set(response.json()) == {"single_flight", "result_cache"}
+
+    def test_coalesced_tools_see_writes_made_during_a_call(self, server):
+        """Test that a call after a write does not reuse a call from before it."""
+        get_all_tags = server.zettel_service.get_all_tags
+        started, release = threading.Event(), threading.Event()
+
+        def slow_get_all_tags():
+            tags = get_all_tags()
+            if not started.is_set():
+                # Hold the first call in flight until the second has run
+                started.set()
+                release.wait(timeout=5)
+            return tags
+
+        results = []
+        with patch.object(
+            server.zettel_service, "get_all_tags", side_effect=slow_get_all_tags
+        ):
+            first = threading.Thread(
+                target=lambda: results.append(
+                    asyncio.run(server.mcp.call_tool("zk_get_all_tags", {}))
+                )
+            )
+            first.start()
+            assert started.wait(timeout=5)
+            server.zettel_service.create_note(
+                title="Tagged", content="Tagged note.", tags=["fresh"]
+            )
+            after_write = asyncio.run(server.mcp.call_tool("zk_get_all_tags", {}))
+            release.set()
+            first.join(timeout=5)
+
+        assert "No tags found" in str(results[0])
+        assert "fresh" in str(after_write)
+        assert server.single_flight.get_metrics()["coalesced"] == 0
+
+    def test_coalesced_tools_run_through_fastmcp(self, server):
+        """Test that the async coalesced tools are called by FastMCP."""
+        result = asyncio.run(server.mcp.call_tool("zk_get_all_tags", {}))
+        assert "No tags found" in str(result)
+        assert server.single_flight.get_metrics()["by_tool"]["zk_get_all_tags"] == {
+            "calls": 1,
+            "coalesced": 0,
+        }
@@ -0,0 +1,63 @@
+"""Tests for the note write intent journal."""
+
+from zettelkasten_mcp.storage.journal import WriteJournal
+
+
+def test_unfinished_intents_are_recovered(tmp_path):
+    """Test that only intents without an end entry are replayed."""
+    crashed = WriteJournal(tmp_path)
+    crashed.end(crashed.begin("done"))
+    crashed.begin("interrupted")
+    crashed.begin("interrupted")
+    crashed.close()
+    # A torn entry from a crash in the middle of an append
+    with open(crashed.path, "a", encoding="utf-8") as f:
+        f.write('{"seq": 9, "id"')
+
+    journal = WriteJournal(tmp_path)
+    reconciled = []
+    assert journal.recover(reconciled.append) == 1
+    assert reconciled == ["interrupted"]
+    assert not crashed.path.exists()
+    # Journals still open in this process are never replayed
+    assert journal.path.exists()
+    assert journal.recover(reconciled.append) == 0
+
+
+def test_intent_left_open_when_block_fails(tmp_path):
+    """Test that a failed change keeps its intent for recovery."""
+    journal = WriteJournal(tmp_path)
+    try:
+        with journal.intent("failed"):
+            raise OSError("disk full")
+    except OSError:
+        pass
+    with journal.intent("ok"):
+        pass
+    assert WriteJournal.read_pending(journal.path) == ["failed"]
+
+
+def test_compaction_keeps_only_pending_intents(tmp_path):
+    """Test that a grown journal is rewritten with unfinished intents only."""
+    journal = WriteJournal(tmp_path, compact_bytes=200)
+    pending = journal.begin("pending")
+    for i in range(20):
+        journal.end(journal.begin(f"note-{i}"))
+    assert journal.path.stat().st_size < 200
+    assert WriteJournal.read_pending(journal.path) == ["pending"]
+    journal.end(pending)
+    journal.close()
+    assert not journal.path.exists()
+
+
+def test_batch_intent_covers_every_note(tmp_path):
+    """Test that one intent for several notes recovers all of them."""
+    journal = WriteJournal(tmp_path, compact_bytes=200)
+    pending = journal.begin("a", "b", "c")
+    for i in range(20):
+        journal.end(journal.begin(f"note-{i}"))
+    # Compaction keeps the batch entry intact
+    assert journal.path.stat().st_size < 200
+    assert WriteJournal.read_pending(journal.path) == ["a", "b", "c"]
+    journal.end(pending)
+    assert WriteJournal.read_pending(journal.path) == []
@@ -0,0 +1,70 @@
+"""Tests for the on-disk layouts of note files."""
+
+import pytest
+
+from zettelkasten_mcp.storage import layout
+
+
+def test_note_path_per_layout(tmp_path):
+    """Test that timestamp IDs shard by year and month."""
+    note_id = "20240315T101112123456000"
+    assert layout.note_path(tmp_path, note_id, "flat") == tmp_path / f"{note_id}.md"
+    assert (
+        layout.note_path(tmp_path, note_id, "sharded")
+        == tmp_path / "2024" / "03" / f"{note_id}.md"
+    )
+    year, bucket = layout.shard_for("custom-id")
+    assert year == layout.OTHER_SHARD
+    assert len(bucket) == 2
+    with pytest.raises(ValueError):
+        layout.check_layout("nested")
+
+
+def test_iter_note_files_covers_both_layouts(tmp_path):
+    """Test that flat and sharded note files are found, temp files apart."""
+    flat = tmp_path / "20240101T000000000000000.md"
+    sharded = layout.note_path(tmp_path, "20240201T000000000000000", "sharded")
+    sharded.parent.mkdir(parents=True)
+    temp = sharded.with_name(f".{sharded.name}.tmp")
+    for path in (flat, sharded, temp, tmp_path / "README.txt"):
+        path.write_text("x")
+
+    assert set(layout.iter_note_files(tmp_path)) == {flat, sharded}
+    assert list(layout.iter_note_files(tmp_path, temp_files=True)) == [temp]
+    assert layout.count_note_files(tmp_path) == 2
+
+
+def test_user_folders_are_not_scanned(tmp_path):
+    """Test that only shard directories are searched for notes."""
+    note = tmp_path / "20240101T000000000000000.md"
+    sharded = layout.note_path(tmp_path, "20240201T000000000000000", "sharded")
+    other = layout.note_path(tmp_path, "custom-id", "sharded")
+    user_files = [
+        tmp_path / "projects" / "sub" / "readme.md",
+        tmp_path / "exports" / "notes.md",
+        tmp_path / "2024" / "drafts" / "draft.md",
+        tmp_path / layout.OTHER_SHARD / "misc" / "todo.md",
+    ]
+    for path in (note, sharded, other, *user_files):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+    (tmp_path / "empty-folder").mkdir()
+
+    assert set(layout.iter_note_files(tmp_path)) == {note, sharded, other}
+    assert layout.count_note_files(tmp_path) == 3
+    assert set(layout.list_directories(tmp_path)) == {
+        tmp_path,
+        tmp_path / "2024",
+        sharded.parent,
+        other.parent.parent,
+        other.parent,
+    }
+
+    sharded.unlink()
+    other.unlink()
+    layout.remove_empty_shards(tmp_path)
+    assert not sharded.parent.exists() and not other.parent.exists()
+    # Still holds a user folder
+    assert other.parent.parent.is_dir()
+    assert all(path.exists() for path in user_files)
+    assert (tmp_path / "empty-folder").is_dir()
@@ -0,0 +1,115 @@
+"""Tests for striped per-note locks."""
+
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from zettelkasten_mcp.storage.locking import (
+    SharedCounter,
+    StripedLock,
+    process_locks_supported,
+)
+
+requires_fcntl = pytest.mark.skipif(
+    not process_locks_supported(), reason="fcntl file locks not available"
+)
+
+
+def _stripe_busy_in_other_process(lock_file, index):
+    """Try to take one stripe's file lock from a separate process."""
+    script = (
+        "import fcntl, os, sys\n"
+        f"fd = os.open({str(lock_file)!r}, os.O_RDWR)\n"
+        "try:\n"
+        f"    fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, {index})\n"
+        "except OSError:\n"
+        "    sys.exit(1)\n"
+    )
+    return subprocess.run([sys.executable, "-c", script], check=False).returncode == 1
+
+
+def test_same_key_maps_to_same_stripe():
+    """Test that stripes are stable and spread keys across the pool."""
+    locks = StripedLock(stripes=8)
+    assert locks.stripe("202101010000") == locks.stripe("202101010000")
+    assert len({locks.stripe(f"note-{i}") for i in range(100)}) > 1
+    with pytest.raises(ValueError):
+        StripedLock(stripes=0)
+
+
+def test_acquire_is_reentrant():
+    """Test that a holder can lock the same and colliding keys again."""
+    locks = StripedLock(stripes=1)
+    with locks.acquire("a", "b"):
+        with locks.acquire("b"):
+            pass
+
+
+def test_acquire_blocks_other_threads():
+    """Test that a held key cannot be locked from another thread."""
+    locks = StripedLock()
+    acquired = threading.Event()
+
+    def other():
+        with locks.acquire("a"):
+            acquired.set()
+
+    with locks.acquire("a"):
+        thread = threading.Thread(target=other)
+        thread.start()
+        assert not acquired.wait(0.1)
+    assert acquired.wait(5)
+    thread.join()
+
+
+def test_opposite_order_acquisition_does_not_deadlock():
+    """Test that locking the same keys in opposite orders cannot deadlock."""
+    locks = StripedLock()
+    a, b = "a", "b"
+    while locks.stripe(a) == locks.stripe(b):
+        b += "b"
+
+    def worker(first, second):
+        for _ in range(500):
+            with locks.acquire(first, second):
+                pass
+
+    threads = [
+        threading.Thread(target=worker, args=(a, b)),
+        threading.Thread(target=worker, args=(b, a)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    assert not any(thread.is_alive() for thread in threads)
+
+
+@requires_fcntl
+def test_file_backed_stripes_exclude_other_processes(tmp_path):
+    """Test that a held stripe is locked for other processes until released."""
+    lock_file = tmp_path / "notes.lock"
+    locks = StripedLock(lock_file=lock_file)
+    index = locks.stripe("a")
+    with locks.acquire("a"):
+        with locks.acquire("a"):
+            pass
+        # Leaving the inner block must not drop the outer holder's file lock
+        assert _stripe_busy_in_other_process(lock_file, index)
+    assert not _stripe_busy_in_other_process(lock_file, index)
+    locks.close()
+
+
+@requires_fcntl
+def test_shared_counter_is_seen_by_other_handles(tmp_path):
+    """Test that increments through one handle are visible through another."""
+    first = SharedCounter(tmp_path / "generation")
+    second = SharedCounter(tmp_path / "generation")
+    assert first.value == second.value == 0
+    assert first.increment() == 1
+    assert second.increment() == 2
+    assert first.value == 2
+    first.close()
+    second.close()
@@ -1,12 +1,18 @@
 # tests/test_mcp_server.py
 """Tests for the MCP server implementation."""
 
+import asyncio
+import json
+from datetime import datetime
 from unittest.mock import MagicMock, call, patch
 
 import pytest
 
-from zettelkasten_mcp.models.schema import LinkType, NoteType
+from zettelkasten_mcp.models.schema import LinkType, Note, NoteType
 from zettelkasten_mcp.server.mcp_server import ZettelkastenMcpServer
+from zettelkasten_mcp.services.search_service import GrepResult, SearchFacets
+from zettelkasten_mcp.storage.note_repository import DeleteResult
+from zettelkasten_mcp.storage.title_index import TitleMatch
 
 
 class TestMcpServer:
@@ -131,6 +137,28 @@ def test_get_note_tool(self):
         # Verify service call
         self.mock_zettel_service.get_note.assert_called_with("test123")
 
+    def test_get_note_tool_suggests_titles(self):
+        """Test that a missed zk_get_note lookup offers the closest titles."""
+        self.mock_zettel_service.get_note.return_value = None
+        self.mock_zettel_service.get_note_by_title.return_value = None
+        self.mock_zettel_service.suggest_titles.return_value = [
+            TitleMatch("n1", "Spaced Repetition", 1)
+        ]
+        get_note_func = self.registered_tools["zk_get_note"]
+        result = get_note_func(identifier="Spaced Repitition")
+        self.mock_zettel_service.suggest_titles.assert_called_with("Spaced Repitition")
+        assert "Note not found: Spaced Repitition" in result
+        assert "Did you mean:" in result
+        assert "Spaced Repetition (ID: n1)" in result
+
+        payload = json.loads(
+            get_note_func(identifier="Spaced Repitition", output_format="json")
+        )
+        assert payload == {
+            "error": "Note not found: Spaced Repitition",
+            "suggestions": [{"id": "n1", "title": "Spaced Repetition"}],
+        }
+
     def test_create_link_tool(self):
         """Test the zk_create_link tool."""
         # Check the tool is registered
@@ -169,6 +197,44 @@ def test_create_link_tool(self):
             bidirectional=True,
         )
 
+    def test_delete_notes_tool(self):
+        """Test the zk_delete_notes tool."""
+        assert "zk_delete_notes" in self.registered_tools
+        self.mock_zettel_service.delete_notes.return_value = DeleteResult(
+            deleted=["a", "b"], missing=["c"], dangling_links=[("d", "a")]
+        )
+        delete_notes_func = self.registered_tools["zk_delete_notes"]
+        result = delete_notes_func(note_ids="a, b,c")
+        self.mock_zettel_service.delete_notes.assert_called_with(["a", "b", "c"])
+        assert "Deleted 2 notes" in result
+        assert "Not found: c" in result
+        assert "d -> a" in result
+
+        payload = json.loads(delete_notes_func(note_ids="a,b", output_format="json"))
+        assert payload["dangling_links"] == [{"source_id": "d", "target_id": "a"}]
+
+    def test_grep_notes_tool(self):
+        """Test the zk_grep_notes tool."""
+        assert "zk_grep_notes" in self.registered_tools
+        note = Note(id="n1", title="Trigrams", content="A trigram index.")
+        self.mock_search_service.grep_notes.return_value = [
+            GrepResult(note=note, lines=[(0, "Trigrams"), (3, "A trigram index.")])
+        ]
+        grep_func = self.registered_tools["zk_grep_notes"]
+        result = grep_func(pattern="trigram", regex=True)
+        self.mock_search_service.grep_notes.assert_called_with(
+            "trigram", regex=True, case_sensitive=False, limit=20
+        )
+        assert "Trigrams (ID: n1)" in result
+        assert "title: Trigrams" in result
+        assert "3: A trigram index." in result
+
+        payload = json.loads(grep_func(pattern="trigram", output_format="json"))
+        assert payload["results"][0]["lines"][1] == {
+            "line": 3,
+            "text": "A trigram index.",
+        }
+
     def test_search_notes_tool(self):
         """Test the zk_search_notes tool."""
         # Check the tool is registered
@@ -209,8 +275,10 @@ def test_search_notes_tool(self):
 
         # Call the tool function directly
         search_notes_func = self.registered_tools["zk_search_notes"]
-        result = search_notes_func(
-            query="test query", tags="tag1, tag2", note_type="permanent", limit=10
+        result = asyncio.run(
+            search_notes_func(
+                query="test query", tags="tag1, tag2", note_type="permanent", limit=10
+            )
         )
 
         # Verify result
@@ -223,6 +291,116 @@ def test_search_notes_tool(self):
             text="test query", tags=["tag1", "tag2"], note_type=NoteType.PERMANENT
         )
 
+    def test_search_notes_tool_query_syntax(self):
+        """Test that syntax="query" routes to the query language search."""
+        search_func = self.registered_tools["zk_search_notes"]
+        self.mock_search_service.search_query.return_value = []
+        result = asyncio.run(search_func(query="tag:ml -draft", syntax="query"))
+        assert "No matching notes found" in result
+        self.mock_search_service.search_query.assert_called_with(
+            "tag:ml -draft", tags=None, note_type=None
+        )
+        assert "Invalid syntax" in asyncio.run(search_func(query="x", syntax="regex"))
+
+    def test_search_notes_tool_facets(self):
+        """Test that facets count all matches, not just the returned ones."""
+        search_func = self.registered_tools["zk_search_notes"]
+        notes = []
+        for i in range(3):
+            note = MagicMock()
+            note.id, note.title, note.content = f"n{i}", f"Note {i}", "Text"
+            note.tags, note.created_at = [], datetime(2025, 1, 1)
+            notes.append(MagicMock(note=note, score=1.0))
+        self.mock_search_service.search_combined.return_value = notes
+        self.mock_search_service.facet_counts.return_value = SearchFacets(
+            tags={"ml": 3}, note_types={"permanent": 3}, months={"2025-01": 3}
+        )
+        result = asyncio.run(search_func(query="text", limit=1, facets=True))
+        self.mock_search_service.facet_counts.assert_called_with(
+            ["n0", "n1", "n2"], max_tags=20
+        )
+        assert "Tags: ml (3)" in result
+        assert "Created: 2025-01 (3)" in result
+
+        payload = json.loads(
+            asyncio.run(
+                search_func(query="text", limit=1, facets=True, output_format="json")
+            )
+        )
+        assert payload["count"] == 1
+        assert payload["facets"]["note_types"] == {"permanent": 3}
+
+    def test_search_notes_tool_json_output(self):
+        """Test the zk_search_notes tool returning a structured JSON payload."""
+        note = MagicMock()
+        note.id = "note1"
+        note.title = "Note 1"
+        note.content = "Short content"
+        tag = MagicMock()
+        tag.name = "tag1"
+        note.tags = [tag]
+        note.created_at = datetime(2023, 1, 1, 12, 0)
+        result = MagicMock()
+        result.note = note
+        result.score = 2.5
+        self.mock_search_service.search_combined.return_value = [result]
+
+        search_notes_func = self.registered_tools["zk_search_notes"]
+        payload = json.loads(
+            asyncio.run(search_notes_func(query="note", output_format="json"))
+        )
+
+        assert payload == {
+            "count": 1,
+            "results": [
+                {
+                    "id": "note1",
+                    "title": "Note 1",
+                    "tags": ["tag1"],
+                    "score": 2.5,
+                    "created": "2023-01-01T12:00:00",
+                    "preview": "Short content",
+                }
+            ],
+        }
+
+    def test_search_notes_tool_keeps_empty_preview(self):
+        """Test that the text output keeps the lines it had before JSON output."""
+        note = MagicMock()
+        note.id, note.title, note.content = "n1", "Empty", ""
+        note.tags, note.created_at = [], datetime(2023, 1, 1)
+        self.mock_search_service.search_combined.return_value = [
+            MagicMock(note=note, score=1.0)
+        ]
+        search_notes_func = self.registered_tools["zk_search_notes"]
+        assert asyncio.run(search_notes_func(query="empty")) == (
+            "Found 1 matching notes:\n\n"
+            "1. Empty (ID: n1)\n"
+            "   Created: 2023-01-01\n"
+            "   Preview: \n\n"
+        )
+
+    def test_json_output_for_messages_and_errors(self):
+        """Test status messages, errors and invalid formats with output_format."""
+        self.mock_zettel_service.get_all_tags.return_value = []
+        get_all_tags_func = self.registered_tools["zk_get_all_tags"]
+        assert json.loads(asyncio.run(get_all_tags_func(output_format="json"))) == {
+            "count": 0,
+            "tags": [],
+        }
+        assert asyncio.run(get_all_tags_func()) == "No tags found in the Zettelkasten."
+
+        self.mock_zettel_service.get_note.return_value = None
+        self.mock_zettel_service.get_note_by_title.return_value = None
+        self.mock_zettel_service.suggest_titles.return_value = []
+        get_note_func = self.registered_tools["zk_get_note"]
+        assert json.loads(get_note_func(identifier="x", output_format="json")) == {
+            "error": "Note not found: x"
+        }
+
+        result = get_note_func(identifier="x", output_format="yaml")
+        assert "Invalid output format: yaml" in result
+
     def test_error_handling(self):
         """Test error handling in the server."""
         # Test ValueError handling
@@ -0,0 +1,104 @@
+"""Tests for the schema migrations of the SQLite index."""
+
+import pytest
+from sqlalchemy import create_engine
+
+from zettelkasten_mcp.models import migrations
+from zettelkasten_mcp.models.db_models import init_db
+from zettelkasten_mcp.models.migrations import MIGRATIONS, Migration
+
+
+def schema_names(engine, kind="index"):
+    """Return the names of the indexes (or tables) in a database."""
+    with engine.connect() as conn:
+        return {
+            row[0]
+            for row in conn.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = ?", (kind,)
+            )
+        }
+
+
+def schema_versions(engine):
+    """Return the recorded schema versions of a database."""
+    with engine.connect() as conn:
+        return [
+            row[0]
+            for row in conn.exec_driver_sql(
+                "SELECT version FROM schema_version ORDER BY version"
+            )
+        ]
+
+
+def test_new_database_is_stamped_without_migrating(test_config):
+    """Test that a database created from the models starts at the latest version."""
+    engine = init_db()
+    assert schema_versions(engine) == [m.version for m in MIGRATIONS]
+    assert {"ix_links_target_id", "ix_note_tags_tag_id"} <= schema_names(engine)
+
+
+def test_existing_database_is_migrated(test_config):
+    """Test that a database from before the migrations gets the missing indexes."""
+    engine = init_db()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_links_target_id")
+        conn.exec_driver_sql("DROP INDEX ix_note_tags_tag_id")
+        for trigger in ("insert", "delete", "update"):
+            conn.exec_driver_sql(f"DROP TRIGGER notes_trigram_{trigger}")
+        conn.exec_driver_sql("DROP TABLE notes_trigram")
+        conn.exec_driver_sql("DROP TABLE schema_version")
+        conn.exec_driver_sql(
+            "INSERT INTO notes (id, title, content, note_type, created_at, "
+            "updated_at) VALUES ('n1', 'Old note', 'Indexed on upgrade', "
+            "'permanent', '2025-01-01', '2025-01-01')"
+        )
+
+    engine = init_db()
+    assert {"ix_links_target_id", "ix_note_tags_tag_id"} <= schema_names(engine)
+    assert schema_versions(engine) == [m.version for m in MIGRATIONS]
+    # The trigram index is filled from the notes already in the database
+    with engine.connect() as conn:
+        matches = conn.exec_driver_sql(
+            "SELECT rowid FROM notes_trigram WHERE notes_trigram MATCH '\"on upgrade\"'"
+        ).all()
+    assert len(matches) == 1
+
+
+def test_pending_steps_run_in_order_and_once(tmp_path):
+    """Test that only steps newer than the recorded version run."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'index.db'}")
+    ran = []
+
+    def step(version):
+        def apply(conn):
+            ran.append(version)
+            conn.exec_driver_sql(f"CREATE TABLE t{version} (x INTEGER)")
+
+        return Migration(version, f"Step {version}", apply)
+
+    assert migrations.upgrade(engine, migrations=(step(1), step(2))) == [1, 2]
+    assert migrations.upgrade(engine, migrations=(step(1), step(2))) == []
+    assert migrations.upgrade(engine, migrations=(step(1), step(2), step(3))) == [3]
+    assert ran == [1, 2, 3]
+    assert schema_versions(engine) == [1, 2, 3]
+
+
+def test_failed_step_is_rolled_back_and_retried(tmp_path):
+    """Test that a failing step leaves the database at the previous version."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'index.db'}")
+    fail = True
+
+    def apply(conn):
+        conn.exec_driver_sql("CREATE TABLE derived (x INTEGER)")
+        if fail:
+            raise RuntimeError("interrupted")
+
+    steps = (Migration(1, "Derived table", apply),)
+    with pytest.raises(RuntimeError):
+        migrations.upgrade(engine, migrations=steps)
+    assert schema_versions(engine) == []
+    assert "derived" not in schema_names(engine, "table")
+
+    fail = False
+    assert migrations.upgrade(engine, migrations=steps) == [1]
+    assert schema_versions(engine) == [1]
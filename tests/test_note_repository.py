@@ -1,8 +1,20 @@
 """Tests for the NoteRepository class."""
 
+import os
+import time
+from contextlib import contextmanager
+from unittest.mock import patch
+
 import pytest
+from sqlalchemy import event
 
 from zettelkasten_mcp.models.schema import LinkType, Note, NoteType, Tag
+from zettelkasten_mcp.storage.journal import WriteJournal
+from zettelkasten_mcp.storage.note_repository import (
+    NoteRepository,
+    parse_links_section,
+    strip_links_section,
+)
 
 
 def test_create_note(note_repository):
@@ -100,6 +112,40 @@ def test_delete_note(note_repository):
     assert deleted_note is None
 
 
+def test_delete_many_reports_missing_and_dangling_links(note_repository):
+    """Test deleting a set of notes in one operation."""
+    notes = [
+        note_repository.create(
+            Note(title=f"Fleeting {i}", content="Text.", tags=[Tag(name="fleeting")])
+        )
+        for i in range(3)
+    ]
+    keeper = note_repository.create(Note(title="Keeper", content="Text."))
+    keeper.add_link(notes[0].id, LinkType.REFERENCE)
+    keeper = note_repository.update(keeper)
+    # Links between deleted notes are not dangling
+    notes[1].add_link(notes[2].id, LinkType.REFERENCE)
+    note_repository.update(notes[1])
+
+    # Quotes must not break out of the bound parameters
+    result = note_repository.delete_many(
+        [note.id for note in notes] + [notes[0].id, "no-such-note' OR '1'='1"]
+    )
+    assert result.deleted == [note.id for note in notes]
+    assert result.missing == ["no-such-note' OR '1'='1"]
+    assert result.dangling_links == [(keeper.id, notes[0].id)]
+
+    assert [note.id for note in note_repository.get_all()] == [keeper.id]
+    assert note_repository.find_by_tag("fleeting") == []
+    assert note_repository.find_linked_notes(keeper.id) == []
+    # The dangling link is still in the markdown of the remaining note
+    assert [link.target_id for link in note_repository.get(keeper.id).links] == [
+        notes[0].id
+    ]
+    with pytest.raises(ValueError):
+        note_repository.delete(notes[0].id)
+
+
 def test_search_notes(note_repository):
     """Test searching for notes."""
     # Create test notes
@@ -184,3 +230,452 @@ def test_note_linking(note_repository):
     linked_notes = note_repository.find_linked_notes(source_note.id, "outgoing")
     assert len(linked_notes) == 1
     assert linked_notes[0].id == target_note.id
+
+
+def test_parse_links_section():
+    """Test extracting links from one or more Links sections."""
+    content = (
+        "# Title\n\nBody text.\n\n"
+        "## Links\n"
+        "- reference [[202101010000]] A description\n"
+        "- extends [[202101010001]]\n"
+        "Not a link line\n"
+        "## Notes\n"
+        "- reference [[ignored]]\n"
+        "## Links\n"
+        "  - supports [[202101010002]]  \n"
+    )
+    assert parse_links_section(content) == [
+        ("reference", "202101010000", "A description"),
+        ("extends", "202101010001", ""),
+        ("supports", "202101010002", ""),
+    ]
+    assert strip_links_section(content) == (
+        "# Title\n\nBody text.\n\n## Notes\n- reference [[ignored]]\n"
+    )
+
+
+def test_links_cached_until_content_changes(note_repository):
+    """Test that unchanged note content reuses previously parsed links."""
+    target = note_repository.create(Note(title="Target", content="Target."))
+    source = Note(title="Source", content="Source.")
+    source.add_link(target.id, LinkType.EXTENDS)
+    source = note_repository.create(source)
+
+    first = note_repository.get(source.id)
+    with patch(
+        "zettelkasten_mcp.storage.note_repository.parse_links_section"
+    ) as mock_parse:
+        second = note_repository.get(source.id)
+        assert not mock_parse.called
+    assert [(link.target_id, link.link_type) for link in second.links] == [
+        (target.id, LinkType.EXTENDS)
+    ]
+    assert second.links == first.links
+
+    # Editing the note invalidates the cached links
+    second.remove_link(target.id)
+    note_repository.update(second)
+    assert note_repository.get(source.id).links == []
+
+
+def test_links_cache_is_bounded(note_repository):
+    """Test that the least recently read notes drop out of the links cache."""
+    note_repository._links_cache_size = 2
+    notes = [
+        note_repository.create(Note(title=f"Note {i}", content="Text."))
+        for i in range(3)
+    ]
+    note_repository.get(notes[1].id)
+    note_repository.get(notes[2].id)
+    assert list(note_repository._links_cache) == [notes[1].id, notes[2].id]
+    note_repository.get(notes[1].id)
+    note_repository.get(notes[0].id)
+    assert list(note_repository._links_cache) == [notes[1].id, notes[0].id]
+
+
+def test_find_link_neighbors(note_repository):
+    """Test that link neighbours come from the index without reading files."""
+    hub = note_repository.create(Note(title="Hub", content="Hub."))
+    target = Note(title="Target", content="Target.", tags=[Tag(name="t")])
+    target = note_repository.create(target)
+    source = Note(title="Source", content="Source.")
+    source.add_link(hub.id, LinkType.SUPPORTS, "Backs it up")
+    source = note_repository.create(source)
+    hub.add_link(target.id, LinkType.EXTENDS, "Builds on it")
+    note_repository.update(hub)
+
+    with patch.object(note_repository, "get") as mock_get:
+        neighbors = note_repository.find_link_neighbors(hub.id, "both")
+        assert not mock_get.called
+    assert [
+        (link.source_id, link.target_id, link.link_type, link.description, note.id)
+        for link, note in neighbors
+    ] == [
+        (hub.id, target.id, LinkType.EXTENDS, "Builds on it", target.id),
+        (source.id, hub.id, LinkType.SUPPORTS, "Backs it up", source.id),
+    ]
+    assert [tag.name for tag in neighbors[0][1].tags] == ["t"]
+
+    incoming = note_repository.find_link_neighbors(hub.id, "incoming")
+    assert [note.id for _, note in incoming] == [source.id]
+    with pytest.raises(ValueError):
+        note_repository.find_link_neighbors(hub.id, "sideways")
+
+
+def test_process_safe_repositories_share_generation(test_config):
+    """Test that process-safe repositories see each other's writes."""
+    test_config.process_safe = True
+    try:
+        first = NoteRepository(notes_dir=test_config.notes_dir)
+        second = NoteRepository(notes_dir=test_config.notes_dir)
+    finally:
+        test_config.process_safe = False
+    assert first.process_safe and second.process_safe
+
+    generation = second.generation
+    first.create(Note(title="Shared", content="Written by another worker."))
+    assert second.generation != generation
+    assert first.generation == second.generation
+
+
+def test_interrupted_write_recovered_without_rebuild(note_repository, test_config):
+    """Test that a write interrupted before indexing is replayed at startup."""
+    note = note_repository.create(Note(title="Before", content="Old content."))
+    file_path = note_repository.notes_dir / f"{note.id}.md"
+    assert not list(note_repository.notes_dir.glob(".*.tmp"))
+
+    # Simulate a crash after the file was replaced but before the index commit
+    note_repository._journal.begin(note.id)
+    note.title = "After"
+    file_path.write_text(note_repository._note_to_markdown(note), encoding="utf-8")
+    (note_repository.notes_dir / f".{note.id}.md.tmp").write_text("partial")
+    note_repository._journal.close()
+
+    with patch.object(NoteRepository, "rebuild_index") as mock_rebuild:
+        recovered = NoteRepository(notes_dir=test_config.notes_dir)
+        assert not mock_rebuild.called
+    assert [n.title for n in recovered.get_summaries([note.id])] == ["After"]
+    # Leftover temp files are removed by the index verification
+    assert recovered.wait_for_verification(timeout=10)
+    assert not list(recovered.notes_dir.glob(".*.tmp"))
+
+
+def test_failed_update_leaves_intent_for_recovery(note_repository):
+    """Test that an update failing to index keeps its journal intent open."""
+    note = note_repository.create(Note(title="Before", content="Old content."))
+    note.title = "After"
+    with patch.object(
+        NoteRepository, "_index_note", side_effect=RuntimeError("index failed")
+    ):
+        with pytest.raises(RuntimeError, match="index failed"):
+            note_repository.update(note)
+    note_repository.create(Note(title="Later", content="Indexed fine."))
+
+    journal_path = note_repository._journal.path
+    assert WriteJournal.read_pending(journal_path) == [note.id]
+
+
+def test_sharded_layout_and_migration(note_repository):
+    """Test reading and writing notes across a layout migration."""
+    note = note_repository.create(Note(title="Flat", content="Stored flat."))
+    flat_path = note_repository.notes_dir / f"{note.id}.md"
+    assert flat_path.exists()
+
+    assert note_repository.migrate_layout("sharded") == 1
+    sharded_path = note_repository._note_path(note.id)
+    assert sharded_path.parent.parent.parent == note_repository.notes_dir
+    assert sharded_path.exists() and not flat_path.exists()
+    assert note_repository.get(note.id).title == "Flat"
+
+    # New notes go to the configured layout; old paths are still resolved
+    second = note_repository.create(Note(title="Second", content="Sharded."))
+    assert note_repository._note_path(second.id).exists()
+    note_repository.layout = "flat"
+    assert note_repository.get(second.id).title == "Second"
+    note.title = "Updated"
+    note_repository.update(note)
+    assert flat_path.exists() and not sharded_path.exists()
+
+    note_repository.delete(second.id)
+    assert note_repository.get(second.id) is None
+    assert note_repository.migrate_layout("flat") == 0
+    assert sorted(p.name for p in note_repository.notes_dir.iterdir()) == [
+        f"{note.id}.md"
+    ]
+
+
+def test_startup_skips_scan_when_fingerprint_matches(note_repository, test_config):
+    """Test that an unchanged notes directory is not scanned at startup."""
+    note = note_repository.create(Note(title="Indexed", content="Known."))
+    # Directories modified right before verification are not trusted
+    past = time.time_ns() - 10_000_000_000
+    os.utime(test_config.notes_dir, ns=(past, past))
+    assert note_repository.verify_index() is False
+
+    with patch("zettelkasten_mcp.storage.layout.count_note_files") as mock_count:
+        unchanged = NoteRepository(notes_dir=test_config.notes_dir)
+        assert not mock_count.called
+    assert unchanged.verification is None
+
+    # A note file added behind the index's back is picked up in the background
+    external = Note(title="External", content="Added by hand.")
+    external.id = "20200101T000000000000000"
+    (test_config.notes_dir / f"{external.id}.md").write_text(
+        note_repository._note_to_markdown(external), encoding="utf-8"
+    )
+    changed = NoteRepository(notes_dir=test_config.notes_dir)
+    assert changed.verification is not None
+    assert changed.wait_for_verification(timeout=10)
+    assert {n.id for n in changed.get_summaries([note.id, external.id])} == {
+        note.id,
+        external.id,
+    }
+
+
+def test_rebuild_keeps_old_index_visible_until_swap(note_repository):
+    """Test that readers see the previous index while a rebuild is running."""
+    notes = [
+        note_repository.create(
+            Note(title=f"Note {i}", content=f"Content {i}.", tags=[Tag(name="kept")])
+        )
+        for i in range(3)
+    ]
+    notes[0].add_link(notes[1].id, LinkType.SUPPORTS)
+    note_repository.update(notes[0])
+    extra = note_repository.create(Note(title="Extra", content="Not indexed yet."))
+    note_repository._unindex_note(extra.id)
+
+    counts_during_rebuild = []
+
+    def progress(status):
+        if status.indexed:
+            counts_during_rebuild.append(len(note_repository.get_all()))
+
+    with patch("zettelkasten_mcp.storage.note_repository._REBUILD_BATCH_SIZE", 1):
+        result = note_repository.rebuild_index(progress)
+
+    # Reported after each indexed note, then once more after the swap
+    assert set(counts_during_rebuild[:-1]) == {3}
+    assert counts_during_rebuild[-1] == 4
+    assert (result.total, result.scanned, result.indexed) == (4, 4, 4)
+    assert (result.errors, result.previous_count) == (0, 3)
+    assert len(note_repository.find_by_tag("kept")) == 3
+    linked = note_repository.find_linked_notes(notes[0].id, "outgoing")
+    assert [note.id for note in linked] == [notes[1].id]
+    # The shadow index is gone once swapped in
+    assert not list(note_repository._db_path.parent.glob("*.rebuild"))
+
+
+def test_rebuild_catches_up_with_writes_during_scan(note_repository):
+    """Test that files changed while a rebuild scans them end up indexed."""
+    notes = [
+        note_repository.create(Note(title=f"Note {i}", content=f"Content {i}."))
+        for i in range(3)
+    ]
+
+    def progress(status):
+        # Edit every note file once, outside the repository, mid-scan
+        if status.scanned == 2 and status.total == 3:
+            for i, note in enumerate(notes):
+                path = note_repository._find_note_file(note.id)
+                text = path.read_text(encoding="utf-8")
+                path.write_text(
+                    text.replace(f"title: Note {i}", f"title: Edited {i}"),
+                    encoding="utf-8",
+                )
+
+    with patch("zettelkasten_mcp.storage.note_repository._REBUILD_BATCH_SIZE", 1):
+        result = note_repository.rebuild_index(progress)
+
+    indexed = note_repository.get_summaries([note.id for note in notes])
+    assert sorted(note.title for note in indexed) == [
+        "Edited 0",
+        "Edited 1",
+        "Edited 2",
+    ]
+    assert result.indexed == 3
+
+
+@contextmanager
+def capture_sql(repository):
+    """Collect the SQL statements a repository executes within a block."""
+    statements = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(" ".join(statement.split()))
+
+    event.listen(repository.engine, "before_cursor_execute", before_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(repository.engine, "before_cursor_execute", before_execute)
+
+
+def test_update_only_writes_changed_tags(note_repository):
+    """Test that tags are diffed on update and tag IDs are cached."""
+    note = note_repository.create(
+        Note(title="Tagged", content="Text.", tags=[Tag(name="a"), Tag(name="b")])
+    )
+
+    note.content = "Only the content changed."
+    with capture_sql(note_repository) as statements:
+        note_repository.update(note)
+    note_tag_writes = [
+        sql for sql in statements if "note_tags" in sql and not sql.startswith("SELECT")
+    ]
+    assert note_tag_writes == []
+
+    note.tags = [Tag(name="b"), Tag(name="c")]
+    with capture_sql(note_repository) as statements:
+        note_repository.update(note)
+    assert sum(sql.startswith("DELETE FROM note_tags") for sql in statements) == 1
+    assert sum(sql.startswith("INSERT INTO note_tags") for sql in statements) == 1
+    assert {tag.name for tag in note_repository.get(note.id).tags} == {"b", "c"}
+    assert {tag.name for tag in note_repository.get_all_tags()} >= {"a", "b", "c"}
+
+    # Known tags are resolved from the cache without querying the tags table
+    with capture_sql(note_repository) as statements:
+        note_repository.create(
+            Note(title="Same tags", content="Text.", tags=[Tag(name="c")])
+        )
+    assert not any("FROM tags WHERE" in sql for sql in statements)
+    assert len(note_repository.find_by_tag("c")) == 2
+
+
+def test_tag_id_cache_dropped_after_rebuild(note_repository):
+    """Test that tag IDs renumbered by a rebuild are not served from the cache."""
+    # Created as zz=1, aa=2; the rebuild inserts them in sorted order
+    note_repository.create(Note(title="One", content="Text.", tags=[Tag(name="zz")]))
+    note_repository.create(Note(title="Two", content="Text.", tags=[Tag(name="aa")]))
+    note_repository.rebuild_index()
+    note_repository.create(Note(title="Three", content="Text.", tags=[Tag(name="aa")]))
+    assert {note.title for note in note_repository.find_by_tag("aa")} == {
+        "Two",
+        "Three",
+    }
+
+
+def test_update_only_writes_changed_links(note_repository):
+    """Test that links are diffed on update and the graph generation follows."""
+    hub = note_repository.create(Note(title="Hub", content="Text."))
+    targets = [
+        note_repository.create(Note(title=f"Target {i}", content="Text."))
+        for i in range(3)
+    ]
+    for target in targets[:2]:
+        hub.add_link(target.id, LinkType.REFERENCE)
+    hub = note_repository.update(hub)
+    graph_generation = note_repository.graph_generation
+    generation = note_repository.generation
+
+    hub.content = "Only the content changed."
+    with capture_sql(note_repository) as statements:
+        hub = note_repository.update(hub)
+    link_writes = [
+        sql for sql in statements if "links" in sql and not sql.startswith("SELECT")
+    ]
+    assert link_writes == []
+    assert note_repository.generation != generation
+    assert note_repository.graph_generation == graph_generation
+
+    hub.remove_link(targets[0].id)
+    hub.add_link(targets[2].id, LinkType.EXTENDS)
+    with capture_sql(note_repository) as statements:
+        note_repository.update(hub)
+    assert sum(sql.startswith("DELETE FROM links") for sql in statements) == 1
+    assert sum(sql.startswith("INSERT INTO links") for sql in statements) == 1
+    assert note_repository.graph_generation != graph_generation
+    assert {note.id for note in note_repository.find_linked_notes(hub.id)} == {
+        targets[1].id,
+        targets[2].id,
+    }
+
+
+@contextmanager
+def query_plans(repository):
+    """Collect the EXPLAIN QUERY PLAN details of SELECTs run within a block."""
+    queries = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith(("SELECT", "WITH")):
+            queries.append((statement, parameters))
+
+    event.listen(repository.engine, "before_cursor_execute", before_execute)
+    plans = []
+    try:
+        yield plans
+    finally:
+        event.remove(repository.engine, "before_cursor_execute", before_execute)
+    with repository.engine.connect() as conn:
+        for statement, parameters in queries:
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plans.append(" | ".join(row[-1] for row in rows))
+
+
+def test_hot_queries_use_indexes(note_repository):
+    """Test that incoming-link and tag lookups do not scan links or note_tags."""
+    notes = [
+        note_repository.create(
+            Note(title=f"Note {i}", content="Text.", tags=[Tag(name=f"tag-{i % 3}")])
+        )
+        for i in range(6)
+    ]
+    for source in notes[1:]:
+        source.add_link(notes[0].id, LinkType.REFERENCE)
+        note_repository.update(source)
+
+    with query_plans(note_repository) as plans:
+        assert len(note_repository.find_linked_notes(notes[0].id, "incoming")) == 5
+        assert len(note_repository.find_by_tag("tag-1")) == 2
+        assert len(note_repository.search(tag="tag-2")) == 2
+    assert plans
+    for plan in plans:
+        assert "SCAN links" not in plan, plan
+        assert "SCAN note_tags" not in plan, plan
+    assert any("ix_links_target_id" in plan for plan in plans)
+    assert any("ix_note_tags_tag_id" in plan for plan in plans)
+
+
+def test_similar_titles_follow_writes(note_repository, test_config):
+    """Test that the fuzzy title index tracks creates, renames and deletes."""
+    note = note_repository.create(
+        Note(title="Spaced Repetition", content="Review at intervals.")
+    )
+    assert [
+        m.note_id for m in note_repository.find_similar_titles("spaced repitition")
+    ] == [note.id]
+    with patch(
+        "zettelkasten_mcp.storage.note_repository.TitleIndex",
+        side_effect=AssertionError("reloaded"),
+    ):
+        other = note_repository.create(
+            Note(title="Active Recall", content="Test yourself.")
+        )
+        note.title = "Interleaved Practice"
+        note_repository.update(note)
+        assert (
+            note_repository.find_similar_titles("active recal")[0].note_id == other.id
+        )
+        assert note_repository.find_similar_titles("interleaved practise")[0].title == (
+            "Interleaved Practice"
+        )
+        assert note_repository.find_similar_titles("spaced repitition") == []
+        note_repository.delete(other.id)
+        assert note_repository.find_similar_titles("active recal") == []
+
+    # Writes the index has not seen, here by a rebuild, make it reload
+    note_repository.rebuild_index()
+    assert note_repository.find_similar_titles("interleaved practise")[0].note_id == (
+        note.id
+    )
+
+    test_config.process_safe = True
+    try:
+        first = NoteRepository(notes_dir=test_config.notes_dir)
+        second = NoteRepository(notes_dir=test_config.notes_dir)
+    finally:
+        test_config.process_safe = False
+    assert second.find_similar_titles("elaborative interogation") == []
+    first.create(Note(title="Elaborative Interrogation", content="Ask why."))
+    assert second.find_similar_titles("elaborative interogation")[0].distance == 1
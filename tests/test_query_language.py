@@ -0,0 +1,48 @@
+"""Tests for the boolean note query language."""
+
+import pytest
+
+from zettelkasten_mcp.services.query_language import (
+    And,
+    FieldFilter,
+    Not,
+    Or,
+    QuerySyntaxError,
+    Text,
+    parse_query,
+    positive_terms,
+)
+
+
+def test_parse_query():
+    """Test operator precedence, implicit AND and negation."""
+    assert parse_query('tag:ml AND "gradient descent" -draft type:permanent') == And(
+        (
+            FieldFilter("tag", "ml"),
+            Text("gradient descent"),
+            Not(Text("draft")),
+            FieldFilter("type", "permanent"),
+        )
+    )
+    # AND binds tighter than OR
+    assert parse_query("a b OR c") == Or((And((Text("a"), Text("b"))), Text("c")))
+    assert parse_query("a (b OR c)") == And((Text("a"), Or((Text("b"), Text("c")))))
+    assert parse_query('NOT title:"x y"') == Not(FieldFilter("title", "x y"))
+    # Hyphens inside words and lowercase operators are plain text
+    assert parse_query("well-known and") == And((Text("well-known"), Text("and")))
+
+
+def test_positive_terms_skip_negated_text():
+    """Test that negated terms are not used for ranking."""
+    node = parse_query('graph ("neural net" OR tag:ml) -draft')
+    assert positive_terms(node) == ["graph", "neural net"]
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["", "(a", "a)", "OR b", 'say "hi', "a AND", "foo:bar", "NOT"],
+)
+def test_invalid_queries(query):
+    """Test that malformed queries raise QuerySyntaxError."""
+    with pytest.raises(QuerySyntaxError):
+        parse_query(query)
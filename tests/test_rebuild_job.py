@@ -0,0 +1,88 @@
+"""Tests for background index rebuilds."""
+
+import asyncio
+import json
+import threading
+
+from zettelkasten_mcp.models.schema import Note
+from zettelkasten_mcp.server.mcp_server import ZettelkastenMcpServer
+from zettelkasten_mcp.services.rebuild_job import RebuildJob
+from zettelkasten_mcp.storage.note_repository import RebuildProgress
+
+
+class TestRebuildJob:
+    """Tests for the RebuildJob class."""
+
+    def test_reports_progress_and_runs_one_rebuild_at_a_time(self):
+        """Test that a running rebuild is shared and its progress is visible."""
+        reported = threading.Event()
+        release = threading.Event()
+        runs = []
+
+        def rebuild(progress):
+            runs.append(1)
+            status = RebuildProgress(total=10, scanned=4)
+            progress(status)
+            reported.set()
+            release.wait(timeout=5)
+            status.scanned = status.indexed = 10
+            status.previous_count = 8
+            return status
+
+        job = RebuildJob(rebuild)
+        first, started = job.start()
+        assert started and first["state"] == "running"
+        assert reported.wait(timeout=5)
+
+        second, started_again = job.start()
+        assert not started_again
+        assert second["job_id"] == first["job_id"]
+        status = job.status()
+        assert (status["scanned"], status["total"]) == (4, 10)
+        assert status["eta_seconds"] is not None
+
+        release.set()
+        assert job.wait(timeout=5)
+        status = job.status()
+        assert status["state"] == "completed"
+        assert (status["indexed"], status["previous_count"]) == (10, 8)
+        assert status["eta_seconds"] is None
+        assert runs == [1]
+
+    def test_failed_rebuild_is_reported(self):
+        """Test that an exception in the rebuild marks the job as failed."""
+
+        def rebuild(progress):
+            raise OSError("disk gone")
+
+        job = RebuildJob(rebuild)
+        job.start()
+        assert job.wait(timeout=5)
+        status = job.status()
+        assert status["state"] == "failed"
+        assert status["error"] == "disk gone"
+
+        # A failed job can be retried
+        _, started = job.start()
+        assert started
+
+
+def test_rebuild_tool_waits_and_reports_counts(zettel_service):
+    """Test zk_rebuild_index and zk_rebuild_status end to end."""
+    server = ZettelkastenMcpServer()
+    server.zettel_service = zettel_service
+    for i in range(3):
+        zettel_service.repository.create(Note(title=f"Note {i}", content="Text."))
+    tools = server.mcp._tool_manager
+
+    result = asyncio.run(
+        tools.get_tool("zk_rebuild_index").fn(wait=True, output_format="json")
+    )
+    payload = json.loads(result)
+    assert payload["started"] is True
+    assert payload["state"] == "completed"
+    assert (payload["total"], payload["indexed"], payload["errors"]) == (3, 3, 0)
+
+    status = tools.get_tool("zk_rebuild_status").fn()
+    assert "Index rebuild completed" in status
+    assert "Notes indexed: 3" in status
@@ -0,0 +1,44 @@
+"""Tests for the generation-keyed result cache."""
+
+from zettelkasten_mcp.services.result_cache import ResultCache
+
+
+class TestResultCache:
+    """Tests for the ResultCache class."""
+
+    def test_hit_between_writes_and_invalidation_on_new_generation(self):
+        """Test that results are reused until the generation changes."""
+        cache = ResultCache(max_entries=8)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return len(calls)
+
+        assert cache.get_or_compute("q", {"a": 1}, 0, compute) == 1
+        assert cache.get_or_compute("q", {"a": 1}, 0, compute) == 1
+        assert cache.get_or_compute("q", {"a": 1}, 1, compute) == 2
+        metrics = cache.get_metrics()
+        assert metrics["hits"] == 1
+        assert metrics["misses"] == 2
+        assert metrics["invalidations"] == 1
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = ResultCache(max_entries=2)
+        cache.get_or_compute("q", {"n": 1}, 0, lambda: 1)
+        cache.get_or_compute("q", {"n": 2}, 0, lambda: 2)
+        # Touch n=1 so that n=2 becomes the least recently used entry
+        cache.get_or_compute("q", {"n": 1}, 0, lambda: -1)
+        cache.get_or_compute("q", {"n": 3}, 0, lambda: 3)
+
+        assert cache.get_or_compute("q", {"n": 1}, 0, lambda: -1) == 1
+        assert cache.get_or_compute("q", {"n": 2}, 0, lambda: 20) == 20
+        assert cache.get_metrics()["evictions"] == 2
+
+    def test_disabled_cache_always_computes(self):
+        """Test that a cache with no capacity never stores results."""
+        cache = ResultCache(max_entries=0)
+        assert cache.get_or_compute("q", {}, 0, lambda: 1) == 1
+        assert cache.get_or_compute("q", {}, 0, lambda: 2) == 2
+        assert cache.get_metrics()["size"] == 0
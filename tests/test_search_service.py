@@ -2,11 +2,17 @@
 """Tests for the search service in the Zettelkasten MCP server."""
 
 import datetime
+from unittest.mock import patch
 
 import pytest
+from sqlalchemy import text
 
 from zettelkasten_mcp.models.schema import LinkType, Note, NoteType, Tag
-from zettelkasten_mcp.services.search_service import SearchResult, SearchService
+from zettelkasten_mcp.services.search_service import (
+    SearchResult,
+    SearchService,
+    required_substrings,
+)
 
 
 class TestSearchService:
@@ -146,6 +152,20 @@ def test_find_orphaned_notes(self, zettel_service):
         assert len(orphans) == 1
         assert orphans[0].id == orphan.id
 
+        # The search service finds exactly the unlinked note
+        search_service = SearchService(zettel_service)
+        orphans = search_service.find_orphaned_notes()
+        assert [note.id for note in orphans] == [orphan.id]
+        assert orphans[0].title == "Isolated Orphan Note"
+        assert {tag.name for tag in orphans[0].tags} == {"orphan", "isolated"}
+
+        # Orphans are summarized from the index without opening note files
+        with patch.object(zettel_service.repository, "get") as mock_get:
+            search_service.find_orphaned_notes()
+            zettel_service.create_note(title="Another", content="Unlinked.")
+            assert len(search_service.find_orphaned_notes()) == 2
+            assert not mock_get.called
+
     def test_find_central_notes(self, zettel_service):
         """Test finding notes with the most connections."""
         # Create several notes and add extra links to the central one
@@ -238,3 +258,164 @@ def test_search_combined(self, zettel_service):
             note_type=NoteType.PERMANENT, tags=["python"]
         )
         assert len(permanent_notes) == 2
+
+    def test_search_results_cached_until_next_write(self, zettel_service):
+        """Test that repeated searches are served from cache between writes."""
+        search_service = SearchService(zettel_service)
+        zettel_service.create_note(
+            title="Caching", content="Results are cached.", tags=["cache"]
+        )
+        first = search_service.search_combined(text="cached")
+        assert len(first) == 1
+
+        with patch.object(
+            zettel_service, "get_all_notes", wraps=zettel_service.get_all_notes
+        ) as mock_get_all:
+            second = search_service.search_combined(text="cached")
+            assert not mock_get_all.called
+            assert [r.note.id for r in second] == [r.note.id for r in first]
+
+            # A write bumps the repository generation and invalidates the cache
+            zettel_service.create_note(title="More caching", content="Also cached.")
+            third = search_service.search_combined(text="cached")
+            assert mock_get_all.call_count == 1
+            assert len(third) == 2
+
+    def test_grep_notes(self, zettel_service):
+        """Test substring and regex search verified on trigram candidates."""
+        search_service = SearchService(zettel_service)
+        hit = zettel_service.create_note(
+            title="Index Design",
+            content="Intro.\nA trigram index narrows candidates.\nOutro.",
+        )
+        other = zettel_service.create_note(
+            title="Trigrams", content="Three letters: TRIGRAM-based lookups."
+        )
+        zettel_service.create_note(title="Unrelated", content="Nothing here.")
+
+        results = search_service.grep_notes("trigram index")
+        assert [r.note.id for r in results] == [hit.id]
+        assert results[0].lines == [(2, "A trigram index narrows candidates.")]
+
+        results = search_service.grep_notes("TRIGRAM", case_sensitive=True)
+        assert [r.note.id for r in results] == [other.id]
+
+        results = search_service.grep_notes(r"tri\w+ (index|lookups)", regex=True)
+        assert {r.note.id for r in results} == {hit.id}
+        results = search_service.grep_notes("^trigrams$", regex=True)
+        assert [(r.note.id, r.lines) for r in results] == [
+            (other.id, [(0, "Trigrams")])
+        ]
+
+        def candidates(phrase):
+            with zettel_service.repository.session_factory() as session:
+                return session.execute(
+                    text(
+                        "SELECT COUNT(*) FROM notes_trigram WHERE notes_trigram MATCH :q"
+                    ),
+                    {"q": f'"{phrase}"'},
+                ).scalar()
+
+        assert candidates("trigram index") == 1
+
+        # Edits are reflected through the index triggers
+        zettel_service.update_note(hit.id, content="Rewritten without the word.")
+        assert search_service.grep_notes("trigram index") == []
+        assert candidates("trigram index") == 0
+
+        with pytest.raises(ValueError):
+            search_service.grep_notes("(unclosed", regex=True)
+
+    def test_required_substrings(self):
+        """Test which literals of a pattern are used to query the trigram index."""
+        assert required_substrings("ab") == []
+        assert required_substrings('say "hi"') == ['say "hi"']
+        assert required_substrings(r"foo.*barbaz", regex=True) == ["foo", "barbaz"]
+        assert required_substrings(r"colou?r", regex=True) == ["colo"]
+        assert required_substrings(r"(abc|xyz)def", regex=True) == ["def"]
+        assert required_substrings(r"(?:abc)+x?yz", regex=True) == ["abc"]
+        assert required_substrings(r"[a-z]+\d", regex=True) == []
+
+    def test_grep_survives_regex_parser_changes(self, zettel_service):
+        """Test that grep scans every note if regex internals cannot be read."""
+        search_service = SearchService(zettel_service)
+        note = zettel_service.create_note(
+            title="Parser", content="The colour of the sky."
+        )
+        with patch(
+            "zettelkasten_mcp.services.search_service._literal_runs",
+            side_effect=AttributeError("changed parse tree"),
+        ):
+            assert required_substrings(r"colou?r", regex=True) == []
+            results = search_service.grep_notes(r"colou?r", regex=True)
+        assert [result.note.id for result in results] == [note.id]
+
+    def test_search_query(self, zettel_service):
+        """Test boolean queries with field qualifiers against the index."""
+        search_service = SearchService(zettel_service)
+        gd = zettel_service.create_note(
+            title="Gradient Descent",
+            content="Gradient descent minimizes a loss.",
+            tags=["ml"],
+        )
+        draft = zettel_service.create_note(
+            title="Draft on gradient descent",
+            content="Gradient descent, unfinished draft.",
+            note_type=NoteType.FLEETING,
+            tags=["ml", "draft"],
+        )
+        other = zettel_service.create_note(
+            title="Graphs", content="Graph theory basics.", tags=["math"]
+        )
+        zettel_service.create_link(other.id, gd.id, LinkType.REFERENCE)
+
+        def ids(query, **kwargs):
+            return {r.note.id for r in search_service.search_query(query, **kwargs)}
+
+        assert ids('tag:ml AND "gradient descent" -draft type:permanent') == {gd.id}
+        assert ids('"gradient descent"') == {gd.id, draft.id}
+        assert ids("tag:math OR NOT tag:draft") == {gd.id, other.id}
+        assert ids("title:graph") == {other.id}
+        # Terms shorter than a trigram fall back to LIKE
+        assert ids("-un") == {gd.id, other.id}
+        assert ids(f"linkto:{gd.id}") == {other.id}
+        assert ids(f"linkfrom:{other.id}") == {gd.id}
+        assert ids(f"link:{gd.id}") == {other.id}
+        today = datetime.date.today()
+        tomorrow = today + datetime.timedelta(days=1)
+        assert ids(f"created:{today}") == {gd.id, draft.id, other.id}
+        assert ids(f"created:>={tomorrow}") == set()
+        assert ids(f"updated:{today}..{tomorrow}") == {gd.id, draft.id, other.id}
+        assert ids("descent", note_type=NoteType.FLEETING) == {draft.id}
+        assert ids("descent", tags=["math", "draft"]) == {draft.id}
+
+        # Title matches rank first
+        results = search_service.search_query("minimizes OR gradient")
+        assert results[0].note.id in {gd.id, draft.id}
+        assert results[-1].score < results[0].score
+
+        with pytest.raises(ValueError):
+            search_service.search_query("type:unknown")
+        with pytest.raises(ValueError):
+            search_service.search_query("created:yesterday")
+
+    def test_facet_counts(self, zettel_service):
+        """Test facet counts of a result set computed in the index."""
+        search_service = SearchService(zettel_service)
+        a = zettel_service.create_note(title="A", content="Text.", tags=["ml", "draft"])
+        b = zettel_service.create_note(
+            title="B", content="Text.", tags=["ml"], note_type=NoteType.FLEETING
+        )
+        zettel_service.create_note(title="C", content="Text.", tags=["other"])
+
+        with patch.object(zettel_service, "get_all_notes") as mock_get_all:
+            facets = search_service.facet_counts([a.id, b.id, "unknown"])
+            assert not mock_get_all.called
+        month = a.created_at.strftime("%Y-%m")
+        assert facets.tags == {"ml": 2, "draft": 1}
+        assert list(facets.tags) == ["ml", "draft"]
+        assert facets.note_types == {"fleeting": 1, "permanent": 1}
+        assert facets.months == {month: 2}
+
+        assert search_service.facet_counts([a.id, b.id], max_tags=1).tags == {"ml": 2}
+        assert search_service.facet_counts([]).tags == {}
@@ -0,0 +1,102 @@
+"""Tests for request coalescing of concurrent identical read calls."""
+
+import threading
+import time
+
+import pytest
+
+from zettelkasten_mcp.server.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Tests for the SingleFlight class."""
+
+    def test_concurrent_identical_calls_share_one_execution(self):
+        """Test that callers arriving during a computation reuse its result."""
+        single_flight = SingleFlight()
+        release = threading.Event()
+        executions = []
+
+        def compute():
+            executions.append(1)
+            release.wait(timeout=5)
+            return ["result"]
+
+        results = []
+
+        def call():
+            results.append(single_flight.do("zk_get_all_tags", {}, compute))
+
+        threads = [threading.Thread(target=call) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        # Wait until every follower has joined the leader's call
+        deadline = time.monotonic() + 5
+        while single_flight.get_metrics()["calls"] < 5:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert len(executions) == 1
+        assert results == [["result"]] * 5
+        metrics = single_flight.get_metrics()
+        assert metrics["executions"] == 1
+        assert metrics["coalesced"] == 4
+        assert metrics["in_flight"] == 0
+        assert metrics["by_tool"]["zk_get_all_tags"] == {"calls": 5, "coalesced": 4}
+
+    def test_calls_after_a_write_start_a_new_computation(self):
+        """Test that a caller who saw a newer write does not join an older call."""
+        single_flight = SingleFlight()
+        release = threading.Event()
+        results = []
+
+        def stale():
+            release.wait(timeout=5)
+            return ["before"]
+
+        leader = threading.Thread(
+            target=lambda: results.append(
+                single_flight.do("zk_get_all_tags", {}, stale, generation=1)
+            )
+        )
+        leader.start()
+        deadline = time.monotonic() + 5
+        while single_flight.get_metrics()["in_flight"] < 1:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        # A write bumped the generation while the first call was running
+        fresh = single_flight.do("zk_get_all_tags", {}, lambda: ["after"], generation=2)
+        release.set()
+        leader.join(timeout=5)
+
+        assert fresh == ["after"]
+        assert results == [["before"]]
+        assert single_flight.get_metrics()["coalesced"] == 0
+
+    def test_different_arguments_are_not_coalesced(self):
+        """Test that calls with different arguments run separately."""
+        single_flight = SingleFlight()
+        assert single_flight.do("zk_find_central_notes", {"limit": 5}, lambda: 5) == 5
+        assert (
+            single_flight.do("zk_find_central_notes", {"limit": 10}, lambda: 10) == 10
+        )
+        # Sequential identical calls also recompute once the leader finished
+        assert single_flight.do("zk_find_central_notes", {"limit": 5}, lambda: 6) == 6
+        assert single_flight.get_metrics()["executions"] == 3
+
+    def test_errors_propagate_and_clear_in_flight_entry(self):
+        """Test that a failing computation raises and does not stay in flight."""
+        single_flight = SingleFlight()
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            single_flight.do("zk_search_notes", {"query": "x"}, fail)
+        metrics = single_flight.get_metrics()
+        assert metrics["errors"] == 1
+        assert metrics["in_flight"] == 0
@@ -1,5 +1,7 @@
 """Regression tests to ensure STDIO transport still works correctly."""
 
+import subprocess
+import sys
 from unittest.mock import Mock, patch
 
 import pytest
@@ -81,6 +83,19 @@ def test_cors_middleware_not_imported_for_stdio(self, server):
             # Verify CORSMiddleware was not called
             mock_cors.assert_not_called()
 
+    def test_entry_point_import_defers_server_stack(self):
+        """Test that importing the entry point doesn't load the server stack."""
+        # A fresh interpreter, since this test session already imported them
+        code = (
+            "import sys, zettelkasten_mcp.main; "
+            "print(','.join(m for m in ('mcp', 'sqlalchemy', 'frontmatter', "
+            "'uvicorn', 'starlette', 'markdown') if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == ""
+
     def test_all_mcp_tools_registered(self, server):
         """Test that all MCP tools are registered correctly."""
         # Get the list of registered tools from the FastMCP instance
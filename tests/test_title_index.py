@@ -0,0 +1,72 @@
+"""Tests for the fuzzy title index."""
+
+import random
+
+from zettelkasten_mcp.storage.title_index import TitleIndex, edit_distance
+
+
+def reference_distance(a, b):
+    """Compute the Levenshtein distance with the textbook dynamic program."""
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+def test_edit_distance_matches_reference():
+    """Test the bit-parallel distance against the dynamic program."""
+    rng = random.Random(0)
+    for _ in range(2000):
+        a = "".join(rng.choice("ab c") for _ in range(rng.randint(0, 12)))
+        b = "".join(rng.choice("ab c") for _ in range(rng.randint(0, 80)))
+        assert edit_distance(a, b) == reference_distance(a, b), (a, b)
+
+
+def test_closest_ignores_case_and_whitespace_and_orders_by_distance():
+    """Test lookups within the tolerated number of edits."""
+    index = TitleIndex(
+        [
+            ("1", "Zettelkasten Method"),
+            ("2", "Zettelkasten  methods"),
+            ("3", "Slip-box"),
+            ("4", "zettelkasten method"),
+        ]
+    )
+    matches = index.closest("zettelkasten METHOD")
+    assert [(m.note_id, m.distance) for m in matches] == [
+        ("1", 0),
+        ("4", 0),
+        ("2", 1),
+    ]
+    assert [m.note_id for m in index.closest("slip box")] == ["3"]
+    assert index.closest("slap bax") == []
+    assert index.closest("zettelkasten method", limit=1)[0].note_id == "1"
+
+
+def test_removed_titles_are_skipped_and_pruned():
+    """Test that removals hide titles and eventually rebuild the tree."""
+    titles = [(str(i), f"Note number {i}") for i in range(40)]
+    index = TitleIndex(titles)
+    for note_id, _ in titles[:30]:
+        index.remove(note_id)
+    assert len(index) == 10
+    assert index.closest("note number 5", max_distance=0) == []
+    assert [m.note_id for m in index.closest("note number 35", max_distance=0)] == [
+        "35"
+    ]
+
+    # A stale title comes back when a note carries it again
+    index.add("new", "Note number 5")
+    assert index.closest("note number 5", max_distance=0)[0].note_id == "new"
+    index.add("new", "Renamed")
+    assert index.closest("note number 5", max_distance=0) == []
+    assert index.closest("renamed")[0].note_id == "new"
@@ -1,5 +1,7 @@
 """Tests for the ZettelService class."""
 
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 from zettelkasten_mcp.models.schema import LinkType, NoteType
@@ -216,3 +218,24 @@ def test_find_similar_notes(zettel_service):
     # At least one of note2 or note3 should be in the similar notes
     # (They share tags and/or links with note1)
     assert note2.id in similar_ids or note3.id in similar_ids
+
+
+def test_concurrent_bidirectional_links_are_not_lost(zettel_service):
+    """Test that concurrent links to one note keep every reverse link."""
+    hub = zettel_service.create_note(title="Hub", content="Hub note.")
+    sources = [
+        zettel_service.create_note(title=f"Source {i}", content="Source note.")
+        for i in range(8)
+    ]
+
+    def link(source):
+        zettel_service.create_link(
+            source.id, hub.id, LinkType.SUPPORTS, bidirectional=True
+        )
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(link, sources))
+
+    hub = zettel_service.get_note(hub.id)
+    assert {link.target_id for link in hub.links} == {s.id for s in sources}
+    assert all(link.link_type == LinkType.SUPPORTED_BY for link in hub.links)